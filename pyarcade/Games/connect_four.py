@@ -1,38 +1,60 @@
+from pyarcade.dynamodb.leaderboard import Leaderboards, TopScores
 from pyarcade.game_interface import GameInterface
+from pyarcade.Games.connect_four_ai import ConnectFourAI
+from pyarcade.Games.connect_four_analysis import ConnectFourAnalyzer
+from pyarcade.Games.connect_four_board import ConnectFourBoard
+from pyarcade.Games.connect_four_book import ConnectFourOpeningBook
+from pyarcade.Games.connect_four_mcts import ConnectFourMCTS
 from datetime import datetime
+import threading
 
 
 class ConnectFourGame(GameInterface):
     """ A class representing a Connect Four game session.
 
     Note:
-        For now, Connect Four must have a board initialized with 7 rows and 6 columns .
+        Sessions are played on a board of 7 columns and 6 rows with runs of 4 unless
+        "width", "height" and "run_length" are given when the session is created.
     """
     BOARD_KEY = 'board'
     PLAYERS_KEY = 'players'
     STATUS_KEY = 'status'
     PLAYER_STATUS_KEY = 'player_status'
     COLUMN_KEY = 'column'
+    GAME_ID = 1
     SESSION_ID_KEY = 'session_id'
     PLAYER_NUM_KEY = 'player_num'
     PLAY_COUNTER_KEY = 'play_counter'
     PLAYER_1_TURNS = 'player_1_turns'
     PLAYER_2_TURNS = 'player_2_turns'
-
-    def __init__(self, db_controller):
+    COLUMN_HEIGHTS_KEY = 'column_heights'
+    COMPUTER_ID = 'computer'
+    DIFFICULTY_KEY = 'difficulty'
+    WIDTH_KEY = 'width'
+    HEIGHT_KEY = 'height'
+    RUN_LENGTH_KEY = 'run_length'
+    SCORES_KEY = 'scores'
+    ZOBRIST_HASH_KEY = 'zobrist_hash'
+
+    def __init__(self, db_controller, ai_time_budget: float = 0.5, opening_book_path: str = None,
+                 mcts_workers: int = None, analysis_depth: int = 6, analysis_cache_size: int = 4096,
+                 leaderboard_size: int = 10, leaderboard_cache_ttl: float = 5.0, score_record_size: int = 1000):
         self.db = db_controller
+        opening_book = ConnectFourOpeningBook(opening_book_path) if opening_book_path else None
+        self.ai = ConnectFourAI(time_budget=ai_time_budget, opening_book=opening_book)
+        self.mcts = ConnectFourMCTS(time_budget=ai_time_budget, workers=mcts_workers)
+        self.analyzer = ConnectFourAnalyzer(depth=analysis_depth, cache_size=analysis_cache_size)
         self.SESSION_INFO_MANAGER = {}
         self.SESSION_COUNTER = 0
-        # score record would be a list of lists
-        # e.g. [[0, 4, "Peter"], [2, 6, "Tom"]]
-        # first value: session_id
-        # second value: steps used to win
-        # third value: name inserted by the user, currently set as ""
-        self.SESSION_SCORE_RECORD = []
-        self.HIGHSCORE_LIST = [(float('inf'), "empty"), (float('inf'), "empty"), (float('inf'), "empty"),
-                               (float('inf'), "empty"), (float('inf'), "empty"), (float('inf'), "empty"),
-                               (float('inf'), "empty"), (float('inf'), "empty"), (float('inf'), "empty"),
-                               (float('inf'), "empty")]
+        # score record of the wins played by this worker, fewest turns first
+        # e.g. ((4, "2021-04-01 10:00:00"), (6, "2021-04-01 10:05:00"))
+        # first value: turns taken by the winner
+        # second value: session_id
+        # only the best score_record_size wins are kept
+        self.SESSION_SCORE_RECORD = TopScores(score_record_size)
+        self.score_record_lock = threading.Lock()
+        self.leaderboard = Leaderboards(db_controller, ConnectFourGame.GAME_ID, size=leaderboard_size,
+                                        cache_ttl=leaderboard_cache_ttl)
 
     def create_game(self, request: dict) -> dict:
         """ Upon calling create_game, the Mastermind game should initialize
@@ -40,6 +62,8 @@ class ConnectFourGame(GameInterface):
 
          Args:
              request: dictionary containing single key-value pair. The key is "game_id".
+                 The optional keys "width", "height" and "run_length" set the size of the
+                 board and the number of coins in a line needed to win.
 
          Returns:
             reply: dictionary containing the session_id in the request.
@@ -47,8 +71,17 @@ class ConnectFourGame(GameInterface):
 
         new_game_session = request
 
+        width = int(request.get(ConnectFourGame.WIDTH_KEY, ConnectFourBoard.WIDTH))
+        height = int(request.get(ConnectFourGame.HEIGHT_KEY, ConnectFourBoard.HEIGHT))
+        run_length = int(request.get(ConnectFourGame.RUN_LENGTH_KEY, ConnectFourBoard.RUN_LENGTH))
+
         new_game_session[ConnectFourGame.SESSION_ID_KEY] = str(datetime.now())
-        new_game_session[ConnectFourGame.BOARD_KEY] = self.__create_empty_board()
+        new_game_session[ConnectFourGame.WIDTH_KEY] = width
+        new_game_session[ConnectFourGame.HEIGHT_KEY] = height
+        new_game_session[ConnectFourGame.RUN_LENGTH_KEY] = run_length
+        new_game_session[ConnectFourGame.BOARD_KEY] = self.__create_empty_board(width, height)
+        new_game_session[ConnectFourGame.COLUMN_HEIGHTS_KEY] = [0] * width
+        new_game_session[ConnectFourGame.ZOBRIST_HASH_KEY] = ConnectFourBoard().hash
 
         new_game_session[ConnectFourGame.PLAYERS_KEY] = [request["user_id"], request["opponent_id"]]
 
@@ -105,8 +138,13 @@ class ConnectFourGame(GameInterface):
                     sessions.  \n
                 -The second key is 'player_num' The value should either
                     be 1 or 2, corresponding to player 1 and 2 respectively. \n
-                -The third key is 'column' which corresponds to the column (on the scale of 1-7, not 0-6)
-                    the player wants to place their coin is.
+                -The third key is 'column' which corresponds to the column (on the scale of 1-7, not 0-6,
+                    or 1 to "width" on other boards) the player wants to place their coin is. \n
+            If the session's "opponent_id" is "computer", the computer's reply is played
+            before the session is saved, so the reply already contains both moves. Sessions
+            created with a "difficulty" of "easy", "medium" or "hard" are played by the
+            Monte Carlo engine with more worker processes for harder levels, the others by
+            the negamax engine.
 
         Returns:
             reply: dictionary containing four keys. \n
@@ -124,7 +162,6 @@ class ConnectFourGame(GameInterface):
                        [0, 0, 2, 1, 0, 0, 0], \n
                        [0, 0, 1, 2, 1, 0, 0]], "match": False, "session_id": 1, "player_num": 1}
         """
-        session_id = request[ConnectFourGame.SESSION_ID_KEY]
         game_session = request
 
         # Note the column variable is on a scale from 1-7 not 0-6
@@ -133,9 +170,18 @@ class ConnectFourGame(GameInterface):
         player_num = request[ConnectFourGame.PLAYER_NUM_KEY]
         player_key = request["user_id"]
         opponent_key = request["opponent_id"]
+        players = [player_key, opponent_key]
+        # Sessions stored before board sizes existed are standard Connect Four
+        run_length = int(game_session.get(ConnectFourGame.RUN_LENGTH_KEY, ConnectFourBoard.RUN_LENGTH))
 
-        next_valid_row_info = self.__get_next_available_row(board, column)
-        column_is_full = next_valid_row_info is None
+        # Sessions stored before the height vector existed get it filled in from their board
+        column_heights = game_session.get(ConnectFourGame.COLUMN_HEIGHTS_KEY)
+        if column_heights is None:
+            column_heights = ConnectFourBoard.from_board(board, players, run_length).column_heights()
+        column_heights = [int(height) for height in column_heights]
+        game_session[ConnectFourGame.COLUMN_HEIGHTS_KEY] = column_heights
+
+        column_is_full = column_heights[column - 1] >= len(board)
 
         player_status = game_session[ConnectFourGame.PLAYER_STATUS_KEY][player_key]
         opponent_status = game_session[ConnectFourGame.PLAYER_STATUS_KEY][opponent_key]
@@ -153,65 +199,67 @@ class ConnectFourGame(GameInterface):
             resp = self.db.update_game(game_session)
             return resp
 
-        updated_game_state = self.__update_board(board, player_num, column)
-        game_session[ConnectFourGame.PLAY_COUNTER_KEY] += 1
-
-        # Note that row check is on the scale from 1-6
-        row_check = next_valid_row_info['row_coin_is_placed']
-
-        updated_board_state = updated_game_state['updated_board']
-
-        # update the turns the current player has taken
-
-        if player_num == 1:
-            game_session[ConnectFourGame.PLAYER_1_TURNS] += 1
-        elif player_num == 2:
-            game_session[ConnectFourGame.PLAYER_2_TURNS] += 1
-
-        # Check whether a match of 4 exists on the board
-        match_exists = self.__check_all_matches(updated_board_state, player_num, row_check, column)
-
-        new_player_num = player_key if player_num == opponent_key else opponent_key
-        prev_player_num = game_session[ConnectFourGame.PLAYER_NUM_KEY]
-        game_session[ConnectFourGame.PLAYER_NUM_KEY] = new_player_num
-
-        if match_exists:
-            game_session[ConnectFourGame.PLAYER_STATUS_KEY][player_num] = match_exists
-            game_session[ConnectFourGame.STATUS_KEY] = match_exists
-            game_session[ConnectFourGame.PLAYER_NUM_KEY] = prev_player_num
-            self.update_high_scores(game_session[ConnectFourGame.PLAY_COUNTER_KEY], session_id)
+        # The board is only kept as a list of lists at the API/DynamoDB boundary. Sessions stored before the
+        # Zobrist hash existed get it computed from their board
+        position = ConnectFourBoard.from_board(board, players, run_length,
+                                               game_session.get(ConnectFourGame.ZOBRIST_HASH_KEY))
+        game_over = self.__play_turn(game_session, position, column_heights, player_num, column, players)
+
+        # In a game against the computer the engine answers the human move within its time budget.
+        # The engines only know the standard board
+        if not game_over and opponent_key == ConnectFourGame.COMPUTER_ID and player_num == player_key \
+                and position.is_standard():
+            difficulty = game_session.get(ConnectFourGame.DIFFICULTY_KEY)
+            if difficulty:
+                computer_column = self.mcts.best_move(position, 1, difficulty) + 1
+            else:
+                computer_column = self.ai.best_move(position, 1) + 1
+            self.__play_turn(game_session, position, column_heights, opponent_key, computer_column, players)
 
-            if player_num == 1:
-                self.SESSION_SCORE_RECORD.append([session_id, game_session[ConnectFourGame.PLAYER_1_TURNS], ""])
-            elif player_num == 2:
-                self.SESSION_SCORE_RECORD.append([session_id, game_session[ConnectFourGame.PLAYER_2_TURNS], ""])
-            self.SESSION_SCORE_RECORD.sort(key=lambda x: x[1])
+        game_session[ConnectFourGame.BOARD_KEY] = position.to_board(players)
+        game_session[ConnectFourGame.ZOBRIST_HASH_KEY] = position.hash
+        resp = self.db.update_game(game_session)
+        return resp
 
-        # Check if board is full
-        elif self.__check_if_board_is_full(updated_board_state):
-            player_num = 3
-            game_session[ConnectFourGame.PLAYER_NUM_KEY] = player_num
+    def analyze_game(self, request: dict) -> dict:
+        """
+        Args:
+            request: dictionary containing the "game_id" and "session_id" of the session
+            to analyze.
 
-        if player_num == player_key:
-            game_session[ConnectFourGame.PLAYER_1_TURNS] += 1
-        elif player_num == opponent_key:
-            game_session[ConnectFourGame.PLAYER_2_TURNS] += 1
+        Returns:
+            reply: dictionary containing two keys. \n
+                "session_id": The unique session id provided with the original request \n
+                "scores": list with a score for every column from the point of view of the
+                    player to move, higher being better, or None where the column is full.
+                    All scores are None once the game is over or on boards other than the
+                    standard one.
+        """
+        game_session = self.db.get_game_session(request)
+        board = game_session[ConnectFourGame.BOARD_KEY]
+        players = [game_session["user_id"], game_session["opponent_id"]]
+        run_length = int(game_session.get(ConnectFourGame.RUN_LENGTH_KEY, ConnectFourBoard.RUN_LENGTH))
+        position = ConnectFourBoard.from_board(board, players, run_length)
+
+        player_num = game_session[ConnectFourGame.PLAYER_NUM_KEY]
+        game_over = game_session[ConnectFourGame.STATUS_KEY] or player_num not in players
+        if game_over or not position.is_standard():
+            scores = [None] * position.width
+        else:
+            scores = self.analyzer.analyze(position, players.index(player_num))
 
-        game_session[ConnectFourGame.BOARD_KEY] = updated_board_state
-        resp = self.db.update_game(game_session)
-        return resp
+        return {ConnectFourGame.SESSION_ID_KEY: game_session[ConnectFourGame.SESSION_ID_KEY],
+                ConnectFourGame.SCORES_KEY: scores}
 
-    def update_high_scores(self, count, name):
-        prev_score = (count, name)
+    def get_analysis_stats(self):
+        return self.analyzer.stats()
 
-        for i in range(len(self.HIGHSCORE_LIST)):
-            if prev_score[0] < self.HIGHSCORE_LIST[i][0]:
-                temp_score = self.HIGHSCORE_LIST[i]
-                self.HIGHSCORE_LIST[i] = prev_score
-                prev_score = temp_score
+    def get_score_record_stats(self):
+        with self.score_record_lock:
+            return self.SESSION_SCORE_RECORD.stats()
 
     def get_high_scores(self):
-        return {"scores": self.HIGHSCORE_LIST}
+        return self.leaderboard.top()
 
     def delete_game(self, request: dict) -> dict:
         """
@@ -229,212 +277,49 @@ class ConnectFourGame(GameInterface):
     # -------------------------------------------------------------------------
     # Private Helper methods used in the connect_four.py functions
 
-    # Method used to generate an empty board
-    @staticmethod
-    def __create_empty_board():
-        empty_board = [[0, 0, 0, 0, 0, 0, 0],
-                       [0, 0, 0, 0, 0, 0, 0],
-                       [0, 0, 0, 0, 0, 0, 0],
-                       [0, 0, 0, 0, 0, 0, 0],
-                       [0, 0, 0, 0, 0, 0, 0],
-                       [0, 0, 0, 0, 0, 0, 0]]
-        return empty_board
+    # Drops the coin of player_num into the column (on the scale of 1-7) and records the result in the session.
+    # Returns True if the move won or drew the game
+    def __play_turn(self, game_session: dict, position: ConnectFourBoard, column_heights: list, player_num,
+                    column: int, players: list) -> bool:
+        session_id = game_session[ConnectFourGame.SESSION_ID_KEY]
+        side = 0 if player_num == players[0] else 1
+        # Note that row check is on the scale from 1-6
+        row_check = position.play(column - 1, side)
+        column_heights[column - 1] += 1
+        game_session[ConnectFourGame.PLAY_COUNTER_KEY] += 1
 
-    # Returns the row the coin will be placed in (scaled from 1-6, NOT 0-5)
-    @staticmethod
-    def __update_board(board, player_id, column):
-        coin = player_id
-        i = -1
-        while i > -7:
-            if board[i][column - 1] == 0:
-                board[i][column - 1] = coin
-                # Get the proper row_idx (on scale of 1-6) of where coin is placed
-                return {'updated_board': board}
-            i = i - 1
-        return board
+        # update the turns the current player has taken, counted by seat
+        turns_key = ConnectFourGame.PLAYER_1_TURNS if side == 0 else ConnectFourGame.PLAYER_2_TURNS
+        game_session[turns_key] += 1
 
-    @staticmethod
-    def __get_next_available_row(board, column):
-        i = -1
-        while i > -7:
-            if board[i][column - 1] == 0:
-                row_num_idx = 7 - (i * -1)
-                return {'row_coin_is_placed': row_num_idx}
-            i = i - 1
+        # Check whether the coin just placed completed a match of 4
+        match_exists = position.has_won_through(column - 1, row_check, side)
 
-    @staticmethod
-    def __check_if_board_is_full(board):
-        for column in range(7):
-            i = -1
-            while i > -7:
-                if board[i][column] == 0:
-                    return False
-                i = i - 1
-        return True
-
-    # Method used to find a diagonal pointing right (from the bottom most diagonal point)
-    @staticmethod
-    def __find_right_diagonal(board, player_num, row_start, col_start):
-        coin = player_num
-        diagonal_match = True
-
-        #   Adjust indices so that it follows the (0-5) format for row indices and (0-6) format for column indices
-        row_idx = row_start - 1
-        col_idx = col_start - 1
-        row_idx_bound = row_idx - 3
-
-        if row_start < 4:
-            diagonal_match = False
-            return diagonal_match
-        else:
-            #       Check bottom left diagonal for four matches after placing a coin in a certain column
-            while row_idx >= row_idx_bound:
-                if board[row_idx][col_idx] != coin:
-                    diagonal_match = False
-                    break
-                col_idx = col_idx + 1
-                row_idx = row_idx - 1
-            return diagonal_match
-
-    # Method used to find a diagonal pointing left (from the bottom most diagonal point)
-    @staticmethod
-    def __find_left_diagonal(board, player_num, row_start, col_start):
-        coin = player_num
-        diagonal_match = True
-
-        #   Adjust indices so that it follows the (0-5) format for row indices and (0-6) format for column indices
-        row_idx = row_start - 1
-        col_idx = col_start - 1
-        row_idx_bound = row_idx - 3
-
-        if row_start < 4:
-            diagonal_match = False
-            return diagonal_match
-        else:
-            #       Check bottom left diagonal for four matches after placing a coin in a certain column
-            while row_idx >= row_idx_bound:
-                if board[row_idx][col_idx] != coin:
-                    diagonal_match = False
-                    break
-                col_idx = col_idx - 1
-                row_idx = row_idx - 1
-            return diagonal_match
-
-    # Find a horizontal match in a row upon inputting the left-most horizontal coin location
-    @staticmethod
-    def __find_horizontal_match_in_row(board, player, row_start, col_start):
-        coin = player
-        horizontal_match = True
+        new_player_num = players[0] if player_num == players[1] else players[1]
+        prev_player_num = game_session[ConnectFourGame.PLAYER_NUM_KEY]
+        game_session[ConnectFourGame.PLAYER_NUM_KEY] = new_player_num
 
-        # Adjust indices so that it follows the (0-5) format for row indices and (0-6) format for column indices
-        row_idx = row_start - 1
-        col_idx = col_start - 1
-        col_idx_bound = col_idx + 3
+        if match_exists:
+            game_session[ConnectFourGame.PLAYER_STATUS_KEY][player_num] = match_exists
+            game_session[ConnectFourGame.STATUS_KEY] = match_exists
+            game_session[ConnectFourGame.PLAYER_NUM_KEY] = prev_player_num
+            # Wins of the computer opponent do not count towards the high scores
+            if player_num != ConnectFourGame.COMPUTER_ID:
+                self.leaderboard.record(game_session[ConnectFourGame.PLAY_COUNTER_KEY], player_num)
 
-        if col_start > 4:
-            horizontal_match = False
-        else:
-            while col_idx <= col_idx_bound:
-                if board[row_idx][col_idx] != coin:
-                    horizontal_match = False
-                    break
-                col_idx += 1
-        return horizontal_match
-
-    # Find a vertical match in a row upon inputting the bottom-most vertical coin location
-    @staticmethod
-    def __find_vertical_match_in_column(board, player, row_start, col_start):
-        coin = player
-        vertical_match = True
+            with self.score_record_lock:
+                self.SESSION_SCORE_RECORD.add(game_session[turns_key], session_id)
 
-        # Adjust indices so that it follows the (0-5) format for row indices and (0-6) format for column indices
-        row_idx = row_start - 1
-        col_idx = col_start - 1
-        row_idx_bound = row_idx - 3
+        # Check if board is full, every move drops exactly one coin
+        board_is_full = game_session[ConnectFourGame.PLAY_COUNTER_KEY] == position.width * position.height
+        if not match_exists and board_is_full:
+            player_num = 3
+            game_session[ConnectFourGame.PLAYER_NUM_KEY] = player_num
 
-        if row_start < 4:
-            vertical_match = False
-        else:
-            while row_idx >= row_idx_bound:
-                if board[row_idx][col_idx] != coin:
-                    vertical_match = False
-                    break
-                row_idx = row_idx - 1
-        return vertical_match
-
-    # Find all possible horizontal matches upon giving an input row to check
-    def __find_all_horizontals_in_row(self, board, player, row_start):
-        col_idx = 1
-        row_idx = row_start
-        horizontal_match = False
-
-        while col_idx <= 4:
-            match_exists = self.__find_horizontal_match_in_row(board, player, row_idx, col_idx)
-            if match_exists:
-                horizontal_match = True
-                break
-            col_idx += 1
-        return horizontal_match
-
-    # Find all possible vertical matches upon giving an input column to check
-    def __find_all_verticals_in_column(self, board, player, col_start):
-        col_idx = col_start
-        row_idx = 5
-        vertical_match = False
-
-        while row_idx >= 3:
-            match_exists = self.__find_vertical_match_in_column(board, player, row_idx + 1, col_idx)
-            if match_exists:
-                vertical_match = True
-                break
-            row_idx = row_idx - 1
-        return vertical_match
-
-    # Method used to find if there is a right diagonal for a certain player
-    def __find_all_right_diagonals(self, board, player):
-        row_idx = 5
-        col_idx = 0
-
-        while row_idx >= 3:
-            while col_idx <= 3:
-                diag_exists = self.__find_right_diagonal(board, player, row_idx + 1, col_idx + 1)
-                if diag_exists:
-                    return True
-                else:
-                    col_idx = col_idx + 1
-            row_idx = row_idx - 1
-            col_idx = 0
-        return False
-
-    #  Method used to find if there is a left diagonal for a certain player
-    def __find_all_left_diagonals(self, board, player):
-        row_idx = 5
-        col_idx = 6
-
-        while row_idx >= 3:
-            while col_idx >= 3:
-                diag_exists = self.__find_left_diagonal(board, player, row_idx + 1, col_idx + 1)
-                if diag_exists:
-                    return True
-                else:
-                    col_idx = col_idx - 1
-            row_idx = row_idx - 1
-            col_idx = 6
-        return False
-
-    # Method to check if there exists any diagonal for the specified player
-    def __check_diagonals(self, board, player):
-        diag_exists = False
-        right_diag_exists = self.__find_all_right_diagonals(board, player)
-        left_diag_exists = self.__find_all_left_diagonals(board, player)
-        if right_diag_exists or left_diag_exists:
-            diag_exists = True
-        return diag_exists
-
-    # Method to check if there exists any kind of match (diagonal, horizontal, vertical)
-    def __check_all_matches(self, board, player, row_start, col_start):
-        horiz_match = self.__find_all_horizontals_in_row(board, player, row_start)
-        vert_match = self.__find_all_verticals_in_column(board, player, col_start)
-        diag_match = self.__check_diagonals(board, player)
-        match_exists = horiz_match or vert_match or diag_match
-        return match_exists
+        return match_exists or board_is_full
+
+    # Method used to generate an empty board of height rows and width columns
+    @staticmethod
+    def __create_empty_board(width: int, height: int):
+        empty_board = [[0] * width for _ in range(height)]
+        return empty_board
@@ -0,0 +1,224 @@
+import time
+
+from pyarcade.Games.connect_four_board import ConnectFourBoard
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+class ConnectFourAI:
+    """ A computer opponent for Connect Four.
+
+    The engine searches the bitboards of a ConnectFourBoard with iterative deepening
+    negamax and alpha-beta pruning. Every iteration that finishes inside the time
+    budget replaces the chosen column, so a move is always ready when time runs out.
+    Columns are tried center first, after the best column remembered for the position
+    in a transposition table of fixed size, so memory stays bounded however long the
+    process runs.
+
+    Inside the search a position is a pair of integers: the coins of the player to
+    move and the mask of all coins. Leaves are scored by the number of cells that
+    would complete a line for each side.
+
+    Args:
+        time_budget: seconds the search may spend on a single move.
+        table_size: number of slots in the transposition table.
+        opening_book: optional ConnectFourOpeningBook consulted before searching.
+    """
+    WIN_SCORE = 1000
+    EXACT = 0
+    LOWER_BOUND = 1
+    UPPER_BOUND = 2
+
+    def __init__(self, time_budget: float = 0.5, table_size: int = 1 << 16, opening_book=None):
+        self.time_budget = time_budget
+        self.opening_book = opening_book
+        self.table_size = table_size
+        self.table = [None] * table_size
+
+        width = ConnectFourBoard.WIDTH
+        height = ConnectFourBoard.HEIGHT
+        self.cells = width * height
+        self.bottom_masks = [1 << (col * (height + 1)) for col in range(width)]
+        self.column_masks = [((1 << height) - 1) << (col * (height + 1)) for col in range(width)]
+        self.bottom_row = sum(self.bottom_masks)
+        self.board_mask = sum(self.column_masks)
+        self.column_order = sorted(range(width), key=lambda col: abs(width // 2 - col))
+
+    def best_move(self, position: ConnectFourBoard, side: int) -> int:
+        """
+        Args:
+            position: the current position, which must have at least one playable column.
+            side: the side the engine plays for, 0 for players[0] and 1 for players[1].
+
+        Returns:
+            col: the column index from 0-6 the engine plays.
+        """
+        if self.opening_book is not None:
+            book_entry = self.opening_book.lookup(position, side)
+            if book_entry is not None:
+                return book_entry[0]
+        return self.search(position, side)[0]
+
+    def search(self, position: ConnectFourBoard, side: int, max_depth: int = None) -> tuple:
+        """ Runs the iterative deepening search until the time budget, max_depth or a
+        proven result stops it.
+
+        Args:
+            position: the current position, which must have at least one playable column.
+            side: the side to move, 0 for players[0] and 1 for players[1].
+            max_depth: deepest iteration to run, or None to only be limited by time.
+
+        Returns:
+            reply: tuple of the best column index from 0-6 and its score for the side to
+            move. Scores of WIN_SCORE or more are proven wins, scores of -WIN_SCORE or
+            less proven losses.
+        """
+        deadline = time.monotonic() + self.time_budget
+        current = position.coins[side]
+        mask = position.mask
+        moves = bin(mask).count('1')
+        last_depth = self.cells - moves if max_depth is None else min(max_depth, self.cells - moves)
+
+        best_col = next(col for col in self.column_order if position.can_play(col))
+        best_score = 0
+        for depth in range(1, last_depth + 1):
+            try:
+                # The first iteration always completes so that the engine never plays blind
+                best_score, best_col = self.__search_root(current, mask, moves, depth,
+                                                          deadline if depth > 1 else float('inf'))
+            except _SearchTimeout:
+                break
+            if abs(best_score) >= ConnectFourAI.WIN_SCORE:
+                break
+        return best_col, best_score
+
+    # -------------------------------------------------------------------------
+    # Private helper methods used by the search
+
+    def __search_root(self, current: int, mask: int, moves: int, depth: int, deadline: float) -> tuple:
+        possible = (mask + self.bottom_row) & self.board_mask
+        winning_moves = self.__winning_cells(current, mask) & possible
+        if winning_moves:
+            col = next(col for col in self.column_order if winning_moves & self.column_masks[col])
+            return ConnectFourAI.WIN_SCORE + self.cells - moves, col
+
+        candidates = self.__non_losing_moves(current, mask, possible)
+        if not candidates:
+            # Every move loses, so at least block one of the opponent's threats
+            opponent_threats = self.__winning_cells(current ^ mask, mask) & possible
+            candidates = opponent_threats or possible
+
+        alpha = -float('inf')
+        best_col = None
+        for col in self.__ordered_columns(self.__table_column(current + mask)):
+            move = candidates & self.column_masks[col]
+            if not move:
+                continue
+            score = -self.__negamax(current ^ mask, mask | move, moves + 1, depth - 1, -float('inf'), -alpha,
+                                    deadline)
+            if best_col is None or score > alpha:
+                alpha = score
+                best_col = col
+        return alpha, best_col
+
+    def __negamax(self, current: int, mask: int, moves: int, depth: int, alpha: float, beta: float,
+                  deadline: float) -> int:
+        if time.monotonic() > deadline:
+            raise _SearchTimeout()
+        if moves == self.cells:
+            return 0
+
+        possible = (mask + self.bottom_row) & self.board_mask
+        if self.__winning_cells(current, mask) & possible:
+            return ConnectFourAI.WIN_SCORE + self.cells - moves
+
+        non_losing = self.__non_losing_moves(current, mask, possible)
+        if not non_losing:
+            return -(ConnectFourAI.WIN_SCORE + self.cells - moves - 1)
+        if depth == 0:
+            return self.__evaluate(current, mask)
+
+        key = current + mask
+        slot = key % self.table_size
+        entry = self.table[slot]
+        table_col = None
+        if entry is not None and entry[0] == key:
+            table_col = entry[4]
+            if entry[1] >= depth:
+                flag, score = entry[2], entry[3]
+                if flag == ConnectFourAI.EXACT:
+                    return score
+                elif flag == ConnectFourAI.LOWER_BOUND:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        original_alpha = alpha
+        best_score = -float('inf')
+        best_col = None
+        for col in self.__ordered_columns(table_col):
+            move = non_losing & self.column_masks[col]
+            if not move:
+                continue
+            score = -self.__negamax(current ^ mask, mask | move, moves + 1, depth - 1, -beta, -alpha, deadline)
+            if score > best_score:
+                best_score = score
+                best_col = col
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = ConnectFourAI.UPPER_BOUND
+        elif best_score >= beta:
+            flag = ConnectFourAI.LOWER_BOUND
+        else:
+            flag = ConnectFourAI.EXACT
+        self.table[slot] = (key, depth, flag, best_score, best_col)
+        return best_score
+
+    # Returns the moves that do not hand the opponent an immediate win
+    def __non_losing_moves(self, current: int, mask: int, possible: int) -> int:
+        opponent_threats = self.__winning_cells(current ^ mask, mask)
+        forced_moves = possible & opponent_threats
+        if forced_moves:
+            # With two threats to block the opponent wins on their next move
+            if forced_moves & (forced_moves - 1):
+                return 0
+            possible = forced_moves
+        # Never play directly below a cell that completes a line for the opponent
+        return possible & ~(opponent_threats >> 1)
+
+    def __evaluate(self, current: int, mask: int) -> int:
+        own_threats = self.__winning_cells(current, mask)
+        opponent_threats = self.__winning_cells(current ^ mask, mask)
+        return bin(own_threats).count('1') - bin(opponent_threats).count('1')
+
+    # Returns the empty cells that would complete a line of four for the given coins
+    def __winning_cells(self, coins: int, mask: int) -> int:
+        height = ConnectFourBoard.HEIGHT
+        # vertical
+        cells = (coins << 1) & (coins << 2) & (coins << 3)
+        for shift in (height, height + 1, height + 2):
+            pair = (coins << shift) & (coins << 2 * shift)
+            cells |= pair & (coins << 3 * shift)
+            cells |= pair & (coins >> shift)
+            pair = (coins >> shift) & (coins >> 2 * shift)
+            cells |= pair & (coins << shift)
+            cells |= pair & (coins >> 3 * shift)
+        return cells & (self.board_mask ^ mask)
+
+    def __table_column(self, key: int):
+        entry = self.table[key % self.table_size]
+        if entry is not None and entry[0] == key:
+            return entry[4]
+        return None
+
+    def __ordered_columns(self, first_col) -> list:
+        if first_col is None:
+            return self.column_order
+        return [first_col] + [col for col in self.column_order if col != first_col]
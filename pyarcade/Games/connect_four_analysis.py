@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+
+from pyarcade.Games.connect_four_ai import ConnectFourAI
+from pyarcade.Games.connect_four_board import ConnectFourBoard
+
+
+class ConnectFourAnalyzer:
+    """ Scores every column of a Connect Four position for hints.
+
+    Each column is scored by a fixed depth negamax search of the position after the
+    move, so the same position always gets the same scores. The scores are kept in a
+    least recently used cache shared by every session of the process. The cache is
+    keyed by the canonical key of the position (see ConnectFourBoard.canonical_key),
+    so a position and its mirror image share one entry, with the scores stored left
+    to right for the canonical orientation.
+
+    Args:
+        depth: depth of the search run after each candidate move.
+        cache_size: number of positions kept in the cache.
+    """
+
+    def __init__(self, depth: int = 6, cache_size: int = 4096):
+        self.depth = depth
+        self.cache_size = cache_size
+        self.ai = ConnectFourAI(time_budget=float('inf'))
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Flask may serve requests from several threads of the process
+        self.lock = threading.Lock()
+
+    def analyze(self, position: ConnectFourBoard, side: int) -> list:
+        """
+        Args:
+            position: a position on the standard board.
+            side: the side to move, 0 for players[0] and 1 for players[1].
+
+        Returns:
+            scores: list with the score of each column for the side to move, or None for
+            full columns. Scores of ConnectFourAI.WIN_SCORE or more are proven wins,
+            scores of -ConnectFourAI.WIN_SCORE or less proven losses.
+        """
+        key, mirrored = position.canonical_key(side)
+        with self.lock:
+            scores = self.cache.get(key)
+            if scores is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if scores is None:
+            scores = self.__score_columns(position.mirror() if mirrored else position, side)
+            with self.lock:
+                self.cache[key] = scores
+                self.cache.move_to_end(key)
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+
+        if mirrored:
+            return list(reversed(scores))
+        return list(scores)
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            reply: dictionary with the "hits" and "misses" of the cache since the process
+            started, and its current "size" and "capacity".
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.cache),
+                    "capacity": self.cache_size}
+
+    # Searches the position after every playable column
+    def __score_columns(self, position: ConnectFourBoard, side: int) -> tuple:
+        moves = bin(position.mask).count('1')
+        cells = position.width * position.height
+        scores = []
+        for col in range(position.width):
+            if not position.can_play(col):
+                scores.append(None)
+                continue
+            child = position.copy()
+            row = child.play(col, side)
+            if child.has_won_through(col, row, side):
+                scores.append(ConnectFourAI.WIN_SCORE + cells - moves)
+            elif child.is_full():
+                scores.append(0)
+            else:
+                scores.append(-self.ai.search(child, 1 - side, max_depth=self.depth)[1])
+        return tuple(scores)
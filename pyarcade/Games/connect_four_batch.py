@@ -0,0 +1,141 @@
+import numpy as np
+
+from pyarcade.Games.connect_four_board import ConnectFourBoard
+
+
+class ConnectFourBatch:
+    """ Plays many Connect Four games in lockstep with NumPy arrays.
+
+    Every call to step drops one coin in each unfinished game. Dropping, the win check
+    through the new coin and the draw check are array operations over the whole batch,
+    and nothing is written to DynamoDB, so millions of games can be simulated for load
+    modelling and AI evaluation.
+
+    The rules are those of ConnectFourGame.update_game: a move into a full column
+    places no coin but still hands the turn to the other player, a line of four ends
+    the game, and a full board without a line is a draw.
+
+    Args:
+        games: number of games played side by side.
+
+    Attributes:
+        boards: int8 array of shape (games, HEIGHT, WIDTH), top row first like the
+            session board, holding 0 for an empty cell and 1 or 2 for the coin of the
+            first or second player.
+        heights: number of coins in each column of each game.
+        to_move: the player, 1 or 2, whose turn it is in each game.
+        results: 0 while a game is running, 1 or 2 for the winner, 3 for a draw.
+        moves: number of coins placed in each game.
+    """
+    WIDTH = ConnectFourBoard.WIDTH
+    HEIGHT = ConnectFourBoard.HEIGHT
+    RUNNING = 0
+    DRAW = 3
+    # (row step, column step) of the vertical, horizontal and two diagonal lines
+    DIRECTIONS = ((1, 0), (0, 1), (1, 1), (1, -1))
+
+    def __init__(self, games: int):
+        self.games = games
+        self.boards = np.zeros((games, self.HEIGHT, self.WIDTH), dtype=np.int8)
+        self.heights = np.zeros((games, self.WIDTH), dtype=np.int8)
+        self.to_move = np.ones(games, dtype=np.int8)
+        self.results = np.zeros(games, dtype=np.int8)
+        self.moves = np.zeros(games, dtype=np.int16)
+
+    def running(self) -> np.ndarray:
+        return self.results == ConnectFourBatch.RUNNING
+
+    def legal_moves(self) -> np.ndarray:
+        """
+        Returns:
+            legal: bool array of shape (games, WIDTH), True where a column has room.
+        """
+        return self.heights < self.HEIGHT
+
+    def step(self, columns: np.ndarray) -> np.ndarray:
+        """ Plays one move in every unfinished game.
+
+        Args:
+            columns: int array of shape (games,) with the column index from 0-6 to play
+                in each game. Entries for finished games are ignored.
+
+        Returns:
+            results: the results array after the move.
+        """
+        columns = np.asarray(columns, dtype=np.int64)
+        games = np.arange(self.games)
+        player = self.to_move.copy()
+
+        playing = self.running() & (self.heights[games, columns] < self.HEIGHT)
+        rows = self.HEIGHT - 1 - self.heights[games, columns].astype(np.int64)
+
+        dropped = games[playing]
+        self.boards[dropped, rows[playing], columns[playing]] = player[playing]
+        self.heights[dropped, columns[playing]] += 1
+        self.moves[dropped] += 1
+
+        won = playing & self.__completes_line(rows, columns, player)
+        drawn = playing & ~won & (self.moves == self.WIDTH * self.HEIGHT)
+        self.results[won] = player[won]
+        self.results[drawn] = ConnectFourBatch.DRAW
+
+        # Running games hand the turn over, even when their column was full
+        still_running = self.running()
+        self.to_move[still_running] = 3 - player[still_running]
+        return self.results
+
+    def run(self, policy, max_steps: int = None) -> np.ndarray:
+        """ Steps the batch until every game is over.
+
+        Args:
+            policy: callable taking this batch and returning the columns to play, as
+                expected by step.
+            max_steps: optional limit on the number of steps.
+
+        Returns:
+            results: the results array once the games are over or max_steps is reached.
+        """
+        steps = 0
+        while self.running().any() and (max_steps is None or steps < max_steps):
+            self.step(policy(self))
+            steps += 1
+        return self.results
+
+    def to_board(self, game: int, players: list) -> list:
+        """
+        Returns:
+            board: the board of one game in the list-of-lists format of a session, with
+            the ids in players in place of 1 and 2.
+        """
+        cells = [0, players[0], players[1]]
+        return [[cells[cell] for cell in row] for row in self.boards[game].tolist()]
+
+    # Counts the coins of player on both sides of the new coin along every line
+    def __completes_line(self, rows: np.ndarray, columns: np.ndarray, player: np.ndarray) -> np.ndarray:
+        games = np.arange(self.games)
+        completes = np.zeros(self.games, dtype=bool)
+        for row_step, col_step in ConnectFourBatch.DIRECTIONS:
+            run = np.ones(self.games, dtype=np.int8)
+            for sign in (1, -1):
+                extending = np.ones(self.games, dtype=bool)
+                for distance in range(1, 4):
+                    line_rows = rows + sign * distance * row_step
+                    line_cols = columns + sign * distance * col_step
+                    on_board = (line_rows >= 0) & (line_rows < self.HEIGHT) \
+                        & (line_cols >= 0) & (line_cols < self.WIDTH)
+                    cells = self.boards[games, np.clip(line_rows, 0, self.HEIGHT - 1),
+                                        np.clip(line_cols, 0, self.WIDTH - 1)]
+                    extending &= on_board & (cells == player)
+                    run += extending
+            completes |= run >= 4
+        return completes
+
+
+def random_policy(rng: np.random.Generator):
+    """ Returns a policy for ConnectFourBatch.run that picks a random column with room
+    in every game.
+    """
+    def policy(batch: ConnectFourBatch) -> np.ndarray:
+        weights = rng.random((batch.games, batch.WIDTH)) * batch.legal_moves()
+        return weights.argmax(axis=1)
+    return policy
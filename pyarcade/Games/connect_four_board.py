@@ -0,0 +1,240 @@
+from pyarcade.Games.zobrist import CONNECT_FOUR_ZOBRIST
+
+
+class ConnectFourBoard:
+    """ A bitboard representation of a Connect-N position.
+
+    Each player's coins are kept in a single integer. Column ``c`` owns bits
+    ``c * (height + 1)`` to ``c * (height + 1) + height - 1`` (bottom to top), plus
+    one spare bit on top so that shifting a column never spills into the next one.
+    ``mask`` holds every coin on the board and doubles as the height mask: adding the
+    bottom bit of a column to it carries into the first empty cell of that column.
+    Python integers grow as needed, so any board size fits.
+
+    ``hash`` is the Zobrist hash of the coins on the board. It is updated with one XOR
+    per coin dropped, so it can be stored with a session and used as a cache key
+    without walking the board.
+
+    The list-of-lists ``board`` used by the API and DynamoDB is only built at the
+    boundary through :meth:`from_board` and :meth:`to_board`.
+
+    Args:
+        width: number of columns, WIDTH for standard Connect Four.
+        height: number of rows, HEIGHT for standard Connect Four.
+        run_length: number of coins in a line needed to win, RUN_LENGTH for standard Connect Four.
+
+    Note:
+        Columns are indexed from 0 here, while the game API counts them from 1.
+    """
+    WIDTH = 7
+    HEIGHT = 6
+    RUN_LENGTH = 4
+
+    def __init__(self, width: int = WIDTH, height: int = HEIGHT, run_length: int = RUN_LENGTH):
+        self.width = width
+        self.height = height
+        self.run_length = run_length
+        # coins[0] belongs to players[0] (the user), coins[1] to players[1] (the opponent)
+        self.coins = [0, 0]
+        self.mask = 0
+        self.hash = 0
+
+    @classmethod
+    def from_board(cls, board: list, players: list, run_length: int = RUN_LENGTH, zobrist_hash: int = None):
+        """
+        Args:
+            board: list of rows, top row first, where 0 marks an empty cell and any other
+                value is the id of the player owning the coin. The size of the position
+                is taken from the board.
+            players: list of the two player ids, [user_id, opponent_id].
+            run_length: number of coins in a line needed to win.
+            zobrist_hash: the hash stored with the board, if any. It is computed from the
+                coins otherwise.
+
+        Returns:
+            position: a ConnectFourBoard holding the same coins as the board.
+        """
+        position = cls(len(board[0]), len(board), run_length)
+        height = position.height
+        for col in range(position.width):
+            for row in range(height):
+                cell = board[height - 1 - row][col]
+                if cell == 0:
+                    break
+                bit = 1 << (col * (height + 1) + row)
+                side = 0 if cell == players[0] else 1
+                position.coins[side] |= bit
+                position.mask |= bit
+                if zobrist_hash is None:
+                    position.hash ^= CONNECT_FOUR_ZOBRIST.key(2 * (col * (height + 1) + row) + side)
+        if zobrist_hash is not None:
+            position.hash = int(zobrist_hash)
+        return position
+
+    def to_board(self, players: list) -> list:
+        """
+        Args:
+            players: list of the two player ids, [user_id, opponent_id].
+
+        Returns:
+            board: list of height rows, top row first, in the format stored with a session.
+        """
+        board = [[0] * self.width for _ in range(self.height)]
+        for col in range(self.width):
+            for row in range(self.height):
+                bit = 1 << (col * (self.height + 1) + row)
+                if not self.mask & bit:
+                    break
+                board[self.height - 1 - row][col] = players[0] if self.coins[0] & bit else players[1]
+        return board
+
+    def is_standard(self) -> bool:
+        """ Returns True for the 7x6 connect-4 board the computer opponents are built for. """
+        return (self.width, self.height, self.run_length) == \
+            (ConnectFourBoard.WIDTH, ConnectFourBoard.HEIGHT, ConnectFourBoard.RUN_LENGTH)
+
+    def copy(self):
+        position = ConnectFourBoard(self.width, self.height, self.run_length)
+        position.coins = list(self.coins)
+        position.mask = self.mask
+        position.hash = self.hash
+        return position
+
+    def mirror(self):
+        """ Returns the left-right mirror image of the position. """
+        position = ConnectFourBoard(self.width, self.height, self.run_length)
+        column_bits = (1 << (self.height + 1)) - 1
+        for side in range(2):
+            for col in range(self.width):
+                column = (self.coins[side] >> (col * (self.height + 1))) & column_bits
+                position.coins[side] |= column << ((self.width - 1 - col) * (self.height + 1))
+        position.mask = position.coins[0] | position.coins[1]
+        for side in range(2):
+            coins = position.coins[side]
+            while coins:
+                bit = coins & -coins
+                position.hash ^= CONNECT_FOUR_ZOBRIST.key(2 * (bit.bit_length() - 1) + side)
+                coins ^= bit
+        return position
+
+    def key(self, side: int) -> int:
+        """ Returns a number identifying the position with the given side to move. Adding
+        the mask to that side's coins sets the bit above the top coin of each column, so
+        no two positions share a key and the key never reaches into a neighbouring column.
+        """
+        return self.coins[side] + self.mask
+
+    def canonical_key(self, side: int) -> tuple:
+        """ Returns the smaller of the keys of the position and of its left-right mirror,
+        so that both share one entry in caches and opening books.
+
+        Returns:
+            reply: tuple of the canonical key and True if it is the key of the mirror,
+            in which case column c of the stored entry is column width - 1 - c here.
+        """
+        key = self.key(side)
+        column_bits = (1 << (self.height + 1)) - 1
+        mirrored_key = 0
+        for col in range(self.width):
+            column = (key >> (col * (self.height + 1))) & column_bits
+            mirrored_key |= column << ((self.width - 1 - col) * (self.height + 1))
+        if mirrored_key < key:
+            return mirrored_key, True
+        return key, False
+
+    def column_heights(self) -> list:
+        """
+        Returns:
+            heights: list with the number of coins in each column, left to right.
+        """
+        column_mask = (1 << self.height) - 1
+        return [((self.mask >> (col * (self.height + 1))) & column_mask).bit_length() for col in range(self.width)]
+
+    def can_play(self, col: int) -> bool:
+        return self.mask & self.__top_mask(col) == 0
+
+    def play(self, col: int, side: int) -> int:
+        """ Drops a coin for the given side into a column that is not full.
+
+        Args:
+            col: column index from 0 to width - 1.
+            side: 0 for players[0], 1 for players[1].
+
+        Returns:
+            row: the row the coin landed in, on the scale of 1 to height counted from the
+            top like the list-of-lists board.
+        """
+        move = (self.mask + self.__bottom_mask(col)) & self.__column_mask(col)
+        self.coins[side] |= move
+        self.mask |= move
+        self.hash ^= CONNECT_FOUR_ZOBRIST.key(2 * (move.bit_length() - 1) + side)
+        row_from_bottom = move.bit_length() - 1 - col * (self.height + 1)
+        return self.height - row_from_bottom
+
+    def is_full(self) -> bool:
+        return self.mask == self.__full_mask()
+
+    def has_won_through(self, col: int, row: int, side: int) -> bool:
+        """ Checks only the horizontal, vertical and two diagonal lines through one coin,
+        counting matching coins outward from it in both directions. Only these lines can
+        have been completed by the last drop, so the cost grows with run_length and not
+        with the size of the board.
+
+        Args:
+            col: column index from 0 to width - 1 of the coin.
+            row: row of the coin on the scale of 1 to height counted from the top, as
+                returned by play.
+            side: 0 for players[0], 1 for players[1].
+
+        Returns:
+            True if the coin is part of a run of run_length or more for that side.
+        """
+        coins = self.coins[side]
+        coin = 1 << (col * (self.height + 1) + self.height - row)
+        for shift in (1, self.height, self.height + 1, self.height + 2):
+            run = 1
+            bit = coin << shift
+            while run < self.run_length and coins & bit:
+                run += 1
+                bit <<= shift
+            bit = coin >> shift
+            while run < self.run_length and coins & bit:
+                run += 1
+                bit >>= shift
+            if run >= self.run_length:
+                return True
+        return False
+
+    def has_won(self, side: int) -> bool:
+        """ Checks every line of the board at once: for each direction, a run survives
+        shift-and-AND steps that double the length covered until run_length is reached.
+        """
+        coins = self.coins[side]
+        for shift in (1, self.height, self.height + 1, self.height + 2):
+            runs = coins
+            length = 1
+            while length < self.run_length:
+                step = min(length, self.run_length - length)
+                runs &= runs >> (step * shift)
+                length += step
+            if runs:
+                return True
+        return False
+
+    # -------------------------------------------------------------------------
+    # Private helper methods used to build the masks of a column
+
+    def __bottom_mask(self, col: int) -> int:
+        return 1 << (col * (self.height + 1))
+
+    def __top_mask(self, col: int) -> int:
+        return 1 << (self.height - 1 + col * (self.height + 1))
+
+    def __column_mask(self, col: int) -> int:
+        return ((1 << self.height) - 1) << (col * (self.height + 1))
+
+    def __full_mask(self) -> int:
+        full_mask = 0
+        for col in range(self.width):
+            full_mask |= self.__column_mask(col)
+        return full_mask
@@ -0,0 +1,136 @@
+import argparse
+import mmap
+import os
+import struct
+
+from pyarcade.Games.connect_four_ai import ConnectFourAI
+from pyarcade.Games.connect_four_board import ConnectFourBoard
+
+
+class ConnectFourOpeningBook:
+    """ A read-only Connect Four opening book backed by a memory-mapped file.
+
+    The file is an 8 byte header followed by fixed-size records sorted by the
+    canonical key of their position (see ConnectFourBoard.canonical_key). Each record
+    holds the key, the score of the position for the side to move and the best column,
+    so a lookup is a binary search over the mapped pages. Nothing is parsed at startup,
+    and every worker that maps the same file shares its pages through the OS cache.
+
+    Books are written offline by build_opening_book, or from the command line with:
+        python -m pyarcade.Games.connect_four_book <path> --plies 6 --search-depth 10
+
+    Args:
+        path: location of a book file written by build_opening_book.
+    """
+    MAGIC = b'C4OB'
+    HEADER = struct.Struct('<4sBBBx')
+    RECORD = struct.Struct('<QhB')
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as book_file:
+            self.data = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, width, height, self.plies = ConnectFourOpeningBook.HEADER.unpack_from(self.data, 0)
+        if magic != ConnectFourOpeningBook.MAGIC \
+                or width != ConnectFourBoard.WIDTH or height != ConnectFourBoard.HEIGHT:
+            self.data.close()
+            raise Exception("{} is not a Connect Four opening book.".format(path))
+        self.size = (len(self.data) - ConnectFourOpeningBook.HEADER.size) // ConnectFourOpeningBook.RECORD.size
+
+    def lookup(self, position: ConnectFourBoard, side: int):
+        """
+        Args:
+            position: the position to look up.
+            side: the side to move, 0 for players[0] and 1 for players[1].
+
+        Returns:
+            reply: tuple of the best column index from 0-6 and its score for the side to
+            move, or None if the position is not in the book.
+        """
+        key, mirrored = position.canonical_key(side)
+
+        low = 0
+        high = self.size
+        while low < high:
+            middle = (low + high) // 2
+            record_key, score, col = self.__read_record(middle)
+            if record_key < key:
+                low = middle + 1
+            elif record_key > key:
+                high = middle
+            else:
+                if mirrored:
+                    col = ConnectFourBoard.WIDTH - 1 - col
+                return col, score
+        return None
+
+    def close(self):
+        self.data.close()
+
+    def __read_record(self, index: int) -> tuple:
+        offset = ConnectFourOpeningBook.HEADER.size + index * ConnectFourOpeningBook.RECORD.size
+        return ConnectFourOpeningBook.RECORD.unpack_from(self.data, offset)
+
+
+def build_opening_book(path: str, plies: int, search_depth: int) -> int:
+    """ Searches every position reachable within the given number of plies and writes
+    the opening book file.
+
+    Positions that are already won are left out. A position and its mirror image are
+    stored once.
+
+    Args:
+        path: where to write the book. The file is replaced atomically, so workers that
+            still map an older book keep reading it until they reopen the path.
+        plies: the book covers every position with up to this many coins on the board.
+        search_depth: depth of the negamax search run for each position.
+
+    Returns:
+        size: number of positions written.
+    """
+    ai = ConnectFourAI(time_budget=float('inf'))
+    book = {}
+
+    frontier = {ConnectFourBoard().canonical_key(0)[0]: ConnectFourBoard()}
+    for ply in range(plies + 1):
+        side = ply % 2
+        next_frontier = {}
+        for key, position in frontier.items():
+            col, score = ai.search(position, side, max_depth=search_depth)
+            book[key] = (score, col)
+
+            if ply == plies:
+                continue
+            for next_col in range(ConnectFourBoard.WIDTH):
+                if not position.can_play(next_col):
+                    continue
+                child = position.copy()
+                row = child.play(next_col, side)
+                if child.has_won_through(next_col, row, side) or child.is_full():
+                    continue
+                child_key, mirrored = child.canonical_key(1 - side)
+                if mirrored:
+                    child = child.mirror()
+                next_frontier[child_key] = child
+        frontier = next_frontier
+
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as book_file:
+        book_file.write(ConnectFourOpeningBook.HEADER.pack(ConnectFourOpeningBook.MAGIC, ConnectFourBoard.WIDTH,
+                                                           ConnectFourBoard.HEIGHT, plies))
+        for key in sorted(book):
+            score, col = book[key]
+            book_file.write(ConnectFourOpeningBook.RECORD.pack(key, score, col))
+    os.replace(temporary_path, path)
+    return len(book)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build a Connect Four opening book.")
+    parser.add_argument('path', help="file to write the book to")
+    parser.add_argument('--plies', type=int, default=6, help="cover every position with up to this many coins")
+    parser.add_argument('--search-depth', type=int, default=10, help="negamax depth used for each position")
+    args = parser.parse_args()
+
+    positions = build_opening_book(args.path, args.plies, args.search_depth)
+    print("Wrote {} positions to {}".format(positions, args.path))
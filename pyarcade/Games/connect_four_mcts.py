@@ -0,0 +1,222 @@
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pyarcade.Games.connect_four_board import ConnectFourBoard
+
+WIDTH = ConnectFourBoard.WIDTH
+HEIGHT = ConnectFourBoard.HEIGHT
+CELLS = WIDTH * HEIGHT
+BOTTOM_MASKS = [1 << (col * (HEIGHT + 1)) for col in range(WIDTH)]
+TOP_MASKS = [1 << (HEIGHT - 1 + col * (HEIGHT + 1)) for col in range(WIDTH)]
+COLUMN_MASKS = [((1 << HEIGHT) - 1) << (col * (HEIGHT + 1)) for col in range(WIDTH)]
+
+
+class ConnectFourMCTS:
+    """ A Monte Carlo tree search opponent for Connect Four.
+
+    Each move is searched with root parallelism: every worker process grows its own
+    UCT tree from the current position until the time budget runs out, and the visit
+    and win counts of the root's children are summed over the workers. The column
+    visited most often is played. More workers mean more playouts in the same wall
+    clock time, so a harder difficulty costs more cores, not a slower reply.
+
+    A column that wins at once is always played, and otherwise a column the opponent
+    would win with at once is blocked, without searching. Random playouts can miss
+    such moves within a short time budget.
+
+    Playouts run on a pair of integers (the coins of the player to move and the mask
+    of all coins, as in ConnectFourBoard) and never touch a game session.
+
+    The process pool is started on the first move that needs it and is shared by all
+    sessions of the game.
+
+    Args:
+        time_budget: seconds every worker spends on a single move.
+        workers: number of worker processes, defaults to the number of CPUs.
+        exploration: UCT exploration constant.
+    """
+    # Share of the workers used at each difficulty level
+    DIFFICULTY_LEVELS = {'easy': 0.0, 'medium': 0.5, 'hard': 1.0}
+
+    def __init__(self, time_budget: float = 0.5, workers: int = None, exploration: float = 1.4):
+        self.time_budget = time_budget
+        self.workers = workers or os.cpu_count() or 1
+        self.exploration = exploration
+        self.executor = None
+
+    def best_move(self, position: ConnectFourBoard, side: int, difficulty: str = 'hard') -> int:
+        """
+        Args:
+            position: the current position, which must have at least one playable column.
+            side: the side the engine plays for, 0 for players[0] and 1 for players[1].
+            difficulty: one of the keys of DIFFICULTY_LEVELS.
+
+        Returns:
+            col: the column index from 0-6 the engine plays.
+        """
+        workers = self.workers_for(difficulty)
+        forced = _forced_move(position.coins[side], position.coins[1 - side], position.mask)
+        if forced is not None:
+            return forced
+        visits, wins = self.search(position, side, workers)
+        return max(range(WIDTH), key=lambda col: (visits[col], wins[col]))
+
+    def search(self, position: ConnectFourBoard, side: int, workers: int) -> tuple:
+        """ Grows one tree per worker and merges their root statistics.
+
+        Args:
+            position: the current position, which must have at least one playable column.
+            side: the side to move, 0 for players[0] and 1 for players[1].
+            workers: number of trees to grow side by side.
+
+        Returns:
+            reply: tuple of two lists with the summed visits and wins of each column,
+            where wins are counted for the side to move and a draw counts as half a win.
+        """
+        moves = bin(position.mask).count('1')
+        args = (position.coins[side], position.mask, moves, self.time_budget, self.exploration)
+        if workers == 1:
+            results = [run_playouts(*args, random.randrange(1 << 32))]
+        else:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            futures = [self.executor.submit(run_playouts, *args, random.randrange(1 << 32))
+                       for _ in range(workers)]
+            results = [future.result() for future in futures]
+
+        visits = [sum(result[0][col] for result in results) for col in range(WIDTH)]
+        wins = [sum(result[1][col] for result in results) for col in range(WIDTH)]
+        return visits, wins
+
+    def workers_for(self, difficulty: str) -> int:
+        if difficulty not in ConnectFourMCTS.DIFFICULTY_LEVELS:
+            raise Exception("Unknown difficulty {}.".format(difficulty))
+        return max(1, round(self.workers * ConnectFourMCTS.DIFFICULTY_LEVELS[difficulty]))
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+class _Node:
+    __slots__ = ('current', 'mask', 'moves', 'children', 'untried', 'visits', 'wins', 'result')
+
+    def __init__(self, current: int, mask: int, moves: int, result):
+        self.current = current
+        self.mask = mask
+        self.moves = moves
+        self.children = {}
+        # result is None while the game goes on, 1.0 if the player who just moved won, 0.5 for a draw
+        self.result = result
+        self.untried = [] if result is not None else [col for col in range(WIDTH) if not mask & TOP_MASKS[col]]
+        random.shuffle(self.untried)
+        self.visits = 0
+        # Wins are counted for the player who moved into this node
+        self.wins = 0.0
+
+
+def run_playouts(current: int, mask: int, moves: int, time_budget: float, exploration: float, seed: int) -> tuple:
+    """ Grows a UCT tree from one position until the time budget runs out. Runs inside
+    the worker processes of ConnectFourMCTS, so it only takes and returns plain values.
+
+    Returns:
+        reply: tuple of two lists with the visits and wins of each column at the root.
+    """
+    random.seed(seed)
+    deadline = time.monotonic() + time_budget
+    root = _Node(current, mask, moves, None)
+
+    while True:
+        node = root
+        path = [root]
+        # Selection
+        while not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            node = max(node.children.values(),
+                       key=lambda child: child.wins / child.visits
+                       + exploration * math.sqrt(log_visits / child.visits))
+            path.append(node)
+
+        # Expansion
+        if node.untried:
+            col = node.untried.pop()
+            child = _play(node, col)
+            node.children[col] = child
+            node = child
+            path.append(node)
+
+        # Simulation, scored for the player who moved into the leaf
+        if node.result is not None:
+            result = node.result
+        else:
+            result = 1.0 - _random_playout(node.current, node.mask, node.moves)
+
+        # Backpropagation
+        for visited in reversed(path):
+            visited.visits += 1
+            visited.wins += result
+            result = 1.0 - result
+
+        if time.monotonic() > deadline:
+            break
+
+    visits = [0] * WIDTH
+    wins = [0.0] * WIDTH
+    for col, child in root.children.items():
+        visits[col] = child.visits
+        wins[col] = child.wins
+    return visits, wins
+
+
+# -------------------------------------------------------------------------
+# Private helper functions used by the playouts
+
+def _play(node: _Node, col: int) -> _Node:
+    move = (node.mask + BOTTOM_MASKS[col]) & COLUMN_MASKS[col]
+    mover = node.current | move
+    mask = node.mask | move
+    if _has_won(mover):
+        result = 1.0
+    elif node.moves + 1 == CELLS:
+        result = 0.5
+    else:
+        result = None
+    return _Node(mover ^ mask, mask, node.moves + 1, result)
+
+
+# Returns the column that wins at once for the player to move, else the one blocking the opponent's win, else None
+def _forced_move(current: int, opponent: int, mask: int):
+    playable = [col for col in range(WIDTH) if not mask & TOP_MASKS[col]]
+    for coins in (current, opponent):
+        for col in playable:
+            if _has_won(coins | ((mask + BOTTOM_MASKS[col]) & COLUMN_MASKS[col])):
+                return col
+    return None
+
+
+# Plays random moves to the end of the game, returns the result for the player to move at the start
+def _random_playout(current: int, mask: int, moves: int) -> float:
+    outcome = 1.0
+    while moves < CELLS:
+        col = random.choice([col for col in range(WIDTH) if not mask & TOP_MASKS[col]])
+        move = (mask + BOTTOM_MASKS[col]) & COLUMN_MASKS[col]
+        current |= move
+        mask |= move
+        moves += 1
+        if _has_won(current):
+            return outcome
+        current ^= mask
+        outcome = 1.0 - outcome
+    return 0.5
+
+
+def _has_won(coins: int) -> bool:
+    for shift in (1, HEIGHT, HEIGHT + 1, HEIGHT + 2):
+        pairs = coins & (coins >> shift)
+        if pairs & (pairs >> (2 * shift)):
+            return True
+    return False
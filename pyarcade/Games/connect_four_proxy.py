@@ -1,5 +1,7 @@
 from pyarcade.game_interface import GameInterface
 from pyarcade.Games.connect_four import ConnectFourGame
+from pyarcade.Games.connect_four_board import ConnectFourBoard
+from pyarcade.Games.connect_four_mcts import ConnectFourMCTS
 
 
 class ConnectFourProxy(GameInterface):
@@ -18,6 +20,13 @@ class ConnectFourProxy(GameInterface):
     SESSION_ID_KEY = 'session_id'
     PLAYER_NUM_KEY = 'player_num'
     COLUMN_KEY = 'column'
+    DIFFICULTY_KEY = 'difficulty'
+    OPPONENT_ID_KEY = 'opponent_id'
+    WIDTH_KEY = 'width'
+    HEIGHT_KEY = 'height'
+    RUN_LENGTH_KEY = 'run_length'
+    MIN_BOARD_SIZE = 4
+    MAX_BOARD_SIZE = 20
     INVALID_INPUT = {SESSION_ID_KEY: 0}
 
     def __init__(self, game_instance: ConnectFourGame):
@@ -27,7 +36,11 @@ class ConnectFourProxy(GameInterface):
         """
         Args:
             request: dictionary containing single key-value pair. The key is "game_id".
-            The value should be the integer 1.
+            The value should be the integer 1. A game against the computer may also set
+            "difficulty" to "easy", "medium" or "hard". \n
+            The optional integers "width" and "height" (4-20) and "run_length" (at least 3
+            and at most the larger of the two) create a Connect-N game. Only the standard
+            board can be played against the computer.
 
         Returns:
             reply: dictionary containing a single key-value pair. The key is
@@ -39,7 +52,10 @@ class ConnectFourProxy(GameInterface):
         game_id = request[ConnectFourProxy.GAME_ID_KEY]
         game_id_is_int = type(game_id) == int
 
-        if game_id != 1 or not game_id_is_int:
+        difficulty = request.get(ConnectFourProxy.DIFFICULTY_KEY)
+        difficulty_is_valid = difficulty is None or difficulty in ConnectFourMCTS.DIFFICULTY_LEVELS
+
+        if game_id != 1 or not game_id_is_int or not difficulty_is_valid or not self.__valid_board_size(request):
             return ConnectFourProxy.INVALID_INPUT
         else:
             new_session_dict = {ConnectFourProxy.GAME_ID_KEY: game_id}
@@ -71,8 +87,9 @@ class ConnectFourProxy(GameInterface):
             sessions. \n
             The second key is "player_num." The value should be an integer
             1 or 2 corresponding to the player making the move. \n
-            The third key is "column", an integer ranging from 1-7.  The value should be one of those
-            integers corresponding to the column the player wants to drop their coin in.
+            The third key is "column", an integer ranging from 1-7, or from 1 to the session's
+            "width" on other boards. The value should be one of those integers corresponding to
+            the column the player wants to drop their coin in.
 
         Returns:
             reply: dictionary containing a single key-value pair. The key is
@@ -86,6 +103,22 @@ class ConnectFourProxy(GameInterface):
         else:
             return self.game_instance.update_game(request)
 
+    def analyze_game(self, request: dict) -> dict:
+        """
+        Args:
+            request: dictionary containing the "game_id" and "session_id" of the session
+            to analyze.
+
+        Returns:
+            reply: dictionary with the scores of every column (see
+            ConnectFourGame.analyze_game). If the session_id is missing, a session_id of
+            zero is returned.
+        """
+        if ConnectFourProxy.SESSION_ID_KEY not in request.keys():
+            return ConnectFourProxy.INVALID_INPUT
+        else:
+            return self.game_instance.analyze_game(request)
+
     def delete_game(self, request: dict) -> dict:
         """
         Args:
@@ -104,12 +137,29 @@ class ConnectFourProxy(GameInterface):
         else:
             return ConnectFourProxy.INVALID_INPUT
 
+    @staticmethod
+    def __valid_board_size(request: dict) -> bool:
+        width = request.get(ConnectFourProxy.WIDTH_KEY, ConnectFourBoard.WIDTH)
+        height = request.get(ConnectFourProxy.HEIGHT_KEY, ConnectFourBoard.HEIGHT)
+        run_length = request.get(ConnectFourProxy.RUN_LENGTH_KEY, ConnectFourBoard.RUN_LENGTH)
+        sizes = range(ConnectFourProxy.MIN_BOARD_SIZE, ConnectFourProxy.MAX_BOARD_SIZE + 1)
+
+        if type(width) != int or type(height) != int or type(run_length) != int \
+                or width not in sizes or height not in sizes \
+                or run_length not in range(3, max(width, height) + 1):
+            return False
+        is_standard = (width, height, run_length) == \
+            (ConnectFourBoard.WIDTH, ConnectFourBoard.HEIGHT, ConnectFourBoard.RUN_LENGTH)
+        return is_standard or request.get(ConnectFourProxy.OPPONENT_ID_KEY) != ConnectFourGame.COMPUTER_ID
+
     @staticmethod
     def __valid_input(request: dict) -> bool:
+        width = int(request.get(ConnectFourProxy.WIDTH_KEY, ConnectFourBoard.WIDTH))
         if ConnectFourProxy.SESSION_ID_KEY not in request.keys() \
                 or ConnectFourProxy.PLAYER_NUM_KEY not in request.keys() \
                 or ConnectFourProxy.COLUMN_KEY not in request.keys() \
-                or int(request[ConnectFourProxy.COLUMN_KEY]) not in range(1, 8):
+                or int(request[ConnectFourProxy.COLUMN_KEY]) not in range(1, width + 1) \
+                or request[ConnectFourProxy.PLAYER_NUM_KEY] == ConnectFourGame.COMPUTER_ID:
             return False
         else:
             return True
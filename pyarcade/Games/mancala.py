@@ -1,5 +1,11 @@
+from pyarcade.dynamodb.leaderboard import Leaderboards
 from pyarcade.game_interface import GameInterface
+from pyarcade.Games.mancala_ai import MancalaAI
+from pyarcade.Games.mancala_board import MancalaBoard
+from pyarcade.Games.mancala_endgame import MancalaEndgameDatabase
+from pyarcade.Games.zobrist import mancala_hash
 from datetime import datetime
+import copy
 
 
 class MancalaGame(GameInterface):
@@ -7,6 +13,14 @@ class MancalaGame(GameInterface):
 
     Note: For now, Mancala must have a board initialized with 2 rows and 6 game columns and 1 stone collection
     column.  Each game column has 4 stones each.
+
+    Args:
+        db_controller: the GameController sessions are stored with.
+        ai_time_budget: seconds the computer opponent may think about a single move.
+        endgame_database_path: optional endgame database written by build_endgame_database,
+            used by the computer opponent and by hints.
+        leaderboard_size: number of players kept in the high scores.
+        leaderboard_cache_ttl: seconds a read of the shared high scores is reused for.
     """
     BOARD_KEY = 'board'
     PLAYERS_KEY = 'players'
@@ -14,19 +28,26 @@ class MancalaGame(GameInterface):
     COLUMN_KEY = 'column'
     ROW_KEY = 'row'
     PLAY_COUNTER_KEY = 'play_counter'
+    GAME_ID = 2
     SESSION_ID_KEY = 'session_id'
     SCORE_KEY = 'score'
     NEXT_PLAYER_KEY = 'next_player'
     PLAYER_NUM_KEY = 'player_num'
-
-    def __init__(self, db_controller):
+    ZOBRIST_HASH_KEY = 'zobrist_hash'
+    COMPUTER_ID = 'computer'
+    MARGIN_KEY = 'margin'
+    VERSION_KEY = 'version'
+    STALE_KEY = 'stale'
+
+    def __init__(self, db_controller, ai_time_budget: float = 0.5, endgame_database_path: str = None,
+                 leaderboard_size: int = 10, leaderboard_cache_ttl: float = 5.0):
         self.db = db_controller
+        self.endgame_database = MancalaEndgameDatabase(endgame_database_path) if endgame_database_path else None
+        self.ai = MancalaAI(time_budget=ai_time_budget, endgame_database=self.endgame_database)
         self.SESSION_INFO_MANAGER = {}
         self.SESSION_COUNTER = 0
-        self.HIGHSCORE_LIST = [(float('inf'), "empty"), (float('inf'), "empty"), (float('inf'), "empty"),
-                               (float('inf'), "empty"), (float('inf'), "empty"), (float('inf'), "empty"),
-                               (float('inf'), "empty"), (float('inf'), "empty"), (float('inf'), "empty"),
-                               (float('inf'), "empty")]
+        self.leaderboard = Leaderboards(db_controller, MancalaGame.GAME_ID, size=leaderboard_size,
+                                        cache_ttl=leaderboard_cache_ttl)
 
     def create_game(self, request: dict) -> dict:
         """ Upon calling create_game, the Mastermind game should initialize
@@ -41,6 +62,8 @@ class MancalaGame(GameInterface):
         new_game_session = request
         new_game_session[MancalaGame.PLAY_COUNTER_KEY] = 0
         new_game_session[MancalaGame.BOARD_KEY] = self.__create_starting_board()
+        new_game_session[MancalaGame.ZOBRIST_HASH_KEY] = mancala_hash(new_game_session[MancalaGame.BOARD_KEY])
+        new_game_session[MancalaGame.VERSION_KEY] = 0
         new_game_session[MancalaGame.PLAYERS_KEY] = [request["user_id"], request["opponent_id"]]
         new_game_session[MancalaGame.STATUS_KEY] = False
         new_game_session[MancalaGame.SCORE_KEY] = {request["user_id"]: 0, request["opponent_id"]: 0}
@@ -97,11 +120,20 @@ class MancalaGame(GameInterface):
         should be the column number (from 0-6) of the hole the player wants to begin their move from - The final key
         is 'player_num' and corresponds to the player making the move
 
+        If the session's "opponent_id" is "computer", the computer's replies are played before the session is saved,
+        so the reply already contains every move up to the human player's next turn.
+
+        A request that also carries the session as it was read, with its "board" and "version", is played on that
+        state without reading the session again. The session is then saved with a single conditional write, which
+        only succeeds if the stored session still has that version and board.
+
         Returns:
             reply: dictionary containing four keys.
                 "board": An updated version of the board after making their move
                 "status": True or False depending on whether an empty row is encountered
                 "session_id": The unique session id provided with the original request
+            If the state sent with the request is stale, nothing is saved and the reply is
+            {"session_id": 0, "stale": True}.
 
         So the overall reply could look like:
             {"board": [[2, 0, 0, 4, 4, 4, 5]
@@ -110,60 +142,56 @@ class MancalaGame(GameInterface):
         # Retrieve session_id from the arguments
         session_id = request[MancalaGame.SESSION_ID_KEY]
 
-        # Get the specified session from the session info manager
-        game_session = self.db.get_game_session({'game_id': 2, "session_id": session_id})
+        # A request carrying the session's version and board already holds the state to play on. Otherwise get the
+        # specified session from the database
+        submitted = MancalaGame.VERSION_KEY in request and MancalaGame.BOARD_KEY in request
+        if submitted:
+            game_session = {key: copy.deepcopy(value) for key, value in request.items()
+                            if key not in (MancalaGame.ROW_KEY, MancalaGame.COLUMN_KEY)}
+            # The stored hash is checked against the submitted board, so it is computed here rather than trusted
+            expected = {MancalaGame.VERSION_KEY: request[MancalaGame.VERSION_KEY],
+                        MancalaGame.ZOBRIST_HASH_KEY: mancala_hash(request[MancalaGame.BOARD_KEY])}
+        else:
+            game_session = self.db.get_game_session({'game_id': 2, "session_id": session_id})
 
         # Parse out the values from the argument dictionary
         col = request[MancalaGame.COLUMN_KEY]
         row = request[MancalaGame.ROW_KEY]
         player_num = request[MancalaGame.PLAYER_NUM_KEY]
 
-        # Get current state of the board
-        board = game_session[MancalaGame.BOARD_KEY]
-
         # Get players key array. Item at 0 is player's key, item at 1 is opponent key
         players_key_arr = game_session[MancalaGame.PLAYERS_KEY]
+        side = 0 if player_num == players_key_arr[0] else 1
 
-        updated_board_state_info = {'updated_board': [[]], 'next_player': None}
-        game_session[MancalaGame.PLAY_COUNTER_KEY] = game_session[MancalaGame.PLAY_COUNTER_KEY] + 1
-
-        # Updates the board after specifying the location from where to begin the move
-        if row == 0:
-            num_stones = self.__get_number_of_stones(board, row, col)
-            self.__pick_up_stones(board, row, col)
-            updated_board_state_info = self.__update_board_to_left(board, row, col, num_stones, player_num,
-                                                                   players_key_arr)
-        elif row == 1:
-            num_stones = self.__get_number_of_stones(board, row, col)
-            self.__pick_up_stones(board, row, col)
-            updated_board_state_info = self.__update_board_to_right(board, row, col, num_stones, player_num,
-                                                                    players_key_arr)
+        # The board is only kept as a 2x7 list of lists at the API/DynamoDB boundary. MancalaBoard updates the
+        # Zobrist hash for every hole that changes. Sessions stored before the hash existed get it computed from
+        # their board
+        board = MancalaBoard.from_board(game_session[MancalaGame.BOARD_KEY],
+                                        game_session.get(MancalaGame.ZOBRIST_HASH_KEY))
 
-        # Get just the updated board
-        updated_board = updated_board_state_info['updated_board']
-
-        # Get last stone coordinates
-        last_stone_loc = updated_board_state_info['last_stone_loc']
-
-        last_stone_row, last_stone_col = last_stone_loc
-
-        # Check whether the last hole the player dropped their stone in was empty.
-        # This is an important condition because if the hole was empty prior to placing their last stone in
-        # that move then that player gets to move all of the stones in the row across that hole into their
-        # own mancala
-
-        is_last_hole_empty = self.__check_hole_is_empty(updated_board, last_stone_row, last_stone_col)
-        is_last_hole_mancala = self.__check_hole_is_any_mancala(last_stone_row, last_stone_col)
+        game_session[MancalaGame.PLAY_COUNTER_KEY] = game_session[MancalaGame.PLAY_COUNTER_KEY] + 1
+        # Sessions stored before versions existed start at version 0
+        game_session[MancalaGame.VERSION_KEY] = int(game_session.get(MancalaGame.VERSION_KEY, 0)) + 1
+
+        # Sow the stones from the specified location, skipping the opponent's mancala. If the last stone lands in
+        # the player's own mancala, or in an empty hole so that the stones across from it are captured, the player
+        # moves again. Picking an empty hole sows nothing and hands the turn over
+        if board.play(MancalaBoard.slot_of(row, col), side):
+            next_player = player_num
+        else:
+            next_player = self.__get_other_player_number(player_num, players_key_arr)
 
-        if is_last_hole_empty and (is_last_hole_mancala is False):
-            updated_board = self.__place_stones_from_opposite_row_into_mancala(updated_board, last_stone_row,
-                                                                               last_stone_col, player_num,
-                                                                               players_key_arr)
-            updated_board_state_info['next_player'] = player_num
+        # In a game against the computer the engine answers within its time budget, and keeps moving for as long as
+        # its moves earn it another turn
+        while next_player == MancalaGame.COMPUTER_ID and not board.is_over()[0]:
+            computer_side = players_key_arr.index(MancalaGame.COMPUTER_ID)
+            game_session[MancalaGame.PLAY_COUNTER_KEY] = game_session[MancalaGame.PLAY_COUNTER_KEY] + 1
+            if not board.play(self.ai.best_move(board, computer_side), computer_side):
+                next_player = self.__get_other_player_number(next_player, players_key_arr)
 
         # Get current scores of both players before the most recent move was made
         session_scores = game_session[MancalaGame.SCORE_KEY]
-        updated_scores = self.__get_scores(updated_board)
+        updated_scores = board.get_scores()
 
         # Get both players new score after the most recent move
         new_player1_score = updated_scores[0]
@@ -173,15 +201,13 @@ class MancalaGame(GameInterface):
         session_scores[players_key_arr[0]] = new_player1_score
         session_scores[players_key_arr[1]] = new_player2_score
 
-        # Get the player who will make the next move
-        next_player = updated_board_state_info['next_player']
+        # Set the player who will make the next move
         game_session['next_player'] = next_player
 
         # Checks whether the game is over after the most recent move and updates session manager if the respective
         # session is over
-        game_status = self.__is_over(updated_board)
+        game_status = board.is_over()
         if game_status[0] is True:
-            self.update_high_scores(request[MancalaGame.PLAY_COUNTER_KEY], session_id)
             game_session[MancalaGame.STATUS_KEY] = game_status[0]
             # if game is over make the winner as next player
             # winner is the player with max score
@@ -194,16 +220,68 @@ class MancalaGame(GameInterface):
                 game_session['next_player'] = None
 
         # Update the session manager with the new board
-        game_session[MancalaGame.BOARD_KEY] = updated_board
+        game_session[MancalaGame.BOARD_KEY] = board.to_board()
+        game_session[MancalaGame.ZOBRIST_HASH_KEY] = board.hash
 
-        return self.db.update_game(game_session)
+        if submitted:
+            response = self.db.update_game_if_unchanged(game_session, expected)
+            if response is None:
+                return {MancalaGame.SESSION_ID_KEY: 0, MancalaGame.STALE_KEY: True}
+        else:
+            response = self.db.update_game(game_session)
+
+        # The high scores only count games whose last move was saved, won by a player other than the computer
+        winner = game_session[MancalaGame.NEXT_PLAYER_KEY]
+        if game_status[0] is True and winner is not None and winner != MancalaGame.COMPUTER_ID:
+            self.leaderboard.record(game_session[MancalaGame.PLAY_COUNTER_KEY], winner)
+        return response
+
+    def hint_game(self, request: dict) -> dict:
+        """
+        Args:
+            request: dictionary containing the "game_id" and "session_id" of the session
+            to give a hint for.
+
+        Returns:
+            reply: dictionary containing four keys. \n
+                "session_id": The unique session id provided with the original request \n
+                "row" and "column": The hole the player to move should begin their move from, or None once the
+                    game is over \n
+                "margin": The number of stones the player to move finishes ahead with perfect play, when the
+                    position is in the endgame database, otherwise None \n
+        """
+        game_session = self.db.get_game_session(request)
+        players_key_arr = game_session[MancalaGame.PLAYERS_KEY]
+        next_player = game_session[MancalaGame.NEXT_PLAYER_KEY]
+        board = MancalaBoard.from_board(game_session[MancalaGame.BOARD_KEY],
+                                        game_session.get(MancalaGame.ZOBRIST_HASH_KEY))
+
+        row = None
+        col = None
+        margin = None
+        if not game_session[MancalaGame.STATUS_KEY] and next_player in players_key_arr and not board.is_over()[0]:
+            side = players_key_arr.index(next_player)
+            database_entry = None
+            if self.endgame_database is not None:
+                database_entry = self.endgame_database.best_move(board, side)
+            if database_entry is not None:
+                slot, margin = database_entry
+            else:
+                slot = self.ai.best_move(board, side)
+            row, col = MancalaBoard.location_of(slot)
+
+        return {MancalaGame.SESSION_ID_KEY: game_session[MancalaGame.SESSION_ID_KEY],
+                MancalaGame.ROW_KEY: row,
+                MancalaGame.COLUMN_KEY: col,
+                MancalaGame.MARGIN_KEY: margin}
 
     def get_high_scores(self):
         """
         Returns:
-            reply: dictionary containing a list of tuple of score and user as value at index 0
+            reply: dictionary containing the all time list of tuples of score and user under "scores", and the
+            lists of the current day and week under "daily" and "weekly"
         """
-        return {"scores": self.HIGHSCORE_LIST}
+        return self.leaderboard.top()
 
     def delete_game(self, request: dict) -> dict:
         """
@@ -221,15 +299,6 @@ class MancalaGame(GameInterface):
     # -------------------------------------------------------------------------
     # Private Helper methods used in the mancala.py functions
 
-    # Updated high score list with new win
-    def update_high_scores(self, count, name):
-        prev_score = (count, name)
-        for i in range(len(self.HIGHSCORE_LIST)):
-            if prev_score[0] < self.HIGHSCORE_LIST[i][0]:
-                temp_score = self.HIGHSCORE_LIST[i]
-                self.HIGHSCORE_LIST[i] = prev_score
-                prev_score = temp_score
-
     # Create an empty 2x7 game board.  The column's with zero is the collection hole for each player
     @staticmethod
     def __create_starting_board():
@@ -237,56 +306,6 @@ class MancalaGame(GameInterface):
                  [4, 4, 4, 4, 4, 4, 0]]
         return board
 
-    # Returns the number of stones present at a specified location
-    @staticmethod
-    def __get_number_of_stones(board: list, row: int, col: int) -> int:
-        num_stones = int(board[row][col])
-        return num_stones
-
-    # Empties the stones at the specified location
-    @staticmethod
-    def __pick_up_stones(board: list, row: int, col: int):
-        board[row][col] = 0
-
-    # Checks whether an empty row exists
-    @staticmethod
-    def __empty_row_exists(board: list) -> bool:
-        empty_row_exists = False
-        empty_row = [0, 0, 0, 0, 0, 0]
-        if board[0][1:] == empty_row:
-            empty_row_exists = True
-        elif board[1][0:6] == empty_row:
-            empty_row_exists = True
-        return empty_row_exists
-
-    # Checks whether the hole at the specified location is an empty hole
-    @staticmethod
-    def __check_hole_is_empty(board: list, row: int, col: int) -> bool:
-        is_empty = False
-        if board[row][col] == 1:
-            is_empty = True
-        return is_empty
-
-    # Checks whether the hole at the specified location is the player's own mancala
-    @staticmethod
-    def __check_hole_is_mancala(row: int, col: int, player_num: int, players_key_arr: list) -> bool:
-        is_mancala = False
-        if row == 1 and col == 6 and player_num == players_key_arr[0]:
-            is_mancala = True
-        elif row == 0 and col == 0 and player_num == players_key_arr[1]:
-            is_mancala = True
-        return is_mancala
-
-    # Checks whether the hole at the specified location is ANY of the mancalas
-    @staticmethod
-    def __check_hole_is_any_mancala(row: int, col: int) -> int:
-        is_mancala = False
-        if row == 1 and col == 6:
-            is_mancala = True
-        elif row == 0 and col == 0:
-            is_mancala = True
-        return is_mancala
-
     # Returns the other player number
     @staticmethod
     def __get_other_player_number(player_num: int, players_key_arr: list) -> int:
@@ -294,147 +313,3 @@ class MancalaGame(GameInterface):
             return players_key_arr[1]
         else:
             return players_key_arr[0]
-
-    # Returns the opposite row number when inputted an argument row
-    @staticmethod
-    def __get_opposite_row(row: int) -> int:
-        if row == 0:
-            return 1
-        else:
-            return 0
-
-    # Returns the opposite col number when inputted an argument row, col
-    # if row is one increase col by 1, else decrease col by 2
-    @staticmethod
-    def __get_opposite_col(row: int, col: int) -> int:
-        if row == 0:
-            return col - 1
-        else:
-            return col + 1
-
-    # Returns whether a game is over, if game is over it returns the row in which the empty row was found.
-    # If the game is not over, the function just returns (False, None)
-    def __is_over(self, board: list) -> tuple:
-        game_over = (False, None)
-        does_empty_row_exist = self.__empty_row_exists(board)
-        if does_empty_row_exist:
-            empty_row = [0, 0, 0, 0, 0, 0]
-            if board[0][1:] == empty_row:
-                game_over = (True, 0)
-            elif board[1][0:6] == empty_row:
-                game_over = (True, 1)
-        return game_over
-
-    # Returns how many stones each player has collected
-    def __get_scores(self, board) -> tuple:
-        game_over = self.__is_over(board)
-        player1_score = board[1][6]
-        player2_score = board[0][0]
-
-        if game_over[0] is True:
-            # If the empty row is the row corresponding to player 2's side.  Add the remaining stones player 1's score
-            if game_over[1] == 0:
-                player1_score = player1_score + sum(board[1][0:6])
-            # If the empty row is the row corresponding to player 1's side.  Add the remaining stones player 2's score
-            elif game_over[1] == 1:
-                player2_score = player2_score + sum(board[0][1:])
-        scores = (player1_score, player2_score)
-        return scores
-
-    # Place stones in opposite location into specified player's mancala
-    def __place_stones_from_opposite_row_into_mancala(self, board: list, row: int, col: int, player_num,
-                                                      players_key_arr: list) -> list:
-        if player_num == players_key_arr[0]:
-            mancala = board[1][6]
-            opposite_row = self.__get_opposite_row(row)
-            opposite_col = self.__get_opposite_col(row, col)
-            num_of_stones_in_opposite_hole = self.__get_number_of_stones(board, opposite_row, opposite_col)
-            self.__pick_up_stones(board, opposite_row, opposite_col)
-            updated_mancala = mancala + num_of_stones_in_opposite_hole
-            board[1][6] = updated_mancala
-        elif player_num == players_key_arr[1]:
-            mancala = board[0][0]
-            opposite_row = self.__get_opposite_row(row)
-            opposite_col = self.__get_opposite_col(row, col)
-            num_of_stones_in_opposite_hole = self.__get_number_of_stones(board, opposite_row, opposite_col)
-            self.__pick_up_stones(board, opposite_row, opposite_col)
-            updated_mancala = mancala + num_of_stones_in_opposite_hole
-            board[0][0] = updated_mancala
-        return board
-
-    # Update the board when the user picks a location in the second row
-    def __update_board_to_right(self, board: list, row: int, col: int, num_stones: int, player_num,
-                                players_key_arr: list) -> list:
-        next_player = player_num
-        update_dict = {}
-        col_idx = col + 1
-        last_stone_row = row
-        last_stone_col = col_idx
-        while num_stones > 0:
-            if num_stones == 1:
-                last_stone_row = row
-                last_stone_col = col_idx - 1
-            if col_idx <= 6:
-                board[row][col_idx] += 1
-            else:
-                board_info = self.__update_board_to_left(board, 0, 7, num_stones, player_num, players_key_arr)
-                last_stone_row = 0
-                last_stone_col = 7 - num_stones
-                board = board_info['updated_board']
-                break
-            col_idx += 1
-            last_stone_col = last_stone_col + 1
-            num_stones = num_stones - 1
-
-        if last_stone_col < 0:
-            last_stone_col = 0
-
-        last_hole_is_mancala = self.__check_hole_is_mancala(last_stone_row, last_stone_col, player_num, players_key_arr)
-        if last_hole_is_mancala is False:
-            next_player = self.__get_other_player_number(player_num, players_key_arr)
-
-        update_dict['updated_board'] = board
-        update_dict['next_player'] = next_player
-        update_dict['last_stone_loc'] = (last_stone_row, last_stone_col)
-
-        return update_dict
-
-    def __update_board_to_left(self, board: list, row: int, col: int, num_stones: int, player_num,
-                               players_key_arr: list) -> list:
-        next_player = player_num
-        update_dict = {}
-        col_idx = col - 1
-        last_stone_row = row
-        last_stone_col = col_idx
-        while num_stones > 0:
-            if num_stones == 1:
-                last_stone_row = row
-                last_stone_col = col_idx + 1
-            if col_idx >= 0:
-                if col_idx == 0:
-                    last_stone_col = 0
-                board[row][col_idx] += 1
-            else:
-                board_info = self.__update_board_to_right(board, 1, -1, num_stones, player_num, players_key_arr)
-                last_stone_row = 1
-                last_stone_col = num_stones - 1
-                board = board_info['updated_board']
-                break
-
-            col_idx = col_idx - 1
-            last_stone_col = last_stone_col - 1
-            num_stones = num_stones - 1
-
-        if last_stone_col < 0:
-            last_stone_col = 0
-
-        last_hole_is_mancala = self.__check_hole_is_mancala(last_stone_row, last_stone_col, player_num, players_key_arr)
-
-        if last_hole_is_mancala is False:
-            next_player = self.__get_other_player_number(player_num, players_key_arr)
-        
-        update_dict['updated_board'] = board
-        update_dict['next_player'] = next_player
-        update_dict['last_stone_loc'] = (last_stone_row, last_stone_col)
-
-        return update_dict
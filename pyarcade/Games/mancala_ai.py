@@ -0,0 +1,203 @@
+import time
+
+from pyarcade.Games.mancala_board import MancalaBoard
+from pyarcade.Games.zobrist import MANCALA_SIDE_KEY
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+class MancalaAI:
+    """ A computer opponent for Mancala.
+
+    The engine searches MancalaBoard positions with iterative deepening negamax and
+    alpha-beta pruning. Every iteration that finishes inside the time budget replaces
+    the chosen pit, so a move is always ready when time runs out. A move that earns
+    another turn keeps the same side to move, so its score is not negated.
+
+    Pits are tried after the best pit remembered for the position in a transposition
+    table of fixed size, then the pits whose last stone lands in the side's own store,
+    as those moves are usually the strongest. The table is keyed by the Zobrist hash
+    the board keeps up to date, with a key for the side to move XORed in. Leaves are
+    scored by the difference between the two stores.
+
+    Positions covered by an endgame database are played from it without searching,
+    and the search scores the covered positions it reaches with their exact result.
+
+    Args:
+        time_budget: seconds the search may spend on a single move.
+        table_size: number of slots in the transposition table.
+        endgame_database: optional MancalaEndgameDatabase consulted before searching.
+    """
+    WIN_SCORE = 1000
+    EXACT = 0
+    LOWER_BOUND = 1
+    UPPER_BOUND = 2
+
+    def __init__(self, time_budget: float = 0.5, table_size: int = 1 << 16, endgame_database=None):
+        self.time_budget = time_budget
+        self.endgame_database = endgame_database
+        self.table_size = table_size
+        self.table = [None] * table_size
+        # Set when an iteration stops at its depth limit instead of at the end of the game
+        self.depth_reached = False
+
+    def best_move(self, position: MancalaBoard, side: int) -> int:
+        """
+        Args:
+            position: the current position, in which the side has at least one pit
+                holding stones.
+            side: the side the engine plays for, 0 for players[0] and 1 for players[1].
+
+        Returns:
+            slot: the pit the engine sows from, as a MancalaBoard slot.
+        """
+        moves = position.moves(side)
+        if len(moves) == 1:
+            return moves[0]
+        if self.endgame_database is not None:
+            database_entry = self.endgame_database.best_move(position, side)
+            if database_entry is not None:
+                return database_entry[0]
+        return self.search(position, side)[0]
+
+    def search(self, position: MancalaBoard, side: int, max_depth: int = None) -> tuple:
+        """ Runs the iterative deepening search until the time budget, max_depth or a
+        fully searched game tree stops it.
+
+        Args:
+            position: the current position, in which the side has at least one pit
+                holding stones.
+            side: the side to move, 0 for players[0] and 1 for players[1].
+            max_depth: deepest iteration to run, or None to only be limited by time.
+
+        Returns:
+            reply: tuple of the best slot and its score for the side to move. Scores of
+            WIN_SCORE or more are proven wins, scores of -WIN_SCORE or less proven losses.
+        """
+        deadline = time.monotonic() + self.time_budget
+        best_slot = position.moves(side)[0]
+        best_score = 0
+        depth = 0
+        while max_depth is None or depth < max_depth:
+            depth += 1
+            self.depth_reached = False
+            try:
+                # The first iteration always completes so that the engine never plays blind
+                best_score, best_slot = self.__search_root(position, side, depth,
+                                                           deadline if depth > 1 else float('inf'))
+            except _SearchTimeout:
+                break
+            # Without a leaf cut off by the depth limit the whole game tree has been searched
+            if abs(best_score) >= MancalaAI.WIN_SCORE or not self.depth_reached:
+                break
+        return best_slot, best_score
+
+    # -------------------------------------------------------------------------
+    # Private helper methods used by the search
+
+    def __search_root(self, position: MancalaBoard, side: int, depth: int, deadline: float) -> tuple:
+        alpha = -float('inf')
+        best_slot = None
+        for slot in self.__ordered_moves(position, side, self.__table_slot(self.__key(position, side))):
+            score = self.__score_move(position, side, slot, depth, alpha, float('inf'), deadline)
+            if best_slot is None or score > alpha:
+                alpha = score
+                best_slot = slot
+        return alpha, best_slot
+
+    def __negamax(self, position: MancalaBoard, side: int, depth: int, alpha: float, beta: float,
+                  deadline: float) -> int:
+        if time.monotonic() > deadline:
+            raise _SearchTimeout()
+        if position.is_over()[0]:
+            return self.__final_score(position, side)
+        if self.endgame_database is not None and self.endgame_database.covers(position):
+            return self.__win_score(self.endgame_database.margin(position, side))
+        if depth == 0:
+            self.depth_reached = True
+            return position.slots[MancalaBoard.STORES[side]] - position.slots[MancalaBoard.STORES[1 - side]]
+
+        key = self.__key(position, side)
+        index = key % self.table_size
+        entry = self.table[index]
+        table_slot = None
+        if entry is not None and entry[0] == key:
+            table_slot = entry[4]
+            if entry[1] >= depth:
+                # A bound found with leaves cut off by the depth limit is not exact either
+                self.depth_reached = self.depth_reached or entry[5]
+                flag, score = entry[2], entry[3]
+                if flag == MancalaAI.EXACT:
+                    return score
+                elif flag == MancalaAI.LOWER_BOUND:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        original_alpha = alpha
+        best_score = -float('inf')
+        best_slot = None
+        depth_reached = self.depth_reached
+        self.depth_reached = False
+        for slot in self.__ordered_moves(position, side, table_slot):
+            score = self.__score_move(position, side, slot, depth, alpha, beta, deadline)
+            if score > best_score:
+                best_score = score
+                best_slot = slot
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+        cut_off = self.depth_reached
+        self.depth_reached = depth_reached or cut_off
+
+        if best_score <= original_alpha:
+            flag = MancalaAI.UPPER_BOUND
+        elif best_score >= beta:
+            flag = MancalaAI.LOWER_BOUND
+        else:
+            flag = MancalaAI.EXACT
+        self.table[index] = (key, depth, flag, best_score, best_slot, cut_off)
+        return best_score
+
+    # Plays one move and searches the position after it, scored for the side making the move
+    def __score_move(self, position: MancalaBoard, side: int, slot: int, depth: int, alpha: float, beta: float,
+                     deadline: float) -> int:
+        child = position.copy()
+        if child.play(slot, side):
+            return self.__negamax(child, side, depth - 1, alpha, beta, deadline)
+        return -self.__negamax(child, 1 - side, depth - 1, -beta, -alpha, deadline)
+
+    @staticmethod
+    def __final_score(position: MancalaBoard, side: int) -> int:
+        scores = position.get_scores()
+        return MancalaAI.__win_score(scores[side] - scores[1 - side])
+
+    # Scores the final difference between the stores, preferring bigger wins and smaller losses
+    @staticmethod
+    def __win_score(difference: int) -> int:
+        if difference > 0:
+            return MancalaAI.WIN_SCORE + difference
+        if difference < 0:
+            return -MancalaAI.WIN_SCORE + difference
+        return 0
+
+    @staticmethod
+    def __key(position: MancalaBoard, side: int) -> int:
+        return position.hash ^ MANCALA_SIDE_KEY if side else position.hash
+
+    def __table_slot(self, key: int):
+        entry = self.table[key % self.table_size]
+        if entry is not None and entry[0] == key:
+            return entry[4]
+        return None
+
+    # Orders the moves with the table's move first, then moves ending in the side's own store, nearest pit first
+    @staticmethod
+    def __ordered_moves(position: MancalaBoard, side: int, first_slot) -> list:
+        store = MancalaBoard.STORES[side]
+        return sorted(position.moves(side),
+                      key=lambda slot: (slot != first_slot, not position.ends_in_store(slot, side), store - slot))
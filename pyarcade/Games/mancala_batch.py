@@ -0,0 +1,158 @@
+import numpy as np
+
+from pyarcade.Games.mancala_board import MANCALA_LOCATIONS, SOWING_ORDER, MancalaBoard
+
+
+class MancalaBatch:
+    """ Plays many Mancala games in lockstep with NumPy arrays.
+
+    Every call to step makes one move in each unfinished game. Sowing, captures, extra
+    turns and the end of game check are array operations over the whole batch, and
+    nothing is written to DynamoDB, so hundreds of thousands of games can be played to
+    study the first player's advantage or the effect of a rules change.
+
+    The rules are those of MancalaGame.update_game (see MancalaBoard.play): sowing
+    skips the opponent's store, a last stone landing in the mover's own store or alone
+    in a pit earns another turn, the latter capturing the pit facing it, picking an
+    empty pit sows nothing and hands the turn over, and the game ends once either side
+    has no stones left in its pits.
+
+    Args:
+        games: number of games played side by side.
+
+    Attributes:
+        slots: int16 array of shape (games, 14) holding the stones of every hole in the
+            slot order of MancalaBoard.
+        to_move: the side, 0 for players[0] or 1 for players[1], whose turn it is in each
+            game.
+        results: 0 while a game is running, 1 or 2 when players[0] or players[1] won, 3
+            for a draw.
+        moves: number of moves made in each game.
+    """
+    PITS = MancalaBoard.PITS
+    RUNNING = 0
+    DRAW = 3
+    # SOWING_ORDER as an array indexed by side, slot and step
+    ORDER = np.array(SOWING_ORDER, dtype=np.int64)
+    STORES = np.array(MancalaBoard.STORES, dtype=np.int64)
+
+    def __init__(self, games: int):
+        self.games = games
+        self.slots = np.tile(np.array(MancalaBoard().slots, dtype=np.int16), (games, 1))
+        self.to_move = np.zeros(games, dtype=np.int8)
+        self.results = np.zeros(games, dtype=np.int8)
+        self.moves = np.zeros(games, dtype=np.int16)
+
+    def running(self) -> np.ndarray:
+        return self.results == MancalaBatch.RUNNING
+
+    def legal_moves(self) -> np.ndarray:
+        """
+        Returns:
+            legal: bool array of shape (games, PITS), True where a pit of the side to move
+            holds stones. Pits are numbered from 0-5 in sowing order for both sides.
+        """
+        first = self.to_move.astype(np.int64)[:, None] * (MancalaBatch.PITS + 1)
+        pits = first + np.arange(MancalaBatch.PITS)
+        return np.take_along_axis(self.slots, pits, axis=1) > 0
+
+    def step(self, pits: np.ndarray) -> np.ndarray:
+        """ Plays one move in every unfinished game.
+
+        Args:
+            pits: int array of shape (games,) with the pit from 0-5 of the side to move
+                to sow from in each game. Pits are numbered in sowing order, so pit 0 is
+                the one furthest from the side's store. Entries for finished games are
+                ignored.
+
+        Returns:
+            results: the results array after the move.
+        """
+        games = np.arange(self.games)
+        side = self.to_move.astype(np.int64)
+        origin = side * (MancalaBatch.PITS + 1) + np.asarray(pits, dtype=np.int64)
+        running = self.running()
+        stones = np.where(running, self.slots[games, origin], 0).astype(np.int64)
+        sowing = stones > 0
+
+        # Every one of the 13 holes after the pit gets a stone per full lap, the first ones one more
+        order = MancalaBatch.ORDER[side, origin]
+        laps, remainder = np.divmod(stones, order.shape[1])
+        drops = laps[:, None] + (np.arange(order.shape[1]) < remainder[:, None])
+        self.slots[games, origin] -= stones.astype(np.int16)
+        self.slots[games[:, None], order] += drops.astype(np.int16)
+
+        last = order[games, (stones - 1) % order.shape[1]]
+        into_store = sowing & (last == MancalaBatch.STORES[side])
+        captures = sowing & ~into_store & (self.slots[games, last] == 1)
+        capturing = games[captures]
+        opposite = 12 - last[captures]
+        self.slots[capturing, MancalaBatch.STORES[side[captures]]] += self.slots[capturing, opposite]
+        self.slots[capturing, opposite] = 0
+
+        self.moves[running] += 1
+        over = running & self.__is_over()
+        scores = self.scores()
+        self.results[over & (scores[:, 0] > scores[:, 1])] = 1
+        self.results[over & (scores[:, 0] < scores[:, 1])] = 2
+        self.results[over & (scores[:, 0] == scores[:, 1])] = MancalaBatch.DRAW
+
+        # Running games hand the turn over unless the move earned another one
+        passes = self.running() & ~into_store & ~captures
+        self.to_move[passes] = 1 - self.to_move[passes]
+        return self.results
+
+    def run(self, policy, max_steps: int = None) -> np.ndarray:
+        """ Steps the batch until every game is over.
+
+        Args:
+            policy: callable taking this batch and returning the pits to sow from, as
+                expected by step.
+            max_steps: optional limit on the number of steps.
+
+        Returns:
+            results: the results array once the games are over or max_steps is reached.
+        """
+        steps = 0
+        while self.running().any() and (max_steps is None or steps < max_steps):
+            self.step(policy(self))
+            steps += 1
+        return self.results
+
+    def scores(self) -> np.ndarray:
+        """
+        Returns:
+            scores: int array of shape (games, 2) with the stones collected by players[0]
+            and players[1], counted like MancalaBoard.get_scores.
+        """
+        pit_totals = np.stack([self.slots[:, 0:6].sum(axis=1), self.slots[:, 7:13].sum(axis=1)], axis=1)
+        scores = self.slots[:, list(MancalaBoard.STORES)].astype(np.int64)
+        # Row 0 of the session board is checked first, so its side keeps priority when both are empty
+        second_empty = pit_totals[:, 1] == 0
+        first_empty = ~second_empty & (pit_totals[:, 0] == 0)
+        scores[second_empty, 0] += pit_totals[second_empty, 0]
+        scores[first_empty, 1] += pit_totals[first_empty, 1]
+        return scores
+
+    def to_board(self, game: int) -> list:
+        """
+        Returns:
+            board: the board of one game in the 2x7 format of a session.
+        """
+        board = [[0] * 7, [0] * 7]
+        for slot, (row, col) in enumerate(MANCALA_LOCATIONS):
+            board[row][col] = int(self.slots[game, slot])
+        return board
+
+    def __is_over(self) -> np.ndarray:
+        return (self.slots[:, 0:6].sum(axis=1) == 0) | (self.slots[:, 7:13].sum(axis=1) == 0)
+
+
+def random_policy(rng: np.random.Generator):
+    """ Returns a policy for MancalaBatch.run that picks a random pit holding stones in
+    every game.
+    """
+    def policy(batch: MancalaBatch) -> np.ndarray:
+        weights = rng.random((batch.games, batch.PITS)) * batch.legal_moves()
+        return weights.argmax(axis=1)
+    return policy
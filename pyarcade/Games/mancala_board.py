@@ -0,0 +1,215 @@
+from pyarcade.Games.zobrist import MANCALA_STONES, mancala_key
+
+
+class MancalaBoard:
+    """ A flat representation of a Mancala position.
+
+    The 14 holes are kept in one list in sowing (counter-clockwise) order::
+
+        index:   12 11 10  9  8  7
+             13                    6
+                  0  1  2  3  4  5
+
+    Slots 0-5 are the pits of players[0] (row 1, columns 0-5 of the session board) and
+    slot 6 is their store (row 1, column 6). Slots 7-12 are the pits of players[1]
+    (row 0, columns 6-1) and slot 13 is their store (row 0, column 0). The pit facing
+    slot ``i`` is slot ``12 - i``.
+
+    Sowing walks a precomputed table of the 13 holes each side sows into, so the
+    opponent's store is skipped without any arithmetic on rows and columns. The
+    number of stones left in each side's pits and the Zobrist ``hash`` of the board
+    are kept up to date with every hole sown into.
+
+    The 2x7 ``board`` used by the API and DynamoDB is only built at the boundary
+    through :meth:`from_board` and :meth:`to_board`.
+    """
+    PITS = 6
+    SLOTS = 14
+    STONES = 4
+    # Store of each side, indexed by side
+    STORES = (6, 13)
+
+    def __init__(self):
+        self.slots = [MancalaBoard.STONES] * MancalaBoard.PITS + [0] + [MancalaBoard.STONES] * MancalaBoard.PITS + [0]
+        # Stones left in the pits of each side, stores excluded
+        self.pit_totals = [MancalaBoard.STONES * MancalaBoard.PITS, MancalaBoard.STONES * MancalaBoard.PITS]
+        self.hash = self.__full_hash()
+
+    @classmethod
+    def from_board(cls, board: list, zobrist_hash: int = None):
+        """
+        Args:
+            board: 2x7 list of lists in the format stored with a session. Row 0 holds
+                the store of players[1] in column 0, row 1 holds the store of
+                players[0] in column 6.
+            zobrist_hash: the hash stored with the board, if any. It is computed from the
+                holes otherwise.
+
+        Returns:
+            position: a MancalaBoard holding the same stones as the board.
+        """
+        position = cls()
+        position.slots = [int(board[row][col]) for row, col in MANCALA_LOCATIONS]
+        position.pit_totals = [sum(position.slots[0:6]), sum(position.slots[7:13])]
+        position.hash = position.__full_hash() if zobrist_hash is None else int(zobrist_hash)
+        return position
+
+    def to_board(self) -> list:
+        """
+        Returns:
+            board: 2x7 list of lists in the format stored with a session.
+        """
+        board = [[0] * 7, [0] * 7]
+        for slot, (row, col) in enumerate(MANCALA_LOCATIONS):
+            board[row][col] = self.slots[slot]
+        return board
+
+    def copy(self):
+        position = MancalaBoard()
+        position.slots = list(self.slots)
+        position.pit_totals = list(self.pit_totals)
+        position.hash = self.hash
+        return position
+
+    @staticmethod
+    def slot_of(row: int, col: int) -> int:
+        """ Returns the slot of the hole at row and col of the session board. """
+        if row == 1:
+            return col
+        return 13 - col
+
+    @staticmethod
+    def location_of(slot: int) -> tuple:
+        """ Returns the (row, col) of the session board's hole for a slot. """
+        return MANCALA_LOCATIONS[slot]
+
+    @staticmethod
+    def is_store(slot: int) -> bool:
+        return slot == 6 or slot == 13
+
+    @staticmethod
+    def side_of(slot: int) -> int:
+        """ Returns the side owning a pit or store, 0 for players[0] and 1 for players[1]. """
+        return 0 if slot <= 6 else 1
+
+    def sow(self, slot: int, side: int) -> int:
+        """ Picks up the stones of a pit and drops them one by one into the following
+        holes, skipping the store of the other side.
+
+        Args:
+            slot: the pit to sow from.
+            side: the side making the move, 0 for players[0] and 1 for players[1].
+
+        Returns:
+            last_slot: the hole the last stone was dropped in, or None if the pit was empty.
+        """
+        stones = self.slots[slot]
+        if stones == 0:
+            return None
+        self.__set_stones(slot, 0)
+        self.pit_totals[MancalaBoard.side_of(slot)] -= stones
+
+        order = SOWING_ORDER[side][slot]
+        laps, remainder = divmod(stones, len(order))
+        for idx, target in enumerate(order):
+            dropped = laps + 1 if idx < remainder else laps
+            if dropped == 0:
+                break
+            self.__set_stones(target, self.slots[target] + dropped)
+            if not MancalaBoard.is_store(target):
+                self.pit_totals[MancalaBoard.side_of(target)] += dropped
+        return order[(stones - 1) % len(order)]
+
+    def capture(self, slot: int, side: int):
+        """ Moves the stones of the pit facing slot into the store of the given side. """
+        opposite = 12 - slot
+        stones = self.slots[opposite]
+        store = MancalaBoard.STORES[side]
+        self.__set_stones(opposite, 0)
+        self.pit_totals[MancalaBoard.side_of(opposite)] -= stones
+        self.__set_stones(store, self.slots[store] + stones)
+
+    def play(self, slot: int, side: int) -> bool:
+        """ Plays a move with the rules of MancalaGame: the pit is sown, and if the last
+        stone lands alone in a pit, the stones of the pit facing it are captured.
+
+        Args:
+            slot: the pit to sow from.
+            side: the side making the move, 0 for players[0] and 1 for players[1].
+
+        Returns:
+            extra_turn: True if the side moves again, which happens when the last stone
+            lands in its own store or makes a capture.
+        """
+        last_slot = self.sow(slot, side)
+        if last_slot is None:
+            return False
+        if last_slot == MancalaBoard.STORES[side]:
+            return True
+        if self.slots[last_slot] == 1:
+            self.capture(last_slot, side)
+            return True
+        return False
+
+    def moves(self, side: int) -> list:
+        """ Returns the pits of the given side that hold stones. """
+        first = 0 if side == 0 else MancalaBoard.PITS + 1
+        return [slot for slot in range(first, first + MancalaBoard.PITS) if self.slots[slot]]
+
+    def ends_in_store(self, slot: int, side: int) -> bool:
+        """ Returns True if the last stone sown from slot lands in the store of the given side. """
+        stones = self.slots[slot]
+        order = SOWING_ORDER[side][slot]
+        return stones > 0 and order[(stones - 1) % len(order)] == MancalaBoard.STORES[side]
+
+    def is_over(self) -> tuple:
+        """
+        Returns:
+            reply: (True, row) once the pits of row 0 or row 1 of the session board are all
+            empty, row 0 being checked first, otherwise (False, None).
+        """
+        if self.pit_totals[1] == 0:
+            return True, 0
+        if self.pit_totals[0] == 0:
+            return True, 1
+        return False, None
+
+    def get_scores(self) -> tuple:
+        """
+        Returns:
+            scores: tuple of the stones collected by players[0] and players[1]. Once the
+            game is over, the stones left in a side's pits count for that side.
+        """
+        player1_score = self.slots[6]
+        player2_score = self.slots[13]
+        game_over = self.is_over()
+        if game_over[1] == 0:
+            player1_score += self.pit_totals[0]
+        elif game_over[1] == 1:
+            player2_score += self.pit_totals[1]
+        return player1_score, player2_score
+
+    # Changes the stones in one hole and swaps its Zobrist key
+    def __set_stones(self, slot: int, stones: int):
+        self.hash ^= SLOT_KEYS[slot][self.slots[slot]] ^ SLOT_KEYS[slot][stones]
+        self.slots[slot] = stones
+
+    def __full_hash(self) -> int:
+        zobrist_hash = 0
+        for slot, stones in enumerate(self.slots):
+            zobrist_hash ^= SLOT_KEYS[slot][stones]
+        return zobrist_hash
+
+
+# (row, col) of the session board for every slot
+MANCALA_LOCATIONS = [(1, col) for col in range(7)] + [(0, col) for col in range(6, -1, -1)]
+
+# SOWING_ORDER[side][slot] lists the 13 holes that receive stones, in order, when side sows from slot
+SOWING_ORDER = [[[(slot + step) % MancalaBoard.SLOTS for step in range(1, MancalaBoard.SLOTS + 1)
+                  if (slot + step) % MancalaBoard.SLOTS != MancalaBoard.STORES[1 - side]]
+                 for slot in range(MancalaBoard.SLOTS)]
+                for side in range(2)]
+
+# SLOT_KEYS[slot][stones] is the Zobrist key of a slot holding that many stones
+SLOT_KEYS = [[mancala_key(row, col, stones) for stones in range(MANCALA_STONES + 1)]
+             for row, col in MANCALA_LOCATIONS]
@@ -0,0 +1,225 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+from itertools import combinations
+
+from pyarcade.Games.mancala_board import MancalaBoard
+from pyarcade.Games.zobrist import MANCALA_STONES
+
+# Pits of both sides, stores excluded
+PITS = 2 * MancalaBoard.PITS
+
+
+class MancalaEndgameDatabase:
+    """ A read-only database of exact Mancala endgame results backed by a
+    memory-mapped file.
+
+    Stones never leave a store, so how the rest of a game goes does not depend on the
+    stores: with perfect play the side to move ends up a fixed number of the stones
+    still in the pits ahead of the other side. The file holds that margin as one signed
+    byte for every distribution of up to max_stones stones over the 12 pits, with the
+    pits of the side to move first.
+
+    Distributions are numbered by their total, then in lexicographic order, which is a
+    perfect index: the number of a distribution is a sum of 12 entries of a table
+    computed at import, so a lookup costs the same however large the file is. Nothing
+    is parsed at startup, and every worker that maps the same file shares its pages
+    through the OS cache.
+
+    Databases are written offline by build_endgame_database, or from the command line
+    with:
+        python -m pyarcade.Games.mancala_endgame <path> --stones 10
+
+    Args:
+        path: location of a database file written by build_endgame_database.
+    """
+    MAGIC = b'MCEG'
+    HEADER = struct.Struct('<4sBxxx')
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as database_file:
+            self.data = mmap.mmap(database_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.max_stones = MancalaEndgameDatabase.HEADER.unpack_from(self.data, 0)
+        if magic != MancalaEndgameDatabase.MAGIC \
+                or len(self.data) != MancalaEndgameDatabase.HEADER.size + position_count(self.max_stones):
+            self.data.close()
+            raise Exception("{} is not a Mancala endgame database.".format(path))
+
+    def covers(self, position: MancalaBoard) -> bool:
+        return position.pit_totals[0] + position.pit_totals[1] <= self.max_stones
+
+    def margin(self, position: MancalaBoard, side: int):
+        """
+        Args:
+            position: the position to look up.
+            side: the side to move, 0 for players[0] and 1 for players[1].
+
+        Returns:
+            margin: the number of stones the side to move finishes ahead of the other
+            side with perfect play, stores included, or None if the pits of the position
+            hold more than max_stones stones.
+        """
+        if not self.covers(position):
+            return None
+        stores = position.slots[MancalaBoard.STORES[side]] - position.slots[MancalaBoard.STORES[1 - side]]
+        value = self.data[MancalaEndgameDatabase.HEADER.size + distribution_index(pits_of(position, side))]
+        return stores + (value - 256 if value > 127 else value)
+
+    def best_move(self, position: MancalaBoard, side: int):
+        """
+        Args:
+            position: the position to look up, in which the side has at least one pit
+                holding stones.
+            side: the side to move, 0 for players[0] and 1 for players[1].
+
+        Returns:
+            reply: tuple of the best slot for the side to move and the margin it leads
+            to, or None if the pits of the position hold more than max_stones stones.
+        """
+        if not self.covers(position):
+            return None
+        best = None
+        for slot in position.moves(side):
+            child = position.copy()
+            if child.play(slot, side):
+                margin = self.margin(child, side)
+            else:
+                margin = -self.margin(child, 1 - side)
+            if best is None or margin > best[1]:
+                best = (slot, margin)
+        return best
+
+    def close(self):
+        self.data.close()
+
+
+def position_count(max_stones: int) -> int:
+    """ Returns the number of distributions of up to max_stones stones over the 12 pits. """
+    return _binomial(max_stones + PITS, PITS)
+
+
+def pits_of(position: MancalaBoard, side: int) -> list:
+    """ Returns the 12 pits of a position with the pits of the given side first. """
+    if side == 0:
+        return position.slots[0:6] + position.slots[7:13]
+    return position.slots[7:13] + position.slots[0:6]
+
+
+def distribution_index(pits: list) -> int:
+    """ Returns the number of a distribution of stones over the 12 pits, counting every
+    distribution with fewer stones first and the ones with as many stones in
+    lexicographic order.
+    """
+    remaining = sum(pits)
+    index = _binomial(remaining + PITS - 1, PITS)
+    for pit in range(PITS - 1):
+        index += _OFFSETS[pit][remaining][pits[pit]]
+        remaining -= pits[pit]
+    return index
+
+
+def build_endgame_database(path: str, max_stones: int) -> int:
+    """ Solves every distribution of up to max_stones stones over the pits and writes
+    the database file.
+
+    Positions are solved by increasing number of stones, so every move that takes
+    stones off the pits leads to a solved position. The other moves only carry the
+    mover's stones towards its store, so following them always ends in a solved
+    position as well.
+
+    Args:
+        path: where to write the database. The file is replaced atomically, so workers
+            that still map an older database keep reading it until they reopen the path.
+        max_stones: the database covers every position with up to this many stones in
+            the pits, at most MANCALA_STONES.
+
+    Returns:
+        size: number of positions written.
+    """
+    if max_stones > MANCALA_STONES:
+        raise Exception("A Mancala board only holds {} stones.".format(MANCALA_STONES))
+
+    values = bytearray(position_count(max_stones))
+    solved = bytearray(len(values))
+    # Every move that stays within one total carries stones towards a store, so chains of them are short
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 20 * max_stones + 1000))
+    for stones in range(max_stones + 1):
+        for bars in combinations(range(stones + PITS - 1), PITS - 1):
+            # Stars and bars: the gaps between the bars are the stones in each pit
+            edges = (-1,) + bars + (stones + PITS - 1,)
+            _solve([edges[pit + 1] - edges[pit] - 1 for pit in range(PITS)], values, solved)
+
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as database_file:
+        database_file.write(MancalaEndgameDatabase.HEADER.pack(MancalaEndgameDatabase.MAGIC, max_stones))
+        database_file.write(values)
+    os.replace(temporary_path, path)
+    return len(values)
+
+
+# -------------------------------------------------------------------------
+# Private helper functions used by the build
+
+# Returns the margin of the stones left in the pits for the side whose pits come first
+def _solve(pits: list, values: bytearray, solved: bytearray) -> int:
+    index = distribution_index(pits)
+    if solved[index]:
+        return values[index] - 256 if values[index] > 127 else values[index]
+
+    own = sum(pits[0:6])
+    other = sum(pits[6:12])
+    if own == 0 or other == 0:
+        # The game is over and each side keeps the stones left on its own side
+        best = own - other
+    else:
+        best = None
+        for slot in range(MancalaBoard.PITS):
+            if not pits[slot]:
+                continue
+            position = MancalaBoard()
+            position.slots = pits[0:6] + [0] + pits[6:12] + [0]
+            position.pit_totals = [own, other]
+            extra_turn = position.play(slot, 0)
+            gain = position.slots[6] - position.slots[13]
+            if extra_turn:
+                margin = gain + _solve(pits_of(position, 0), values, solved)
+            else:
+                margin = gain - _solve(pits_of(position, 1), values, solved)
+            if best is None or margin > best:
+                best = margin
+
+    values[index] = best & 0xFF
+    solved[index] = 1
+    return best
+
+
+# Number of ways to choose k of n items, 0 when k > n (math.comb needs Python 3.8)
+def _binomial(n: int, k: int) -> int:
+    if k < 0 or k > n:
+        return 0
+    result = 1
+    for i in range(min(k, n - k)):
+        result = result * (n - i) // (i + 1)
+    return result
+
+
+# _OFFSETS[pit][remaining][stones] counts the distributions of remaining stones over the pits from pit on that
+# have fewer than stones stones in pit
+_OFFSETS = [[[sum(_binomial(remaining - fewer + PITS - pit - 2, PITS - pit - 2) for fewer in range(stones))
+              for stones in range(remaining + 1)]
+             for remaining in range(MANCALA_STONES + 1)]
+            for pit in range(PITS - 1)]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build a Mancala endgame database.")
+    parser.add_argument('path', help="file to write the database to")
+    parser.add_argument('--stones', type=int, default=10, help="cover every position with up to this many stones "
+                                                               "in the pits")
+    args = parser.parse_args()
+
+    positions = build_endgame_database(args.path, args.stones)
+    print("Wrote {} positions to {}".format(positions, args.path))
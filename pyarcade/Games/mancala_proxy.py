@@ -18,6 +18,7 @@ class MancalaProxy(GameInterface):
     PLAYER_NUM_KEY = 'player_num'
     COLUMN_KEY = 'column'
     ROW_KEY = 'row'
+    VERSION_KEY = 'version'
     INVALID_INPUT = {SESSION_ID_KEY: 0}
 
     def __init__(self, game_instance: MancalaGame):
@@ -66,7 +67,9 @@ class MancalaProxy(GameInterface):
         value should be one of those integers corresponding to the row the player wants to begin their move from. -
         The third key is "column", an integer ranging from 0-6. The value should be one of those integers
         corresponding to the row the player wants to begin their move from. - The fourth key is "player_num." The
-        value should be an integer 1 or 2 corresponding to the player making the move.
+        value should be an integer 1 or 2 corresponding to the player making the move. Moves of the "computer"
+        opponent are only made by the game itself. A request may also carry the session as it was read, in which
+        case its "version" has to be an integer.
 
         Returns:
             reply: dictionary containing four keys.
@@ -82,6 +85,21 @@ class MancalaProxy(GameInterface):
                 return MancalaProxy.INVALID_INPUT
             return self.game_instance.update_game(request)
 
+    def hint_game(self, request: dict) -> dict:
+        """
+        Args:
+            request: dictionary containing the "game_id" and "session_id" of the session
+            to give a hint for.
+
+        Returns:
+            reply: dictionary with the suggested move (see MancalaGame.hint_game). If the
+            session_id is missing, a session_id of zero is returned.
+        """
+        if MancalaProxy.SESSION_ID_KEY not in request.keys():
+            return MancalaProxy.INVALID_INPUT
+        else:
+            return self.game_instance.hint_game(request)
+
     def delete_game(self, request: dict) -> dict:
         """
         Args:
@@ -115,7 +133,9 @@ class MancalaProxy(GameInterface):
         if MancalaProxy.SESSION_ID_KEY not in request.keys() \
                 or MancalaProxy.PLAYER_NUM_KEY not in request.keys() \
                 or MancalaProxy.ROW_KEY not in request.keys() \
-                or MancalaProxy.COLUMN_KEY not in request.keys():
+                or MancalaProxy.COLUMN_KEY not in request.keys() \
+                or request[MancalaProxy.PLAYER_NUM_KEY] == MancalaGame.COMPUTER_ID \
+                or type(request.get(MancalaProxy.VERSION_KEY, 0)) != int:
             return False
         return True
 
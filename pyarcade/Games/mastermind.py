@@ -1,16 +1,42 @@
+from pyarcade.dynamodb.leaderboard import Leaderboards
 from pyarcade.game_interface import GameInterface
+from pyarcade.Games.mastermind_feedback import CODE_LENGTH, DIGITS, MastermindFeedback, count_cows_and_bulls
+from pyarcade.Games.mastermind_solver import MastermindSolver, pack_candidates, unpack_candidates
 
 from datetime import datetime
-from random import randint
+from random import choices, sample
 
 
 class MastermindGame(GameInterface):
     """ A class representing a Mastermind game session.
 
     Note:
-        For now, Mastermind must have a hidden sequence of length 4 in
-        which all 4 integers may take on values between 0 and 9.
+        By default the hidden sequence is 4 distinct integers from 1-9. A session
+        can ask for another "length", a number of "colors", so that its integers
+        range from 1 to colors, and allow "repeats" of an integer in the sequence.
+
+    In the default game, guesses of four distinct digits, like every target, are scored
+    with one lookup in a precomputed MastermindFeedback table. Every other guess is
+    scored by counting the symbols of the guess and the target (see
+    count_cows_and_bulls), by the original rule of the game unless the session allows
+    repeats. Hints come from a MastermindSolver shared by every session.
+
+    Each default session keeps the targets that still fit its guesses as a packed
+    bitmap under "candidates", with their number under "remaining". update_game
+    narrows the bitmap by the feedback of the new guess alone, so nothing reads the
+    earlier guesses again. Other variants have too many possible targets for a bitmap
+    and get no hints.
+
+    Args:
+        db_controller: the GameController sessions are stored with.
+        feedback_table_path: optional location of the feedback table file, written on
+            first use if it does not exist yet. Without one the table is built in memory.
+        hint_cache_size: number of guess histories whose hint is cached.
+        leaderboard_size: number of players kept in the high scores.
+        leaderboard_cache_ttl: seconds a read of the shared high scores is reused for.
     """
+    GAME_ID = 0
+    GAME_ID_KEY = 'game_id'
     SESSION_ID_KEY = 'session_id'
     GUESSES_KEY = 'guesses'
     STATUS_KEY = 'done'
@@ -18,34 +44,54 @@ class MastermindGame(GameInterface):
     PLAY_COUNTER_KEY = 'play_counter'
     STATUS = 'status'
     PENDING_STATUS = "PENDING"
-
-    def __init__(self, db_controller):
+    GUESS_KEY = 'guess'
+    CANDIDATES_KEY = 'candidates'
+    REMAINING_KEY = 'remaining'
+    BATCH_KEY = 'batch'
+    LENGTH_KEY = 'length'
+    COLORS_KEY = 'colors'
+    REPEATS_KEY = 'repeats'
+    DEFAULT_LENGTH = CODE_LENGTH
+    DEFAULT_COLORS = len(DIGITS)
+
+    def __init__(self, db_controller, feedback_table_path: str = None, hint_cache_size: int = 1024,
+                 leaderboard_size: int = 10, leaderboard_cache_ttl: float = 5.0):
         self.db = db_controller
+        self.feedback = MastermindFeedback(feedback_table_path)
+        self.solver = MastermindSolver(self.feedback, cache_size=hint_cache_size)
         self.SESSION_INFO_MANAGER = {}
         self.SESSION_COUNTER = 0
-        self.HIGHSCORE_LIST = [(float('inf'), "empty"), (float('inf'), "empty"), (float('inf'), "empty"),
-                               (float('inf'), "empty"), (float('inf'), "empty"), (float('inf'), "empty"),
-                               (float('inf'), "empty"), (float('inf'), "empty"), (float('inf'), "empty"),
-                               (float('inf'), "empty")]
+        self.leaderboard = Leaderboards(db_controller, MastermindGame.GAME_ID, size=leaderboard_size,
+                                        cache_ttl=leaderboard_cache_ttl)
 
     def create_game(self, request: dict) -> dict:
         """ Upon calling create_game, the Mastermind game should initialize
         its hidden sequence
 
          Args:
-             request: dictionary containing single key-value pair. The key is "game_id".
+             request: dictionary containing the "game_id", and optionally the "length" of
+             the hidden sequence, its number of "colors" and whether "repeats" are allowed.
 
          Returns:
             reply: dictionary containing the session_id in the request.
         """
 
         new_game_session = request
-        new_game_session[MastermindGame.TARGET_KEY] = self.__create_target_sequence()
+        new_game_session[MastermindGame.LENGTH_KEY] = request.get(MastermindGame.LENGTH_KEY,
+                                                                  MastermindGame.DEFAULT_LENGTH)
+        new_game_session[MastermindGame.COLORS_KEY] = request.get(MastermindGame.COLORS_KEY,
+                                                                  MastermindGame.DEFAULT_COLORS)
+        new_game_session[MastermindGame.REPEATS_KEY] = request.get(MastermindGame.REPEATS_KEY, False)
+        new_game_session[MastermindGame.TARGET_KEY] = self.__create_target_sequence(new_game_session)
         new_game_session[MastermindGame.GUESSES_KEY] = []
         new_game_session[MastermindGame.STATUS_KEY] = False
         new_game_session[MastermindGame.SESSION_ID_KEY] = str(datetime.now())
         new_game_session[MastermindGame.STATUS] = MastermindGame.PENDING_STATUS
         new_game_session[MastermindGame.PLAY_COUNTER_KEY] = 0
+        if self.__is_default_variant(new_game_session):
+            candidates = self.solver.candidates([])
+            new_game_session[MastermindGame.CANDIDATES_KEY] = pack_candidates(candidates)
+            new_game_session[MastermindGame.REMAINING_KEY] = int(candidates.sum())
 
         self.db.create_game(new_game_session)
         return new_game_session
@@ -79,7 +125,9 @@ class MastermindGame(GameInterface):
             "session_id". The value is an integer unique to all ongoing game
             sessions. \n
             The second key is "guess." The value should be a tuple
-            of four integers.
+            of four integers. \n
+            The guess is scored against the stored session, and checked against its
+            length and colors, whatever else the request holds.
 
         Returns:
             reply: dictionary containing three keys.
@@ -94,42 +142,114 @@ class MastermindGame(GameInterface):
             So the overall reply could look like:
             {"guesses": [((0, 1, 2, 3), (1, 2), ((3, 2, 1, 0), (2, 1))], "session_id": 1, "done": False}
         """
-        session_info = request
-
-        # Calculate the number of cows and bulls respectively for a certain guess against the session's target key
-        cows_bulls_info_with_guess = self.__calculate_cows_and_bulls(session_info['guess'],
-                                                                     session_info[MastermindGame.TARGET_KEY])
-
-        # Update the session manager with the newly calculated info for the specified session
-        session_info[MastermindGame.GUESSES_KEY].append(cows_bulls_info_with_guess)
-
-        session_info[MastermindGame.PLAY_COUNTER_KEY] += 1
-
-        # Check if user has guessed the right sequence by checking if the bull value is 4
-        is_game_over = cows_bulls_info_with_guess[1][1] == 4
+        key = {MastermindGame.GAME_ID_KEY: MastermindGame.GAME_ID,
+               MastermindGame.SESSION_ID_KEY: request[MastermindGame.SESSION_ID_KEY]}
+        session_info = self.db.find_game_session(key)
+        if session_info is None:
+            return {MastermindGame.SESSION_ID_KEY: 0}
+
+        guess = request[MastermindGame.GUESS_KEY]
+        length = int(session_info.get(MastermindGame.LENGTH_KEY, MastermindGame.DEFAULT_LENGTH))
+        colors = int(session_info.get(MastermindGame.COLORS_KEY, MastermindGame.DEFAULT_COLORS))
+        if len(guess) != length or any(type(g) != int or not 1 <= g <= colors for g in guess):
+            return {MastermindGame.SESSION_ID_KEY: 0}
+
+        # Score the guess against the session's target and record it
+        candidates = self.__variant_candidates(session_info)
+        candidates, is_game_over = self.__play_guess(session_info, guess, candidates)
+        self.__store_candidates(session_info, candidates)
 
-        # If game is over update the status keys accordingly
         if is_game_over:
-            session_info[MastermindGame.STATUS_KEY] = True
-            self.update_high_scores(session_info[MastermindGame.PLAY_COUNTER_KEY], session_info["session_id"])
-        else:
-            session_info[MastermindGame.STATUS_KEY] = False
+            self.leaderboard.record(session_info[MastermindGame.PLAY_COUNTER_KEY], self.__player_of(session_info))
 
         # return updated_status
         resp = self.db.update_game(session_info)
         return resp
 
-    def update_high_scores(self, count, name):
-        prev_score = (count, name)
+    def batch_update_game(self, request: dict) -> dict:
+        """ Plays several guesses of a session in order with a single write.
+
+        The session is read once, the guesses are scored one after the other until one
+        of them solves the code, and the session is saved once at the end. Guesses
+        after the solving one, or sent for a finished game, are not played. Every guess
+        is checked against the stored session's length and colors before any is played.
+
+        Args:
+            request: dictionary containing the "game_id" and "session_id" of the session,
+            and under "batch" the list of guesses to play, each a list of integers.
+
+        Returns:
+            reply: dictionary containing five keys. \n
+                "session_id": The unique session id provided with the original request \n
+                "guesses": The guesses played from the batch, each with its cows and bulls as in "guesses" of
+                    update_game \n
+                "done": True or False depending on whether the game is over \n
+                "play_counter": The number of guesses made in the session so far \n
+                "remaining": The number of targets that still fit every guess, or None for variants other than the
+                    default one \n
+            If a guess does not fit the session, nothing is played and the reply is {"session_id": 0}.
+        """
+        session_info = self.db.get_game_session(request)
+        played = []
+
+        length = int(session_info.get(MastermindGame.LENGTH_KEY, MastermindGame.DEFAULT_LENGTH))
+        colors = int(session_info.get(MastermindGame.COLORS_KEY, MastermindGame.DEFAULT_COLORS))
+        for guess in request[MastermindGame.BATCH_KEY]:
+            if len(guess) != length or any(type(g) != int or not 1 <= g <= colors for g in guess):
+                return {MastermindGame.SESSION_ID_KEY: 0}
+
+        candidates = self.__variant_candidates(session_info)
+        is_game_over = session_info[MastermindGame.STATUS_KEY]
+        for guess in request[MastermindGame.BATCH_KEY]:
+            if is_game_over:
+                break
+            candidates, is_game_over = self.__play_guess(session_info, guess, candidates)
+            played.append(session_info[MastermindGame.GUESSES_KEY][-1])
+
+        if played:
+            self.__store_candidates(session_info, candidates)
+            if is_game_over:
+                self.leaderboard.record(session_info[MastermindGame.PLAY_COUNTER_KEY], self.__player_of(session_info))
+            self.db.update_game(session_info)
+
+        return {MastermindGame.SESSION_ID_KEY: session_info[MastermindGame.SESSION_ID_KEY],
+                MastermindGame.GUESSES_KEY: played,
+                MastermindGame.STATUS_KEY: session_info[MastermindGame.STATUS_KEY],
+                MastermindGame.PLAY_COUNTER_KEY: session_info[MastermindGame.PLAY_COUNTER_KEY],
+                MastermindGame.REMAINING_KEY: session_info.get(MastermindGame.REMAINING_KEY)}
+
+    def hint_game(self, request: dict) -> dict:
+        """
+        Args:
+            request: dictionary containing the "game_id" and "session_id" of the session
+            to give a hint for.
+
+        Returns:
+            reply: dictionary containing three keys. \n
+                "session_id": The unique session id provided with the original request \n
+                "guess": The guess that leaves the fewest possible targets whatever its cows and bulls, worked out
+                    from the guesses made so far and not from the target, or None once the game is over or if the
+                    session plays another variant than the default one \n
+                "remaining": The number of targets that still fit every guess made so far, or None for other
+                    variants \n
+        """
+        game_session = self.db.get_game_session(request)
+        if not self.__is_default_variant(game_session):
+            return {MastermindGame.SESSION_ID_KEY: game_session[MastermindGame.SESSION_ID_KEY],
+                    MastermindGame.GUESS_KEY: None,
+                    MastermindGame.REMAINING_KEY: None}
+
+        guess, remaining = self.solver.best_guess(game_session[MastermindGame.GUESSES_KEY],
+                                                  self.__session_candidates(game_session))
+        if game_session[MastermindGame.STATUS_KEY]:
+            guess = None
 
-        for i in range(len(self.HIGHSCORE_LIST)):
-            if prev_score[0] < self.HIGHSCORE_LIST[i][0]:
-                temp_score = self.HIGHSCORE_LIST[i]
-                self.HIGHSCORE_LIST[i] = prev_score
-                prev_score = temp_score
+        return {MastermindGame.SESSION_ID_KEY: game_session[MastermindGame.SESSION_ID_KEY],
+                MastermindGame.GUESS_KEY: guess,
+                MastermindGame.REMAINING_KEY: remaining}
 
     def get_high_scores(self):
-        return {"scores": self.HIGHSCORE_LIST}
+        return self.leaderboard.top()
 
     def delete_game(self, request: dict) -> dict:
         """
@@ -148,56 +268,70 @@ class MastermindGame(GameInterface):
     # -------------------------------------------------------------------------
     # Private Helper methods used in the mastermind.py functions
 
-    # Method used to generate random sequence that player will try to guess
+    # Method used to generate random sequence that player will try to guess, drawn directly without retries
     @staticmethod
-    def __create_target_sequence():
-        sequence = [randint(1, 9)]
-
-        for index in range(1, 4):
-            value = randint(1, 9)
-            while value in sequence:
-                value = randint(1, 9)
-            sequence.append(value)
-        return sequence
+    def __create_target_sequence(game_session: dict) -> list:
+        colors = range(1, int(game_session[MastermindGame.COLORS_KEY]) + 1)
+        length = int(game_session[MastermindGame.LENGTH_KEY])
+        if game_session[MastermindGame.REPEATS_KEY]:
+            return choices(colors, k=length)
+        return sample(colors, length)
+
+    # High scores are kept per player, sessions created without a logged in user count on their own
+    @staticmethod
+    def __player_of(game_session: dict):
+        return game_session.get('user_id', game_session[MastermindGame.SESSION_ID_KEY])
 
-    # Method used to create the number of bulls in a guess
+    # Sessions created before variants existed play the default one
     @staticmethod
-    def __calculate_bulls(guess: tuple, target: tuple) -> int:
-        bull_counter = 0
-        seq_iterator = 0
-        while seq_iterator < 4:
-            if target[seq_iterator] == guess[seq_iterator]:
-                bull_counter += 1
-            seq_iterator += 1
-        return bull_counter
-
-    # Method used to create the number of cows in a guess
+    def __is_default_variant(game_session: dict) -> bool:
+        length = game_session.get(MastermindGame.LENGTH_KEY, MastermindGame.DEFAULT_LENGTH)
+        colors = game_session.get(MastermindGame.COLORS_KEY, MastermindGame.DEFAULT_COLORS)
+        repeats = game_session.get(MastermindGame.REPEATS_KEY, False)
+        return length == MastermindGame.DEFAULT_LENGTH and colors == MastermindGame.DEFAULT_COLORS and not repeats
+
+    # Scores a guess against the session's target and records it, returning the narrowed targets and whether it won
+    def __play_guess(self, session_info: dict, guess, candidates) -> tuple:
+        # Calculate the number of cows and bulls respectively for a certain guess against the session's target key
+        repeats = session_info.get(MastermindGame.REPEATS_KEY, False)
+        cows_bulls_info_with_guess = self.__calculate_cows_and_bulls(guess, session_info[MastermindGame.TARGET_KEY],
+                                                                     repeats)
+
+        # Narrow the targets that still fit the guesses by the feedback of this guess
+        if candidates is not None:
+            candidates = self.solver.narrow(candidates, *cows_bulls_info_with_guess)
+
+        # Update the session manager with the newly calculated info for the specified session
+        session_info[MastermindGame.GUESSES_KEY].append(cows_bulls_info_with_guess)
+
+        session_info[MastermindGame.PLAY_COUNTER_KEY] += 1
+
+        # Check if user has guessed the right sequence by checking if every integer is a bull
+        is_game_over = cows_bulls_info_with_guess[1][1] == len(session_info[MastermindGame.TARGET_KEY])
+        session_info[MastermindGame.STATUS_KEY] = is_game_over
+        return candidates, is_game_over
+
+    # Returns the targets that fit the guesses of a default session, or None for other variants
+    def __variant_candidates(self, game_session: dict):
+        if self.__is_default_variant(game_session):
+            return self.__session_candidates(game_session)
+        return None
+
     @staticmethod
-    def __calculate_cows(guess: tuple, target: tuple) -> int:
-        cow_counter = 0
-        seq_iterator = 0
-
-        guess_no_bulls = []
-        target_no_bulls = []
-
-        # Create a new list without the bulls
-        while seq_iterator < 4:
-            if target[seq_iterator] == guess[seq_iterator]:
-                seq_iterator += 1
-            else:
-                guess_no_bulls.append(guess[seq_iterator])
-                target_no_bulls.append(target[seq_iterator])
-                seq_iterator += 1
-
-        # Calculate the number of cows by comparing both lists without bulls
-        for guess in guess_no_bulls:
-            if guess in target_no_bulls:
-                cow_counter += 1
-
-        return cow_counter
-
-    # Method used to calculate both the number of cows and bulls
-    def __calculate_cows_and_bulls(self, guess: tuple, target: tuple):
-        cows = self.__calculate_cows(guess, target)
-        bulls = self.__calculate_bulls(guess, target)
-        return guess, (cows, bulls)
+    def __store_candidates(game_session: dict, candidates):
+        if candidates is not None:
+            game_session[MastermindGame.CANDIDATES_KEY] = pack_candidates(candidates)
+            game_session[MastermindGame.REMAINING_KEY] = int(candidates.sum())
+
+    # Returns the targets that fit the session's guesses, replaying them for sessions created without a bitmap
+    def __session_candidates(self, game_session: dict):
+        if MastermindGame.CANDIDATES_KEY in game_session:
+            return unpack_candidates(game_session[MastermindGame.CANDIDATES_KEY])
+        return self.solver.candidates(game_session[MastermindGame.GUESSES_KEY])
+
+    # Method used to calculate both the number of cows and bulls, looked up in the feedback table when possible
+    def __calculate_cows_and_bulls(self, guess: tuple, target: tuple, repeats: bool):
+        feedback = self.feedback.score(guess, target)
+        if feedback is None:
+            feedback = count_cows_and_bulls(guess, target, repeats)
+        return guess, feedback
@@ -0,0 +1,157 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pyarcade.Games.mastermind import MastermindGame
+from pyarcade.Games.mastermind_feedback import CODES
+from pyarcade.Games.mastermind_solver import unpack_candidates
+
+
+class _SessionStore:
+    """ Keeps the sessions of a benchmark worker in memory in place of DynamoDB, so that
+    MastermindGame runs exactly as it does behind the API.
+    """
+
+    def __init__(self):
+        self.sessions = {}
+
+    def create_game(self, game_session: dict):
+        self.sessions[game_session[MastermindGame.SESSION_ID_KEY]] = game_session
+
+    def update_game(self, game_session: dict):
+        self.sessions[game_session[MastermindGame.SESSION_ID_KEY]] = game_session
+
+    def update_game_if_unchanged(self, game_session: dict, expected: dict):
+        stored = self.sessions.get(game_session[MastermindGame.SESSION_ID_KEY])
+        if stored is None or any(stored.get(key) != value for key, value in expected.items()):
+            return None
+        self.sessions[game_session[MastermindGame.SESSION_ID_KEY]] = game_session
+        return game_session
+
+    def create_game_if_absent(self, game_session: dict):
+        if game_session[MastermindGame.SESSION_ID_KEY] in self.sessions:
+            return None
+        self.sessions[game_session[MastermindGame.SESSION_ID_KEY]] = game_session
+        return game_session
+
+    def get_game_session(self, request: dict) -> dict:
+        return self.sessions[request[MastermindGame.SESSION_ID_KEY]]
+
+    def find_game_session(self, request: dict):
+        return self.sessions.get(request[MastermindGame.SESSION_ID_KEY])
+
+    def delete_game_session(self, request: dict):
+        self.sessions.pop(request[MastermindGame.SESSION_ID_KEY], None)
+
+
+def knuth_strategy(game: MastermindGame, game_session: dict) -> list:
+    """ Plays the guess /mastermind/hint suggests. """
+    return game.hint_game(game_session)[MastermindGame.GUESS_KEY]
+
+
+def first_candidate_strategy(game: MastermindGame, game_session: dict) -> list:
+    """ Plays the first code that still fits every guess, in the order of CODES. """
+    candidates = unpack_candidates(game_session[MastermindGame.CANDIDATES_KEY])
+    return CODES[candidates.argmax()].tolist()
+
+
+STRATEGIES = {'knuth': knuth_strategy, 'first-candidate': first_candidate_strategy}
+
+
+def run_benchmark(strategy: str = 'knuth', workers: int = None, secrets: list = None,
+                  feedback_table_path: str = None, hint_cache_size: int = 4096) -> dict:
+    """ Plays a strategy against every secret of the default game and measures it.
+
+    Secrets are spread over a pool of worker processes. Each worker runs its own
+    MastermindGame, and every guess goes through MastermindGame.update_game, so the
+    figures cover the same scoring, candidate narrowing and hint code the API runs.
+    Workers given the path of a feedback table memory-map it instead of building it.
+
+    Args:
+        strategy: name of the strategy in STRATEGIES.
+        workers: number of worker processes, the CPU count by default.
+        secrets: indexes in CODES of the secrets to play, every code by default.
+        feedback_table_path: optional location of the feedback table file.
+        hint_cache_size: number of guess histories each worker's solver caches.
+
+    Returns:
+        report: dictionary that can be dumped as JSON, with the number of "secrets"
+        played, the "mean_guesses" and "max_guesses" needed, how many secrets took
+        each number of guesses, the "mean_solve_seconds" and "max_solve_seconds" of
+        a single game and the "wall_seconds" of the whole run.
+    """
+    if strategy not in STRATEGIES:
+        raise Exception("Unknown Mastermind strategy {}.".format(strategy))
+    if secrets is None:
+        secrets = range(len(CODES))
+    workers = workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker,
+                             initargs=(strategy, feedback_table_path, hint_cache_size)) as executor:
+        results = list(executor.map(_solve, secrets, chunksize=max(1, len(secrets) // (workers * 8))))
+    wall_seconds = time.perf_counter() - start
+
+    guesses = [result[0] for result in results]
+    seconds = [result[1] for result in results]
+    histogram = {}
+    for count in sorted(guesses):
+        histogram[str(count)] = histogram.get(str(count), 0) + 1
+    return {"strategy": strategy,
+            "workers": workers,
+            "secrets": len(results),
+            "mean_guesses": sum(guesses) / len(guesses),
+            "max_guesses": max(guesses),
+            "guesses_histogram": histogram,
+            "mean_solve_seconds": sum(seconds) / len(seconds),
+            "max_solve_seconds": max(seconds),
+            "wall_seconds": wall_seconds}
+
+
+# -------------------------------------------------------------------------
+# Private helper functions run by the worker processes
+
+_worker = {}
+
+
+def _start_worker(strategy: str, feedback_table_path: str, hint_cache_size: int):
+    store = _SessionStore()
+    _worker['store'] = store
+    _worker['game'] = MastermindGame(store, feedback_table_path=feedback_table_path, hint_cache_size=hint_cache_size)
+    _worker['strategy'] = STRATEGIES[strategy]
+
+
+# Plays one game against the secret with the given index, returning the guesses it took and its duration
+def _solve(secret: int) -> tuple:
+    game = _worker['game']
+    strategy = _worker['strategy']
+
+    start = time.perf_counter()
+    game_session = game.create_game({'game_id': 0})
+    game_session[MastermindGame.TARGET_KEY] = CODES[secret].tolist()
+    while not game_session[MastermindGame.STATUS_KEY]:
+        game_session[MastermindGame.GUESS_KEY] = strategy(game, game_session)
+        game.update_game(game_session)
+        game_session = game.read_game(game_session)
+    seconds = time.perf_counter() - start
+
+    game.delete_game(game_session)
+    return game_session[MastermindGame.PLAY_COUNTER_KEY], seconds
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark a Mastermind strategy against every secret.")
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='knuth', help="strategy to play")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes, the CPU count by default")
+    parser.add_argument('--feedback-table', default=None, help="feedback table file to memory-map")
+    parser.add_argument('--output', default=None, help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = json.dumps(run_benchmark(args.strategy, args.workers, feedback_table_path=args.feedback_table),
+                        indent=2)
+    print(report)
+    if args.output is not None:
+        with open(args.output, 'w') as report_file:
+            report_file.write(report + '\n')
@@ -0,0 +1,189 @@
+import argparse
+import os
+import tempfile
+from collections import Counter
+from functools import lru_cache
+from itertools import permutations
+
+import numpy as np
+
+# Codes are four distinct digits from 1-9
+CODE_LENGTH = 4
+DIGITS = tuple(range(1, 10))
+CODES = np.array(list(permutations(DIGITS, CODE_LENGTH)), dtype=np.uint8)
+CODE_INDEXES = {code: index for index, code in enumerate(permutations(DIGITS, CODE_LENGTH))}
+
+
+class MastermindFeedback:
+    """ The cows and bulls of every Mastermind guess against every target.
+
+    There are only 3024 codes of four distinct digits from 1-9, so the feedback of all
+    of them against each other fits a 3024x3024 table of bytes holding cows * 5 + bulls.
+    Codes are numbered in the order of CODES, and scoring a guess is one lookup in the
+    table.
+
+    Given a path, the table is memory-mapped from a .npy file: nothing is computed at
+    startup, and every worker that maps the same file shares its pages through the OS
+    cache. A missing file is built and written the first time it is opened. Files can
+    also be written offline with:
+        python -m pyarcade.Games.mastermind_feedback <path>
+
+    Tables are loaded once per process and shared by every instance given the same path.
+
+    Args:
+        path: optional location of a table file. Without one the table is built in
+            memory.
+    """
+    BULLS = CODE_LENGTH + 1
+
+    def __init__(self, path: str = None):
+        self.table = _load_table(path)
+
+    def score(self, guess, target):
+        """
+        Args:
+            guess: sequence of the four digits guessed.
+            target: sequence of the four digits of the hidden code.
+
+        Returns:
+            feedback: tuple of the numbers of cows and bulls, or None if either sequence
+            is not a code of four distinct digits from 1-9.
+        """
+        guess_index = code_index(guess)
+        target_index = code_index(target)
+        if guess_index is None or target_index is None:
+            return None
+        return MastermindFeedback.decode(self.table[guess_index, target_index])
+
+    def feedback_row(self, guess) -> np.ndarray:
+        """
+        Args:
+            guess: sequence of the four digits guessed.
+
+        Returns:
+            feedback: uint8 array with the encoded feedback of the guess against every
+            code, in the order of CODES. Guesses that are not codes themselves are
+            scored like count_cows_and_bulls does without repeats.
+        """
+        guess_index = code_index(guess)
+        if guess_index is not None:
+            return self.table[guess_index]
+
+        guess = np.array([int(digit) for digit in guess])
+        missed = CODES != guess
+        bulls = CODE_LENGTH - missed.sum(axis=1)
+        # A missed guess position is a cow if its digit is held at a missed position of the code
+        holds = CODES[:, None, :] == guess[None, :, None]
+        cows = (missed[:, :, None] & holds & missed[:, None, :]).any(axis=2).sum(axis=1)
+        return (cows * MastermindFeedback.BULLS + bulls).astype(np.uint8)
+
+    @staticmethod
+    def encode(cows: int, bulls: int) -> int:
+        return cows * MastermindFeedback.BULLS + bulls
+
+    @staticmethod
+    def decode(feedback: int) -> tuple:
+        cows, bulls = divmod(int(feedback), MastermindFeedback.BULLS)
+        return cows, bulls
+
+
+def code_index(code):
+    """ Returns the number of a code in CODES, or None if it is not a code of four
+    distinct digits from 1-9.
+    """
+    return CODE_INDEXES.get(tuple(code))
+
+
+def count_cows_and_bulls(guess, target, repeats: bool = True) -> tuple:
+    """ Scores a guess against a target of any length, with any symbols.
+
+    With repeats, every symbol the two have in common counts as many times as it
+    appears in the one holding it fewer times, and the cows are those matches that are
+    not bulls. Both sequences are read once to build a histogram of their symbols, so
+    scoring takes time linear in their length plus the number of distinct symbols.
+
+    Without repeats the target holds every symbol once and the original rule of the
+    game applies: each guessed symbol that is not a bull is a cow if the target holds
+    it at a position that is not a bull, however many times it is guessed. The guess
+    (2, 2, 3, 3) has four cows against (3, 4, 2, 1).
+
+    Args:
+        guess: sequence of the symbols guessed.
+        target: sequence of the symbols of the hidden code.
+        repeats: False for sessions whose targets hold every symbol once.
+
+    Returns:
+        feedback: tuple of the numbers of cows and bulls.
+    """
+    guess = [int(symbol) for symbol in guess]
+    target = [int(symbol) for symbol in target]
+    bulls = sum(1 for guessed, hidden in zip(guess, target) if guessed == hidden)
+    if not repeats:
+        missed = [index for index in range(len(guess)) if guess[index] != target[index]]
+        hidden = {target[index] for index in missed}
+        return sum(1 for index in missed if guess[index] in hidden), bulls
+    target_counts = Counter(target)
+    matches = sum(min(count, target_counts[symbol]) for symbol, count in Counter(guess).items())
+    return matches - bulls, bulls
+
+
+def build_feedback_table() -> np.ndarray:
+    """ Returns the feedback of every code against every other one, indexed by guess
+    then target.
+    """
+    bulls = (CODES[:, None, :] == CODES[None, :, :]).sum(axis=2)
+    # Digits are distinct, so the digits two codes share are the dot product of their digit sets
+    digit_sets = np.zeros((len(CODES), len(DIGITS) + 1), dtype=np.int32)
+    np.put_along_axis(digit_sets, CODES.astype(np.int64), 1, axis=1)
+    shared = digit_sets @ digit_sets.T
+    return ((shared - bulls) * MastermindFeedback.BULLS + bulls).astype(np.uint8)
+
+
+def write_feedback_table(path: str):
+    """ Builds the table and writes it to a .npy file.
+
+    Args:
+        path: where to write the table. The file is replaced atomically, so workers that
+            still map an older table keep reading it until they reopen the path. Each
+            call writes its own temporary file, so workers writing the table at the same
+            time never mix their writes.
+    """
+    table_file = tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(path)),
+                                             prefix=os.path.basename(path) + '.', suffix='.tmp', delete=False)
+    try:
+        with table_file:
+            np.save(table_file, build_feedback_table())
+        os.replace(table_file.name, path)
+    except BaseException:
+        os.unlink(table_file.name)
+        raise
+
+
+# -------------------------------------------------------------------------
+# Private helper functions
+
+@lru_cache(maxsize=None)
+def _load_table(path: str = None) -> np.ndarray:
+    if path is None:
+        table = build_feedback_table()
+        table.flags.writeable = False
+        return table
+
+    if not os.path.exists(path):
+        write_feedback_table(path)
+    try:
+        table = np.load(path, mmap_mode='r')
+    except ValueError:
+        table = None
+    if table is None or table.dtype != np.uint8 or table.shape != (len(CODES), len(CODES)):
+        raise Exception("{} is not a Mastermind feedback table.".format(path))
+    return table
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build the Mastermind feedback table.")
+    parser.add_argument('path', help="file to write the table to")
+    args = parser.parse_args()
+
+    write_feedback_table(args.path)
+    print("Wrote {0}x{0} feedback table to {1}".format(len(CODES), args.path))
@@ -16,6 +16,13 @@ class MastermindGameProxy(GameInterface):
     GAME_ID_KEY = 'game_id'
     SESSION_ID_KEY = 'session_id'
     GUESS_KEY = 'guess'
+    LENGTH_KEY = MastermindGame.LENGTH_KEY
+    COLORS_KEY = MastermindGame.COLORS_KEY
+    REPEATS_KEY = MastermindGame.REPEATS_KEY
+    MAX_LENGTH = 10
+    MAX_COLORS = 16
+    BATCH_KEY = MastermindGame.BATCH_KEY
+    MAX_BATCH = 100
     INVALID_INPUT = {SESSION_ID_KEY: 0}
 
     def __init__(self, game_instance: MastermindGame):
@@ -24,8 +31,11 @@ class MastermindGameProxy(GameInterface):
     def create_game(self, request: dict) -> dict:
         """
         Args:
-            request: dictionary containing single key-value pair. The key is "game_id".
-            The value should be zero.
+            request: dictionary containing the key "game_id". The value should be zero.
+            It may also hold the "length" of the hidden sequence, an integer from 1 to
+            MAX_LENGTH, its number of "colors", an integer from 2 to MAX_COLORS, and
+            whether "repeats" are allowed, a boolean. Without repeats there must be
+            at least as many colors as the length.
 
         Returns:
             reply: dictionary containing a single key-value pair. The key is
@@ -36,7 +46,7 @@ class MastermindGameProxy(GameInterface):
         game_id = request[MastermindGameProxy.GAME_ID_KEY]
         game_id_is_int = type(game_id) == int
 
-        if game_id != 0 or not game_id_is_int:
+        if game_id != 0 or not game_id_is_int or not self.__check_variant(request):
             return MastermindGameProxy.INVALID_INPUT
         else:
             return self.game_instance.create_game(request)
@@ -64,7 +74,9 @@ class MastermindGameProxy(GameInterface):
             request: dictionary containing two key-value pairs. One key is
             "session_id". The value is a integer unique to all ongoing game
             sessions. The second key is "guess." The value should be a tuple
-            of four integers.
+            of as many integers as the stored session's "length", four by default,
+            each from 1 to its number of "colors", nine by default. The game checks
+            the guess against the stored session.
 
         Returns:
             reply: dictionary containing a single key-value pair. The key is
@@ -77,14 +89,49 @@ class MastermindGameProxy(GameInterface):
         else:
             return MastermindGameProxy.INVALID_INPUT
 
-        guess_is_four_tuple = len(guess) == 4
+        if type(guess) not in (list, tuple):
+            return MastermindGameProxy.INVALID_INPUT
 
-        each_guess_is_int = self.__check_each_guess_is_an_integer(guess)
+        return self.game_instance.update_game(request)
 
-        valid_input = guess_is_four_tuple and each_guess_is_int
+    def batch_update_game(self, request: dict) -> dict:
+        """
+        Args:
+            request: dictionary containing the key "session_id", and the key "batch"
+            holding a list of up to MAX_BATCH guesses, each a list of integers. The
+            game checks them against the length and colors of the stored session.
 
-        if valid_input:
-            return self.game_instance.update_game(request)
+        Returns:
+            reply: dictionary with the feedback of the guesses played (see
+            MastermindGame.batch_update_game). If the request is invalid, a
+            session_id of zero is returned.
+        """
+        if MastermindGameProxy.SESSION_ID_KEY not in request.keys() or \
+                MastermindGameProxy.BATCH_KEY not in request.keys():
+            return MastermindGameProxy.INVALID_INPUT
+
+        batch = request[MastermindGameProxy.BATCH_KEY]
+
+        if type(batch) != list or not 1 <= len(batch) <= MastermindGameProxy.MAX_BATCH:
+            return MastermindGameProxy.INVALID_INPUT
+        for guess in batch:
+            if type(guess) not in (list, tuple):
+                return MastermindGameProxy.INVALID_INPUT
+
+        return self.game_instance.batch_update_game(request)
+
+    def hint_game(self, request: dict) -> dict:
+        """
+        Args:
+            request: dictionary containing the "game_id" and "session_id" of the session
+            to give a hint for.
+
+        Returns:
+            reply: dictionary with the suggested guess (see MastermindGame.hint_game). If
+            the session_id is missing, a session_id of zero is returned.
+        """
+        if MastermindGameProxy.SESSION_ID_KEY in request.keys():
+            return self.game_instance.hint_game(request)
         else:
             return MastermindGameProxy.INVALID_INPUT
 
@@ -109,10 +156,15 @@ class MastermindGameProxy(GameInterface):
     # ------------------------------------------------------------------------------------------
     " Helper methods for this class can be found here "
 
+    # Checks the optional length, colors and repeats of a new session
     @staticmethod
-    def __check_each_guess_is_an_integer(guess: tuple) -> bool:
-        each_guess_is_int = True
-        for g in guess:
-            if type(g) != int:
-                each_guess_is_int = False
-        return each_guess_is_int
+    def __check_variant(request: dict) -> bool:
+        length = request.get(MastermindGameProxy.LENGTH_KEY, MastermindGame.DEFAULT_LENGTH)
+        colors = request.get(MastermindGameProxy.COLORS_KEY, MastermindGame.DEFAULT_COLORS)
+        repeats = request.get(MastermindGameProxy.REPEATS_KEY, False)
+
+        if type(length) != int or type(colors) != int or type(repeats) != bool:
+            return False
+        if not 1 <= length <= MastermindGameProxy.MAX_LENGTH or not 2 <= colors <= MastermindGameProxy.MAX_COLORS:
+            return False
+        return repeats or colors >= length
@@ -0,0 +1,137 @@
+import base64
+import threading
+import zlib
+from collections import OrderedDict
+
+import numpy as np
+
+from pyarcade.Games.mastermind_feedback import CODES, MastermindFeedback
+
+
+class MastermindSolver:
+    """ Suggests Mastermind guesses with Knuth's minimax rule.
+
+    The codes still possible are the ones that give every recorded guess the feedback
+    it got, found with one comparison of a row of the feedback table per guess. The
+    suggested guess is the code whose worst feedback leaves the fewest of them,
+    preferring codes that could still be the answer and then the first code in the
+    order of CODES. Every code is weighed at once: the feedback of all codes against
+    the remaining ones is counted with a single bincount.
+
+    Suggestions are kept in a least recently used cache shared by every session of the
+    process. The cache is keyed by the set of recorded guesses and feedback, so the
+    first guess and the answers to common openings are only worked out once.
+
+    Args:
+        feedback: the MastermindFeedback table to score guesses with.
+        cache_size: number of guess histories kept in the cache.
+    """
+    # cows * 5 + bulls stays below 25
+    OUTCOMES = MastermindFeedback.BULLS * MastermindFeedback.BULLS
+
+    def __init__(self, feedback: MastermindFeedback, cache_size: int = 1024):
+        self.feedback = feedback
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Flask may serve requests from several threads of the process
+        self.lock = threading.Lock()
+
+    def candidates(self, guesses: list) -> np.ndarray:
+        """
+        Args:
+            guesses: list of the guesses made so far, each as (guess, (cows, bulls)).
+
+        Returns:
+            candidates: bool array that is True for the codes, in the order of CODES,
+            that give every guess its recorded feedback.
+        """
+        candidates = np.ones(len(CODES), dtype=bool)
+        for guess, feedback in guesses:
+            candidates = self.narrow(candidates, guess, feedback)
+        return candidates
+
+    def narrow(self, candidates: np.ndarray, guess, feedback) -> np.ndarray:
+        """
+        Args:
+            candidates: bool array of the codes possible before the guess.
+            guess: sequence of the four digits guessed.
+            feedback: the (cows, bulls) the guess got.
+
+        Returns:
+            candidates: bool array of the codes that are still possible after it.
+        """
+        cows, bulls = feedback
+        return candidates & (self.feedback.feedback_row(guess) == MastermindFeedback.encode(int(cows), int(bulls)))
+
+    def best_guess(self, guesses: list, candidates: np.ndarray = None) -> tuple:
+        """
+        Args:
+            guesses: list of the guesses made so far, each as (guess, (cows, bulls)).
+            candidates: optional bool array of the codes that fit the guesses, when the
+                caller keeps it, to save narrowing the codes again.
+
+        Returns:
+            reply: tuple of the suggested guess as a list of four digits and the number
+            of codes still possible. The guess is None if no code fits the history.
+        """
+        key = tuple(sorted((tuple(int(digit) for digit in guess), (int(cows), int(bulls)))
+                           for guess, (cows, bulls) in guesses))
+        with self.lock:
+            reply = self.cache.get(key)
+            if reply is not None:
+                self.cache.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if reply is None:
+            reply = self.__solve(self.candidates(guesses) if candidates is None else candidates)
+            with self.lock:
+                self.cache[key] = reply
+                self.cache.move_to_end(key)
+                while len(self.cache) > self.cache_size:
+                    self.cache.popitem(last=False)
+
+        guess, remaining = reply
+        return (list(guess) if guess is not None else None), remaining
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            reply: dictionary with the "hits" and "misses" of the cache since the process
+            started, and its current "size" and "capacity".
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self.cache),
+                    "capacity": self.cache_size}
+
+    # Picks the guess whose largest partition of the candidates is smallest
+    def __solve(self, candidates: np.ndarray) -> tuple:
+        remaining = int(candidates.sum())
+        if remaining <= 2:
+            # Guessing a candidate is as good as it gets: it either wins or leaves the other one
+            indexes = np.flatnonzero(candidates)
+            return (tuple(CODES[indexes[0]].tolist()) if remaining else None), remaining
+
+        feedback = self.feedback.table[:, candidates].astype(np.int64)
+        feedback += np.arange(len(CODES))[:, None] * MastermindSolver.OUTCOMES
+        partitions = np.bincount(feedback.ravel(), minlength=len(CODES) * MastermindSolver.OUTCOMES)
+        worst = partitions.reshape(len(CODES), MastermindSolver.OUTCOMES).max(axis=1)
+        # argmin returns the first code among equals, so candidates win ties by weighing one less
+        best = int(np.argmin(worst * 2 + ~candidates))
+        return tuple(CODES[best].tolist()), remaining
+
+
+def pack_candidates(candidates: np.ndarray) -> str:
+    """ Returns a bool array over CODES as a short string that can be stored with a
+    session: one bit per code, compressed and base64 encoded.
+    """
+    return base64.b64encode(zlib.compress(np.packbits(candidates).tobytes())).decode('ascii')
+
+
+def unpack_candidates(packed: str) -> np.ndarray:
+    """ Returns the bool array over CODES stored by pack_candidates. """
+    bits = np.frombuffer(zlib.decompress(base64.b64decode(packed)), dtype=np.uint8)
+    return np.unpackbits(bits, count=len(CODES)).astype(bool)
@@ -0,0 +1,59 @@
+MASK_64 = (1 << 64) - 1
+
+
+class ZobristTable:
+    """ Fixed 64 bit keys for Zobrist hashing.
+
+    The hash of a position is the XOR of one key per (place, content) pair on the
+    board, so a move only XORs out the keys of the places it changes and XORs in their
+    new keys. Keys are derived from the index with splitmix64 instead of a random
+    generator, so every process and every release agrees on them and hashes stored
+    with a session stay valid after a restart.
+
+    Args:
+        seed: distinguishes the tables of different games.
+        size: number of keys computed up front. Larger indexes are computed on demand.
+    """
+
+    def __init__(self, seed: int, size: int):
+        self.seed = seed
+        self.keys = [splitmix64(seed + index) for index in range(size)]
+
+    def key(self, index: int) -> int:
+        if index < len(self.keys):
+            return self.keys[index]
+        return splitmix64(self.seed + index)
+
+
+def splitmix64(value: int) -> int:
+    """ Returns a well mixed 64 bit number for any integer. """
+    value = (value + 0x9E3779B97F4A7C15) & MASK_64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+# Connect Four uses index 2 * bit + side, where bit is the position of the cell in a ConnectFourBoard.
+# The table covers boards of up to 20x20
+CONNECT_FOUR_ZOBRIST = ZobristTable(seed=1 << 32, size=2 * 20 * 21)
+
+# Mancala uses index hole * (MANCALA_STONES + 1) + stones, where hole is a slot from 0-13 and stones is the number
+# of stones in it
+MANCALA_STONES = 48
+MANCALA_ZOBRIST = ZobristTable(seed=2 << 32, size=14 * (MANCALA_STONES + 1))
+# XORed into the hash of a board when players[1] is to move, for searches where the side to move matters
+MANCALA_SIDE_KEY = MANCALA_ZOBRIST.key(14 * (MANCALA_STONES + 1))
+
+
+def mancala_key(row: int, col: int, stones: int) -> int:
+    """ Returns the key of a hole of the 2x7 session board holding the given number of stones. """
+    return MANCALA_ZOBRIST.key((row * 7 + col) * (MANCALA_STONES + 1) + stones)
+
+
+def mancala_hash(board: list) -> int:
+    """ Hashes a whole 2x7 session board, for sessions stored without a hash. """
+    zobrist_hash = 0
+    for row in range(2):
+        for col in range(7):
+            zobrist_hash ^= mancala_key(row, col, int(board[row][col]))
+    return zobrist_hash
@@ -49,6 +49,15 @@ def create_app(test_config=None):
             (look at update_game in mastermind & mastermind_proxy for
             more information)
 
+    batch_update_mastermind():
+        args:
+            request: passes through parameters for batch_update_game
+        description:
+            Plays a list of guesses of a mastermind game in order and
+            saves the session once
+            (look at batch_update_game in mastermind & mastermind_proxy
+            for more information)
+
     delete_mastermind()
         args:
             request: passes through parameters for delete_game
@@ -61,10 +70,19 @@ def create_app(test_config=None):
         args:
             request: passes through parameters for high_scores
         description:
-            Retrieves the high score list saved in mastermind
+            Retrieves the all time, weekly and daily high score lists saved in mastermind
             (look at delete_game in mastermind & mastermind_proxy for
             more information)
 
+    hint_mastermind():
+        args:
+            request: passes through parameters for hint_game
+        description:
+            Suggests the guess that leaves the fewest possible targets
+            given the guesses made so far
+            (look at hint_game in mastermind & mastermind_proxy for
+            more information)
+
     post_connect_four():
         args:
             request: passes through parameters for create_game
@@ -110,10 +128,29 @@ def create_app(test_config=None):
         args:
             request: passes through parameters for high_scores
         description:
-            Retrieves the high score list saved in mancala_game
+            Retrieves the all time, weekly and daily high score lists saved in mancala_game
             (look at get_high_scores in connect_four for
             more information)
 
+    analyze_connect_four():
+        args:
+            request: passes through parameters for analyze_game
+        description:
+            Scores every column of the current connect4 position for the
+            player to move
+            (look at analyze_game in connect_four & connect_four_proxy for
+            more information)
+
+    get_connect_four_analysis_stats():
+        description:
+            Returns the hit and miss counters of the shared cache behind
+            analyze_connect_four
+
+    get_connect_four_score_record_stats():
+        description:
+            Returns the number of wins kept in the score record of this
+            worker, how many it may keep and the bytes it holds
+
     read_mancala()
         args:
             request: passes through parameters for read_game
@@ -150,10 +187,19 @@ def create_app(test_config=None):
         args:
             request: passes through parameters for highscores
         description:
-            Retrieves the high score list saved in mancala_game
+            Retrieves the all time, weekly and daily high score lists saved in mancala_game
             (look at update_game in mancala_game for
             more information)
 
+    hint_mancala():
+        args:
+            request: passes through parameters for hint_game
+        description:
+            Suggests a move for the player to move, exact when the position
+            is in the endgame database
+            (look at hint_game in mancala_game & mancala_proxy.py for
+            more information)
+
     list():
         description:
             returns the list of game sessions that currently exist for the
@@ -199,6 +245,8 @@ def create_app(test_config=None):
     # ConnectionManager: Look in \final_project\pyarcade\dynamodb folder
     cm = ConnectionManager(mode=db_mode, config=db_config, endpoint=db_endpoint, port=db_port,
                            use_instance_metadata=use_inst_metadata)
+    # Tables created before the daily and weekly leaderboards existed get their time to live turned on here
+    cm.enable_games_table_time_to_live()
 
 
 
@@ -207,13 +255,39 @@ def create_app(test_config=None):
     # Look in \final_project\pyarcade\dynamodb folder
     controller = GameController(cm)
 
-    mastermind_game = MastermindGame(controller)
+    # High scores are shared by every worker through DynamoDB, and reads of them are cached for this many seconds
+    leaderboard_size = config.getint('leaderboard', 'size', fallback=10)
+    leaderboard_cache_ttl = config.getfloat('leaderboard', 'cache_ttl', fallback=5.0)
+
+    mastermind_game = MastermindGame(controller,
+                                     feedback_table_path=config.get('mastermind', 'feedback_table', fallback=None),
+                                     hint_cache_size=config.getint('mastermind', 'hint_cache_size', fallback=1024),
+                                     leaderboard_size=leaderboard_size,
+                                     leaderboard_cache_ttl=leaderboard_cache_ttl)
     mastermind_proxy = MastermindGameProxy(mastermind_game)
 
-    mancala_game = MancalaGame(controller)
+    mancala_game = MancalaGame(controller,
+                               ai_time_budget=config.getfloat('mancala', 'ai_time_budget', fallback=0.5),
+                               endgame_database_path=config.get('mancala', 'endgame_database', fallback=None),
+                               leaderboard_size=leaderboard_size,
+                               leaderboard_cache_ttl=leaderboard_cache_ttl)
     mancala_proxy = MancalaProxy(mancala_game)
 
-    connect_four_game = ConnectFourGame(controller)
+    connect_four_game = ConnectFourGame(controller,
+                                        ai_time_budget=config.getfloat('connect_four', 'ai_time_budget',
+                                                                       fallback=0.5),
+                                        opening_book_path=config.get('connect_four', 'opening_book',
+                                                                     fallback=None),
+                                        mcts_workers=config.getint('connect_four', 'mcts_workers',
+                                                                   fallback=None),
+                                        analysis_depth=config.getint('connect_four', 'analysis_depth',
+                                                                     fallback=6),
+                                        analysis_cache_size=config.getint('connect_four', 'analysis_cache_size',
+                                                                          fallback=4096),
+                                        leaderboard_size=leaderboard_size,
+                                        leaderboard_cache_ttl=leaderboard_cache_ttl,
+                                        score_record_size=config.getint('connect_four', 'score_record_size',
+                                                                        fallback=1000))
     connect_four_proxy = ConnectFourProxy(connect_four_game)
 
     # Register blueprints
@@ -251,6 +325,11 @@ def create_app(test_config=None):
     def update_mastermind():
         return json.dumps(mastermind_proxy.update_game(request.get_json()))
 
+    # Batch update - Mastermind
+    @app.route('/mastermind/batch', methods=['PUT'])
+    def batch_update_mastermind():
+        return json.dumps(mastermind_proxy.batch_update_game(request.get_json()))
+
     # Delete - Mastermind
     @app.route('/mastermind', methods=["DELETE"])
     def delete_mastermind():
@@ -261,6 +340,11 @@ def create_app(test_config=None):
     def get_mastermind_highscores():
         return json.dumps(mastermind_game.get_high_scores())
 
+    # Hint - Mastermind
+    @app.route('/mastermind/hint', methods=['GET'])
+    def hint_mastermind():
+        return json.dumps(mastermind_proxy.hint_game(request.get_json()))
+
     """
     *   Connect Four CRUD   *
     """
@@ -295,6 +379,21 @@ def create_app(test_config=None):
     def get_connect_four_highscores():
         return json.dumps(connect_four_game.get_high_scores())
 
+    # Analyze - Connect Four
+    @app.route('/connect4/analyze', methods=['GET'])
+    def analyze_connect_four():
+        return json.dumps(connect_four_proxy.analyze_game(request.get_json()))
+
+    # Analysis cache statistics - Connect Four
+    @app.route('/connect4/analyze/stats', methods=['GET'])
+    def get_connect_four_analysis_stats():
+        return json.dumps(connect_four_game.get_analysis_stats())
+
+    # Score record statistics - Connect Four
+    @app.route('/connect4/score_record/stats', methods=['GET'])
+    def get_connect_four_score_record_stats():
+        return json.dumps(connect_four_game.get_score_record_stats())
+
     """
     *   Mancala CRUD *
     """
@@ -324,6 +423,11 @@ def create_app(test_config=None):
     def get_mancala_highscores():
         return json.dumps(mancala_game.get_high_scores())
 
+    # Hint - Mancala
+    @app.route('/mancala/hint', methods=['GET'])
+    def hint_mancala():
+        return json.dumps(mancala_proxy.hint_game(request.get_json()))
+
     """
     *   List game sessions  *
     """
@@ -1,4 +1,4 @@
-from .setup_dynamo_db import get_dynamo_db_connection, create_games_table
+from .setup_dynamo_db import get_dynamo_db_connection, create_games_table, enable_games_table_time_to_live
 
 
 class ConnectionManager:
@@ -36,3 +36,6 @@ class ConnectionManager:
 
     def create_games_table(self):
         self.games_table = create_games_table(self.db)
+
+    def enable_games_table_time_to_live(self):
+        enable_games_table_time_to_live(self.db)
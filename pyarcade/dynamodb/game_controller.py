@@ -1,6 +1,7 @@
 import boto3
 import os
 from boto3.dynamodb.conditions import Key, Attr
+from botocore.exceptions import ClientError
 
 
 class GameController:
@@ -31,6 +32,60 @@ class GameController:
         response = self.cm.get_games_table().put_item(Item=json_data)
         return response
 
+    def update_game_if_unchanged(self, json_data, expected):
+        """
+        Writes a game session in a single conditional put_item call, only if the stored
+        session still holds the expected values.
+
+        Args:
+            json_data: the game session to write.
+            expected: dictionary of attribute names and the values the stored session
+                must hold. A session that does not exist never matches.
+
+        Returns:
+            response: the put_item response, or None if the stored session has changed.
+        """
+        condition = None
+        for name, value in expected.items():
+            condition = Attr(name).eq(value) if condition is None else condition & Attr(name).eq(value)
+        try:
+            response = self.cm.get_games_table().put_item(Item=json_data, ConditionExpression=condition)
+        except ClientError as error:
+            if error.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return None
+            raise
+        return response
+
+    def create_game_if_absent(self, json_data):
+        """
+        Writes a game session in a single conditional put_item call, only if no session
+        with the same key is stored yet.
+
+        Returns:
+            response: the put_item response, or None if the session already exists.
+        """
+        try:
+            response = self.cm.get_games_table().put_item(Item=json_data,
+                                                          ConditionExpression=Attr('session_id').not_exists())
+        except ClientError as error:
+            if error.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return None
+            raise
+        return response
+
+    def find_game_session(self, json_data):
+        """
+        Same as get_game_session, but returns None instead of raising when the session
+        does not exist.
+        """
+        response = self.cm.get_games_table().get_item(
+            Key={
+                'game_id': json_data["game_id"],
+                'session_id': json_data["session_id"]
+            }
+        )
+        return response.get('Item')
+
     def all_game_sessions(self, json_data):
         response = self.cm.get_games_table().query(
             KeyConditionExpression=Key('game_id').eq(json_data["game_id"])
@@ -0,0 +1,257 @@
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+
+class TopScores:
+    """
+    The best scores of a game, at most one per player, kept sorted fewest moves first.
+
+    Entries are found by binary search over a sorted list of (score, arrival) keys,
+    so an insert makes O(log K) comparisons whatever the size K of the list. A player
+    who is already listed only moves up when they beat their own best score, and
+    equal scores stay in the order they arrived. The sorted entries are copied once
+    after a change and that copy is returned by every read until the next change.
+
+    Args:
+        size: number of scores kept.
+        entries: optional (score, name) pairs to start from, best first.
+    """
+
+    def __init__(self, size: int, entries=()):
+        self.size = size
+        # keys and names are parallel lists sorted by key
+        self.keys = []
+        self.names = []
+        self.best = {}
+        self.arrivals = 0
+        self.snapshot = ()
+        for score, name in entries:
+            self.add(score, name)
+
+    def add(self, score, name) -> bool:
+        """
+        Returns:
+            added: True if the score made the list, False if it does not beat the
+            player's best score or the last score of a full list.
+        """
+        previous = self.best.get(name)
+        if previous is not None and previous[0] <= score:
+            return False
+        if previous is None and len(self.keys) >= self.size and score >= self.keys[-1][0]:
+            return False
+
+        if previous is not None:
+            index = bisect_left(self.keys, previous)
+            del self.keys[index]
+            del self.names[index]
+        key = (score, self.arrivals)
+        self.arrivals += 1
+        index = bisect_right(self.keys, key)
+        self.keys.insert(index, key)
+        self.names.insert(index, name)
+        self.best[name] = key
+
+        if len(self.keys) > self.size:
+            self.keys.pop()
+            del self.best[self.names.pop()]
+        self.snapshot = tuple((key[0], name) for key, name in zip(self.keys, self.names))
+        return True
+
+    def top(self) -> tuple:
+        """
+        Returns:
+            scores: tuple of (score, name) pairs, best first.
+        """
+        return self.snapshot
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            reply: dictionary with the current "size" and the "capacity" of the list,
+            and the "bytes" held by its lists, index and snapshot, not counting the
+            names themselves.
+        """
+        containers = (self.keys, self.names, self.best, self.snapshot)
+        entries = sum(sys.getsizeof(key) for key in self.keys) + sum(sys.getsizeof(entry) for entry in self.snapshot)
+        return {"size": len(self.keys), "capacity": self.size,
+                "bytes": sum(sys.getsizeof(container) for container in containers) + entries}
+
+
+class Leaderboard:
+    """
+    The high scores of one game, stored in DynamoDB so that every Flask worker reads
+    and updates the same list and a restart loses nothing.
+
+    The list is a single item of the Games table under the game's game_id and the
+    reserved session_id "leaderboard", holding each player's best score, fewest moves
+    first, and a version number. A new score is merged into the stored list with
+    TopScores and written back with a conditional put that only succeeds if the
+    version has not changed since the list was read. A worker that loses the race to
+    another one reads the list again and retries, so no win is ever overwritten.
+
+    Reads are served from a copy kept in the process for cache_ttl seconds, so
+    showing the high scores does not query DynamoDB on every page view. Scores
+    recorded by this process show up right away, those of other workers once the
+    copy expires.
+
+    A list with a period only holds the scores of the current UTC day or week
+    (starting on Monday). Each period is its own item, with the start of the period
+    in its session_id, so a new period starts from an empty list without anything
+    being recomputed. The item carries the time the period ends under "expires_at",
+    the attribute DynamoDB's time to live is enabled on, and is deleted after that.
+
+    Args:
+        db_controller: the GameController the list is stored with.
+        game_id: the game_id of the game the list belongs to.
+        size: number of scores kept.
+        cache_ttl: seconds a read of the list is reused for.
+        retries: number of times a write that lost a race is attempted again.
+        period: optional "daily" or "weekly", the list keeps every score otherwise.
+        clock: function returning the current time in seconds since the epoch.
+    """
+    SESSION_ID = 'leaderboard'
+    SCORES_KEY = 'scores'
+    VERSION_KEY = 'version'
+    EXPIRES_AT_KEY = 'expires_at'
+    # Length and offset from the epoch, a Thursday, of each period in seconds
+    PERIODS = {'daily': (86400, 0), 'weekly': (7 * 86400, 3 * 86400)}
+
+    def __init__(self, db_controller, game_id: int, size: int = 10, cache_ttl: float = 5.0, retries: int = 5,
+                 period: str = None, clock=time.time):
+        if period is not None and period not in Leaderboard.PERIODS:
+            raise Exception("Unknown leaderboard period {}.".format(period))
+        self.db = db_controller
+        self.game_id = game_id
+        self.size = size
+        self.cache_ttl = cache_ttl
+        self.retries = retries
+        self.period = period
+        self.clock = clock
+        self.cached_scores = None
+        self.cached_key = None
+        self.cached_at = 0.0
+        # Flask may serve requests from several threads of the process
+        self.lock = threading.Lock()
+
+    def record(self, score, name) -> bool:
+        """
+        Merges a score into the stored list.
+
+        Args:
+            score: the number of moves the win took.
+            name: the player the score belongs to.
+
+        Returns:
+            stored: True if the score made the list, False if it did not or if every
+            attempt to write it lost a race with another worker.
+        """
+        key, expires_at = self.__bucket()
+        for _ in range(self.retries + 1):
+            item = self.db.find_game_session(key)
+            scores = self.__scores_of(item)
+            if not scores.add(score, name):
+                self.__cache(key, scores.top())
+                return False
+
+            new_item = dict(key)
+            new_item[Leaderboard.SCORES_KEY] = [[entry_score, entry_name] for entry_score, entry_name in scores.top()]
+            if expires_at is not None:
+                new_item[Leaderboard.EXPIRES_AT_KEY] = expires_at
+            if item is None:
+                new_item[Leaderboard.VERSION_KEY] = 0
+                response = self.db.create_game_if_absent(new_item)
+            else:
+                new_item[Leaderboard.VERSION_KEY] = item[Leaderboard.VERSION_KEY] + 1
+                response = self.db.update_game_if_unchanged(
+                    new_item, {Leaderboard.VERSION_KEY: item[Leaderboard.VERSION_KEY]})
+            if response is not None:
+                self.__cache(key, scores.top())
+                return True
+        return False
+
+    def top(self) -> tuple:
+        """
+        Returns:
+            scores: tuple of at most size (score, player) pairs, best first.
+        """
+        key = self.__bucket()[0]
+        with self.lock:
+            if self.cached_key == key and time.monotonic() - self.cached_at < self.cache_ttl:
+                return self.cached_scores
+        scores = self.__scores_of(self.db.find_game_session(key)).top()
+        self.__cache(key, scores)
+        return scores
+
+    # -------------------------------------------------------------------------
+    # Private helper methods
+
+    # Returns the key of the list for the current period and the time the period ends, None for all time lists
+    def __bucket(self) -> tuple:
+        if self.period is None:
+            return {'game_id': self.game_id, 'session_id': Leaderboard.SESSION_ID}, None
+        length, offset = Leaderboard.PERIODS[self.period]
+        start = int((self.clock() + offset) // length) * length - offset
+        day = time.strftime('%Y-%m-%d', time.gmtime(start))
+        session_id = '{}#{}#{}'.format(Leaderboard.SESSION_ID, self.period, day)
+        return {'game_id': self.game_id, 'session_id': session_id}, start + length
+
+    # DynamoDB returns numbers as Decimal and tuples as lists
+    def __scores_of(self, item) -> TopScores:
+        if item is None:
+            return TopScores(self.size)
+        return TopScores(self.size, [(int(score), name) for score, name in item[Leaderboard.SCORES_KEY]])
+
+    def __cache(self, key: dict, scores: tuple):
+        with self.lock:
+            self.cached_key = key
+            self.cached_scores = scores
+            self.cached_at = time.monotonic()
+
+
+class Leaderboards:
+    """
+    The all time, weekly and daily high scores of one game, each a Leaderboard.
+
+    A win is merged into the three lists as it is recorded, so none of them is ever
+    worked out again from the sessions of the game.
+
+    Args:
+        db_controller: the GameController the lists are stored with.
+        game_id: the game_id of the game the lists belong to.
+        size: number of scores kept in each list.
+        cache_ttl: seconds a read of a list is reused for.
+        clock: function returning the current time in seconds since the epoch.
+    """
+    ALL_TIME_KEY = 'scores'
+
+    def __init__(self, db_controller, game_id: int, size: int = 10, cache_ttl: float = 5.0, clock=time.time):
+        self.all_time = Leaderboard(db_controller, game_id, size=size, cache_ttl=cache_ttl, clock=clock)
+        self.periods = {period: Leaderboard(db_controller, game_id, size=size, cache_ttl=cache_ttl, period=period,
+                                            clock=clock)
+                        for period in Leaderboard.PERIODS}
+
+    def record(self, score, name) -> bool:
+        """
+        Merges a score into every list.
+
+        Returns:
+            stored: True if the score made at least one of the lists.
+        """
+        stored = self.all_time.record(score, name)
+        for leaderboard in self.periods.values():
+            stored = leaderboard.record(score, name) or stored
+        return stored
+
+    def top(self) -> dict:
+        """
+        Returns:
+            reply: dictionary with the all time list under "scores" and the lists of
+            the current period under "daily" and "weekly", each as returned by
+            Leaderboard.top.
+        """
+        reply = {Leaderboards.ALL_TIME_KEY: self.all_time.top()}
+        for period, leaderboard in self.periods.items():
+            reply[period] = leaderboard.top()
+        return reply
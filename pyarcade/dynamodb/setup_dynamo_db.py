@@ -1,5 +1,6 @@
 import boto3
 import os
+from botocore.exceptions import ClientError
 
 
 def get_dynamo_db_connection(config=None, endpoint=None, port=None, local=False, use_instance_metadata=False):
@@ -76,4 +77,32 @@ def create_games_table(db):
         }
     )
 
+    table.wait_until_exists()
+    enable_games_table_time_to_live(db)
+
     return table
+
+
+def enable_games_table_time_to_live(db):
+    """
+    Turns on DynamoDB's time to live on the "expires_at" attribute of the Games table,
+    so that daily and weekly leaderboards are deleted once their period is over. It is
+    run on every start, leaving a table that already has it on, or that does not
+    exist yet, as it is.
+    """
+    client = db.meta.client
+    try:
+        status = client.describe_time_to_live(TableName='Games')['TimeToLiveDescription']['TimeToLiveStatus']
+        if status in ('ENABLED', 'ENABLING'):
+            return
+        client.update_time_to_live(
+            TableName='Games',
+            TimeToLiveSpecification={
+                'Enabled': True,
+                'AttributeName': 'expires_at'
+            }
+        )
+    except ClientError as error:
+        # ValidationException is raised when another worker turned it on in the meantime
+        if error.response['Error']['Code'] not in ('ResourceNotFoundException', 'ValidationException'):
+            raise
@@ -0,0 +1,33 @@
+import copy
+
+
+# Keeps game sessions in a dictionary so that the games can run without DynamoDB
+class InMemoryController:
+    def __init__(self):
+        self.sessions = {}
+
+    def create_game(self, json_data):
+        self.sessions[json_data['session_id']] = copy.deepcopy(json_data)
+
+    def update_game(self, json_data):
+        self.sessions[json_data['session_id']] = copy.deepcopy(json_data)
+        return copy.deepcopy(json_data)
+
+    def update_game_if_unchanged(self, json_data, expected):
+        stored = self.sessions.get(json_data['session_id'])
+        if stored is None or any(stored.get(name) != value for name, value in expected.items()):
+            return None
+        self.sessions[json_data['session_id']] = copy.deepcopy(json_data)
+        return {}
+
+    def create_game_if_absent(self, json_data):
+        if json_data['session_id'] in self.sessions:
+            return None
+        self.sessions[json_data['session_id']] = copy.deepcopy(json_data)
+        return {}
+
+    def get_game_session(self, json_data):
+        return copy.deepcopy(self.sessions[json_data['session_id']])
+
+    def find_game_session(self, json_data):
+        return copy.deepcopy(self.sessions.get(json_data['session_id']))
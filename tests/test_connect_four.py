@@ -1,4 +1,5 @@
 from pyarcade.Games.connect_four import ConnectFourGame
+from pyarcade.Games.connect_four_board import ConnectFourBoard
 import unittest
 from configparser import ConfigParser
 import os
@@ -139,6 +140,51 @@ class ConnectFourTestReadAndUpdateGame(unittest.TestCase):
 
         self.assertEqual(session_2['board'][5][3], 'c')
 
+    def test_update_game_tracks_column_heights(self):
+        game = ConnectFourGame(controller)
+
+        session_1 = game.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "b"})
+        self.assertEqual(session_1['column_heights'], [0, 0, 0, 0, 0, 0, 0])
+
+        session_1['column'] = 3
+        game.update_game(session_1)
+        session_1 = game.read_game({'game_id': 1, 'session_id': session_1['session_id']})
+        session_1['column'] = 3
+        game.update_game(session_1)
+        session_1 = game.read_game({'game_id': 1, 'session_id': session_1['session_id']})
+
+        self.assertEqual(session_1['column_heights'], [0, 0, 2, 0, 0, 0, 0])
+
+    # Tests that a session stored without column heights gets them filled in from its board
+    def test_update_game_fills_in_missing_column_heights(self):
+        game = ConnectFourGame(controller)
+
+        session_1 = game.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "b"})
+        session_1['column'] = 5
+        game.update_game(session_1)
+        session_1 = game.read_game({'game_id': 1, 'session_id': session_1['session_id']})
+
+        del session_1['column_heights']
+        session_1['column'] = 5
+        game.update_game(session_1)
+        session_1 = game.read_game({'game_id': 1, 'session_id': session_1['session_id']})
+
+        self.assertEqual(session_1['column_heights'], [0, 0, 0, 0, 2, 0, 0])
+        self.assertEqual(session_1['board'][4][4], 'b')
+
+    # Tests that the Zobrist hash stored with the session follows the board
+    def test_update_game_keeps_zobrist_hash(self):
+        game = ConnectFourGame(controller)
+
+        session_1 = game.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "b"})
+        for column in [4, 4, 5]:
+            session_1['column'] = column
+            game.update_game(session_1)
+            session_1 = game.read_game({'game_id': 1, 'session_id': session_1['session_id']})
+
+        position = ConnectFourBoard.from_board(session_1['board'], ["a", "b"])
+        self.assertEqual(int(session_1['zobrist_hash']), position.hash)
+
     def test_wins_1(self):
         game = ConnectFourGame(controller)
 
@@ -200,6 +246,161 @@ class ConnectFourTestReadAndUpdateGame(unittest.TestCase):
         self.assertEqual(session_1['player_status']['a'], True)
 
 
+class ConnectFourTestConnectN(unittest.TestCase):
+
+    # Tests that the board is created with the requested number of rows and columns
+    def test_create_game_with_board_size(self):
+        game = ConnectFourGame(controller)
+        session_1 = game.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "b",
+                                      'width': 9, 'height': 10, 'run_length': 5})
+
+        self.assertEqual(len(session_1['board']), 10)
+        self.assertEqual(len(session_1['board'][0]), 9)
+        self.assertEqual(session_1['column_heights'], [0] * 9)
+
+    # Tests that four in a row does not end a connect-5 game but five does
+    def test_connect_five_win(self):
+        game = ConnectFourGame(controller)
+        session_1 = game.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "b",
+                                      'width': 9, 'height': 10, 'run_length': 5})
+
+        for column in [9, 1, 8, 1, 7, 1, 6, 1]:
+            session_1['column'] = column
+            game.update_game(session_1)
+            session_1 = game.read_game({'game_id': 1, 'session_id': session_1['session_id']})
+        self.assertEqual(session_1['status'], False)
+
+        session_1['column'] = 5
+        game.update_game(session_1)
+        session_1 = game.read_game({'game_id': 1, 'session_id': session_1['session_id']})
+
+        self.assertEqual(session_1['status'], True)
+        self.assertEqual(session_1['player_status']['a'], True)
+        self.assertEqual(session_1['board'][9][4:], ["a"] * 5)
+
+
+class ConnectFourTestAnalyzeGame(unittest.TestCase):
+
+    # Tests that the column completing a line gets the best score for the player to move
+    def test_analyze_game_scores_columns(self):
+        game = ConnectFourGame(controller, analysis_depth=2)
+        session_1 = game.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "b"})
+        for column in [1, 7, 1, 7, 1, 7]:
+            session_1['column'] = column
+            game.update_game(session_1)
+            session_1 = game.read_game({'game_id': 1, 'session_id': session_1['session_id']})
+
+        analysis = game.analyze_game({'game_id': 1, 'session_id': session_1['session_id']})
+        scores = analysis['scores']
+
+        self.assertEqual(analysis['session_id'], session_1['session_id'])
+        self.assertEqual(max(range(7), key=lambda col: scores[col]), 0)
+        self.assertEqual(game.get_analysis_stats()['misses'], 1)
+
+        game.analyze_game({'game_id': 1, 'session_id': session_1['session_id']})
+        self.assertEqual(game.get_analysis_stats()['hits'], 1)
+
+    # Tests that a finished game has no scores
+    def test_analyze_finished_game(self):
+        game = ConnectFourGame(controller, analysis_depth=2)
+        session_1 = game.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "b"})
+        for column in [1, 7, 1, 7, 1, 7, 1]:
+            session_1['column'] = column
+            game.update_game(session_1)
+            session_1 = game.read_game({'game_id': 1, 'session_id': session_1['session_id']})
+
+        analysis = game.analyze_game({'game_id': 1, 'session_id': session_1['session_id']})
+
+        self.assertEqual(analysis['scores'], [None] * 7)
+
+
+class ConnectFourTestScoreRecord(unittest.TestCase):
+
+    # Tests that wins played through update_game are added to the score record with the winner's turns
+    def test_score_record_grows_with_wins(self):
+        game = ConnectFourGame(controller)
+        for moves in ([1, 2, 1, 2, 1, 2, 1], [1, 2, 3, 2, 3, 2, 3, 2]):
+            session_1 = game.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "b"})
+            for column in moves:
+                session_1['column'] = column
+                game.update_game(session_1)
+                session_1 = game.read_game({'game_id': 1, 'session_id': session_1['session_id']})
+
+        self.assertEqual(game.get_score_record_stats()['size'], 2)
+        self.assertEqual([score for score, session_id in game.SESSION_SCORE_RECORD.top()], [4, 4])
+
+    # Tests that the score record keeps only the fastest wins, however many are played
+    def test_score_record_is_bounded(self):
+        game = ConnectFourGame(controller, score_record_size=2)
+        for moves in ([1, 2, 1, 2, 1, 2, 1], [1, 2, 3, 2, 3, 2, 3, 2], [3, 1, 3, 1, 4, 1, 4, 1]):
+            session_1 = game.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "b"})
+            for column in moves:
+                session_1['column'] = column
+                game.update_game(session_1)
+                session_1 = game.read_game({'game_id': 1, 'session_id': session_1['session_id']})
+
+        stats = game.get_score_record_stats()
+
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['capacity'], 2)
+        self.assertGreater(stats['bytes'], 0)
+
+
+class ConnectFourTestComputerOpponent(unittest.TestCase):
+
+    # Tests that the computer answers a move before the session is saved
+    def test_computer_replies_to_move(self):
+        game = ConnectFourGame(controller, ai_time_budget=0.1)
+
+        session_1 = game.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "computer"})
+
+        session_1['column'] = 1
+        game.update_game(session_1)
+        session_1 = game.read_game({'game_id': 1, 'session_id': session_1['session_id']})
+
+        coins = [cell for row in session_1['board'] for cell in row if cell != 0]
+        self.assertEqual(sorted(coins), ['a', 'computer'])
+        self.assertEqual(session_1['player_num'], 'a')
+        self.assertEqual(session_1['play_counter'], 2)
+
+    # Tests that the computer blocks a vertical threat
+    def test_computer_blocks_threat(self):
+        game = ConnectFourGame(controller, ai_time_budget=0.1)
+
+        session_1 = game.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "computer"})
+        for idx in range(3):
+            session_1['column'] = 7
+            game.update_game(session_1)
+            session_1 = game.read_game({'game_id': 1, 'session_id': session_1['session_id']})
+
+        self.assertEqual(session_1['status'], False)
+        self.assertEqual(session_1['board'][2][6], 'computer')
+
+    # Tests that sessions with a difficulty are answered by the Monte Carlo engine
+    def test_computer_with_difficulty_blocks_threat(self):
+        game = ConnectFourGame(controller, ai_time_budget=0.2, mcts_workers=1)
+
+        session_1 = game.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "computer",
+                                      'difficulty': "easy"})
+        # Start from two coins of the player in the first column and two of the computer far from them
+        position = ConnectFourBoard()
+        for col in (0, 0):
+            position.play(col, 0)
+        for col in (4, 6):
+            position.play(col, 1)
+        session_1['board'] = position.to_board(["a", "computer"])
+        session_1['column_heights'] = position.column_heights()
+        session_1['zobrist_hash'] = position.hash
+        session_1['play_counter'] = 4
+        session_1['column'] = 1
+        game.update_game(session_1)
+        session_1 = game.read_game({'game_id': 1, 'session_id': session_1['session_id']})
+
+        self.assertEqual(session_1['difficulty'], "easy")
+        self.assertEqual(session_1['status'], False)
+        self.assertEqual(session_1['board'][2][0], 'computer')
+
+
 class ConnectFourTestDeleteGame(unittest.TestCase):
 
     def testDelete(self):
@@ -0,0 +1,88 @@
+from pyarcade.Games.connect_four_ai import ConnectFourAI
+from pyarcade.Games.connect_four_board import ConnectFourBoard
+import random
+import time
+import unittest
+
+PLAYERS = ["a", "b"]
+
+
+class ConnectFourAITestMoves(unittest.TestCase):
+    # Tests that the engine completes its own line when it can
+    def test_takes_immediate_win(self):
+        board = [[0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0],
+                 [0, "a", "a", 0, 0, 0, 0],
+                 [0, "b", "b", "b", 0, "a", 0]]
+        position = ConnectFourBoard.from_board(board, PLAYERS)
+        ai = ConnectFourAI(time_budget=0.2)
+
+        self.assertIn(ai.best_move(position, 1), [0, 4])
+
+    # Tests that the engine blocks the opponent's only threat
+    def test_blocks_immediate_threat(self):
+        board = [[0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, "a"],
+                 [0, 0, 0, 0, 0, "b", "a"],
+                 [0, 0, 0, 0, "b", "b", "a"]]
+        position = ConnectFourBoard.from_board(board, PLAYERS)
+        ai = ConnectFourAI(time_budget=0.2)
+
+        self.assertEqual(ai.best_move(position, 1), 6)
+
+    # Tests that the engine only picks a column that still has room
+    def test_plays_legal_column(self):
+        position = ConnectFourBoard()
+        for col in [3, 2, 4]:
+            for idx in range(6):
+                position.play(col, (idx + col) % 2)
+        ai = ConnectFourAI(time_budget=0.2)
+
+        self.assertTrue(position.can_play(ai.best_move(position, 0)))
+
+    # Tests that the engine opens in the center column
+    def test_opens_in_center(self):
+        ai = ConnectFourAI(time_budget=0.2)
+
+        self.assertEqual(ai.best_move(ConnectFourBoard(), 0), 3)
+
+
+class ConnectFourAITestSearch(unittest.TestCase):
+    # Tests that a move comes back within the time budget
+    def test_respects_time_budget(self):
+        ai = ConnectFourAI(time_budget=0.1)
+        start = time.monotonic()
+        ai.best_move(ConnectFourBoard(), 0)
+
+        self.assertLess(time.monotonic() - start, 0.3)
+
+    # Tests that the transposition table never grows past its size
+    def test_table_is_bounded(self):
+        ai = ConnectFourAI(time_budget=0.1, table_size=128)
+        ai.best_move(ConnectFourBoard(), 0)
+
+        self.assertEqual(len(ai.table), 128)
+
+    # Tests that the engine beats a player picking random columns
+    def test_beats_random_player(self):
+        rng = random.Random(7)
+        ai = ConnectFourAI(time_budget=0.05)
+        for game in range(3):
+            position = ConnectFourBoard()
+            side = 0
+            winner = None
+            while winner is None and not position.is_full():
+                if side == 0:
+                    col = rng.choice([col for col in range(7) if position.can_play(col)])
+                else:
+                    col = ai.best_move(position, 1)
+                row = position.play(col, side)
+                if position.has_won_through(col, row, side):
+                    winner = side
+                side = 1 - side
+
+            self.assertEqual(winner, 1)
@@ -0,0 +1,88 @@
+from pyarcade.Games.connect_four_ai import ConnectFourAI
+from pyarcade.Games.connect_four_analysis import ConnectFourAnalyzer
+from pyarcade.Games.connect_four_board import ConnectFourBoard
+import unittest
+
+
+class ConnectFourAnalyzerTestScores(unittest.TestCase):
+    # Tests that the winning column gets a winning score and that ignoring the threat loses
+    def test_scores_winning_column(self):
+        analyzer = ConnectFourAnalyzer(depth=2)
+        position = ConnectFourBoard()
+        for idx in range(3):
+            position.play(0, 0)
+            position.play(6, 1)
+
+        scores = analyzer.analyze(position, 0)
+
+        self.assertEqual(len(scores), 7)
+        self.assertGreaterEqual(scores[0], ConnectFourAI.WIN_SCORE)
+        self.assertEqual(max(range(7), key=lambda col: scores[col]), 0)
+
+    # Tests that the opponent's threat has to be blocked
+    def test_scores_blocking_column(self):
+        analyzer = ConnectFourAnalyzer(depth=2)
+        position = ConnectFourBoard()
+        for idx in range(3):
+            position.play(2, 1)
+        position.play(4, 0)
+        position.play(5, 0)
+
+        scores = analyzer.analyze(position, 0)
+
+        self.assertGreater(scores[2], -ConnectFourAI.WIN_SCORE)
+        self.assertTrue(all(scores[col] <= -ConnectFourAI.WIN_SCORE for col in range(7) if col != 2))
+
+    # Tests that full columns have no score
+    def test_full_column_has_no_score(self):
+        analyzer = ConnectFourAnalyzer(depth=2)
+        position = ConnectFourBoard()
+        for idx in range(6):
+            position.play(3, idx % 2)
+
+        self.assertIsNone(analyzer.analyze(position, 0)[3])
+
+
+class ConnectFourAnalyzerTestCache(unittest.TestCase):
+    # Tests that a repeated position is answered from the cache
+    def test_hit_after_miss(self):
+        analyzer = ConnectFourAnalyzer(depth=2)
+        position = ConnectFourBoard()
+        position.play(3, 0)
+
+        first = analyzer.analyze(position, 1)
+        second = analyzer.analyze(position, 1)
+
+        self.assertEqual(first, second)
+        self.assertEqual(analyzer.stats(), {"hits": 1, "misses": 1, "size": 1, "capacity": 4096})
+
+    # Tests that a mirror image shares the cache entry and gets its scores mirrored
+    def test_mirror_is_a_hit(self):
+        analyzer = ConnectFourAnalyzer(depth=2)
+        position = ConnectFourBoard()
+        position.play(1, 0)
+        position.play(2, 1)
+
+        scores = analyzer.analyze(position, 0)
+        mirrored_scores = analyzer.analyze(position.mirror(), 0)
+
+        self.assertEqual(mirrored_scores, list(reversed(scores)))
+        self.assertEqual(analyzer.stats()["hits"], 1)
+
+    # Tests that the least recently used position is evicted first
+    def test_least_recently_used_is_evicted(self):
+        analyzer = ConnectFourAnalyzer(depth=1, cache_size=2)
+        positions = []
+        for col in range(3):
+            position = ConnectFourBoard()
+            position.play(col, 0)
+            positions.append(position)
+
+        analyzer.analyze(positions[0], 1)
+        analyzer.analyze(positions[1], 1)
+        analyzer.analyze(positions[0], 1)
+        analyzer.analyze(positions[2], 1)
+        analyzer.analyze(positions[0], 1)
+        analyzer.analyze(positions[1], 1)
+
+        self.assertEqual(analyzer.stats(), {"hits": 2, "misses": 4, "size": 2, "capacity": 2})
@@ -0,0 +1,103 @@
+from pyarcade.Games.connect_four import ConnectFourGame
+from pyarcade.Games.connect_four_batch import ConnectFourBatch, random_policy
+from tests.helpers import InMemoryController
+import numpy as np
+import unittest
+
+DRAW_SEQUENCE = [0, 0, 6, 0, 0, 6, 5, 1, 6, 4, 2, 2, 6, 0, 1, 3, 5, 6, 2, 6, 3,
+                 2, 5, 5, 1, 5, 0, 1, 4, 4, 3, 5, 4, 3, 2, 4, 3, 2, 4, 3, 1, 1]
+
+
+def play_scripted(batch, sequences):
+    for step in range(max(len(sequence) for sequence in sequences)):
+        batch.step([sequence[step] if step < len(sequence) else 0 for sequence in sequences])
+
+
+class ConnectFourBatchTestStep(unittest.TestCase):
+    # Tests that coins stack in each game and the turn alternates
+    def test_step_drops_coins(self):
+        batch = ConnectFourBatch(2)
+        batch.step([0, 3])
+        batch.step([0, 4])
+
+        self.assertEqual(batch.to_board(0, ["a", "b"])[5][0], "a")
+        self.assertEqual(batch.to_board(0, ["a", "b"])[4][0], "b")
+        self.assertEqual(batch.to_board(1, ["a", "b"])[5][4], "b")
+        self.assertEqual(batch.to_move.tolist(), [1, 1])
+        self.assertEqual(batch.moves.tolist(), [2, 2])
+
+    # Tests that a move into a full column places no coin but passes the turn
+    def test_full_column_passes_turn(self):
+        batch = ConnectFourBatch(1)
+        play_scripted(batch, [[2, 2, 2, 2, 2, 2]])
+        batch.step([2])
+
+        self.assertEqual(batch.moves.tolist(), [6])
+        self.assertEqual(batch.to_move.tolist(), [2])
+
+    # Tests that each kind of line ends its own game only
+    def test_wins(self):
+        batch = ConnectFourBatch(4)
+        play_scripted(batch, [[0, 1, 0, 1, 0, 1, 0],
+                              [1, 1, 2, 2, 3, 3, 4],
+                              [0, 1, 1, 2, 2, 3, 2, 3, 3, 6, 3],
+                              [6, 5, 5, 4, 4, 3, 4, 3, 3, 0, 3]])
+
+        self.assertEqual(batch.results.tolist(), [1, 1, 1, 1])
+
+    # Tests that the second player can win too and that finished games ignore later moves
+    def test_second_player_win(self):
+        batch = ConnectFourBatch(1)
+        play_scripted(batch, [[6, 0, 6, 0, 5, 0, 6, 0, 1, 1]])
+
+        self.assertEqual(batch.results.tolist(), [2])
+        self.assertEqual(batch.moves.tolist(), [8])
+
+    def test_draw(self):
+        batch = ConnectFourBatch(1)
+        play_scripted(batch, [DRAW_SEQUENCE])
+
+        self.assertEqual(batch.results.tolist(), [ConnectFourBatch.DRAW])
+        self.assertFalse(batch.legal_moves().any())
+
+    # Tests that random games all finish and only ever pick columns with room
+    def test_run_random_games(self):
+        batch = ConnectFourBatch(500)
+        results = batch.run(random_policy(np.random.default_rng(0)))
+
+        self.assertFalse((results == ConnectFourBatch.RUNNING).any())
+        self.assertTrue(((batch.moves >= 7) & (batch.moves <= 42)).all())
+
+
+class ConnectFourBatchTestMatchesGame(unittest.TestCase):
+    # Tests move by move that the batch and ConnectFourGame agree on board, winner and turn
+    def test_random_games_match_connect_four_game(self):
+        rng = np.random.default_rng(42)
+        games = 60
+        players = ["a", "b"]
+        sequences = rng.integers(0, 7, size=(games, 60))
+        # A few forced draws so that the draw rule is compared as well
+        sequences[:3, :len(DRAW_SEQUENCE)] = DRAW_SEQUENCE
+
+        batch = ConnectFourBatch(games)
+        game = ConnectFourGame(InMemoryController())
+        sessions = [game.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "b"}) for _ in range(games)]
+
+        for step in range(sequences.shape[1]):
+            running = batch.running()
+            batch.step(sequences[:, step])
+            for idx in np.flatnonzero(running):
+                session = game.read_game(sessions[idx])
+                session['column'] = int(sequences[idx, step]) + 1
+                session = game.update_game(session)
+
+                self.assertEqual(session['board'], batch.to_board(idx, players))
+                result = batch.results[idx]
+                if result == ConnectFourBatch.DRAW:
+                    self.assertEqual(session['player_num'], 3)
+                elif result != ConnectFourBatch.RUNNING:
+                    self.assertTrue(session['status'])
+                    self.assertEqual(session['player_num'], players[result - 1])
+                else:
+                    self.assertFalse(session['status'])
+                    self.assertEqual(session['player_num'], players[batch.to_move[idx] - 1])
@@ -0,0 +1,294 @@
+from pyarcade.Games.connect_four_board import ConnectFourBoard
+import unittest
+
+PLAYERS = ["a", "b"]
+
+
+class ConnectFourBoardTestConversion(unittest.TestCase):
+    # Tests that an empty board converts to an empty position and back
+    def test_empty_board_round_trip(self):
+        empty_board = [[0] * 7 for _ in range(6)]
+        position = ConnectFourBoard.from_board(empty_board, PLAYERS)
+
+        self.assertEqual(position.mask, 0)
+        self.assertEqual(position.to_board(PLAYERS), empty_board)
+
+    # Tests that the coins of both players survive a round trip through the bitboards
+    def test_board_round_trip(self):
+        board = [[0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, "b", 0, 0, 0],
+                 [0, 0, "b", "a", 0, 0, 0],
+                 [0, 0, "a", "b", "a", 0, "b"]]
+        position = ConnectFourBoard.from_board(board, PLAYERS)
+
+        self.assertEqual(position.to_board(PLAYERS), board)
+
+
+class ConnectFourBoardTestKeys(unittest.TestCase):
+    # Tests that the side to move is part of the key
+    def test_key_depends_on_side(self):
+        position = ConnectFourBoard()
+        position.play(2, 0)
+
+        self.assertNotEqual(position.key(0), position.key(1))
+
+    # Tests that mirroring a position twice gives it back
+    def test_mirror(self):
+        position = ConnectFourBoard()
+        position.play(0, 0)
+        position.play(1, 1)
+        position.play(1, 0)
+
+        mirrored = position.mirror()
+
+        self.assertEqual(mirrored.to_board(PLAYERS)[5][6], "a")
+        self.assertEqual(mirrored.to_board(PLAYERS)[4][5], "a")
+        self.assertEqual(mirrored.mirror().coins, position.coins)
+
+    # Tests that a position and its mirror image share a canonical key
+    def test_canonical_key(self):
+        position = ConnectFourBoard()
+        position.play(1, 0)
+        position.play(4, 1)
+
+        key, mirrored = position.canonical_key(0)
+        mirror_key, mirror_mirrored = position.mirror().canonical_key(0)
+
+        self.assertEqual(key, mirror_key)
+        self.assertNotEqual(mirrored, mirror_mirrored)
+
+
+class ConnectFourBoardTestPlay(unittest.TestCase):
+    # Tests that coins stack from the bottom of a column
+    def test_play_returns_landing_row(self):
+        position = ConnectFourBoard()
+
+        self.assertEqual(position.play(0, 0), 6)
+        self.assertEqual(position.play(0, 1), 5)
+        self.assertEqual(position.to_board(PLAYERS)[5][0], "a")
+        self.assertEqual(position.to_board(PLAYERS)[4][0], "b")
+
+    # Tests that a column with six coins can no longer be played
+    def test_full_column_cannot_be_played(self):
+        position = ConnectFourBoard()
+        for idx in range(6):
+            self.assertTrue(position.can_play(3))
+            position.play(3, idx % 2)
+
+        self.assertFalse(position.can_play(3))
+        self.assertTrue(position.can_play(2))
+
+    # Tests that the column heights count the coins stacked in each column
+    def test_column_heights(self):
+        board = [[0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, "b", 0, 0, 0],
+                 [0, 0, "b", "a", 0, 0, 0],
+                 [0, 0, "a", "b", "a", 0, "b"]]
+        position = ConnectFourBoard.from_board(board, PLAYERS)
+
+        self.assertEqual(position.column_heights(), [0, 0, 2, 3, 1, 0, 1])
+
+    # Tests that a board is only full once all 42 cells hold a coin
+    def test_is_full(self):
+        position = ConnectFourBoard()
+        for col in range(7):
+            for row in range(6):
+                self.assertFalse(position.is_full())
+                position.play(col, (row + col // 2) % 2)
+
+        self.assertTrue(position.is_full())
+
+
+class ConnectFourBoardTestWins(unittest.TestCase):
+    def test_vertical_win(self):
+        position = ConnectFourBoard()
+        for idx in range(3):
+            position.play(0, 0)
+            self.assertFalse(position.has_won(0))
+        position.play(0, 0)
+
+        self.assertTrue(position.has_won(0))
+        self.assertFalse(position.has_won(1))
+
+    def test_horizontal_win(self):
+        position = ConnectFourBoard()
+        for col in range(3, 7):
+            self.assertFalse(position.has_won(1))
+            position.play(col, 1)
+
+        self.assertTrue(position.has_won(1))
+
+    def test_right_diagonal_win(self):
+        board = [[0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, "a", 0, 0, 0],
+                 [0, 0, "a", "b", 0, 0, 0],
+                 [0, "a", "b", "b", 0, 0, 0],
+                 ["a", "b", "a", "b", 0, 0, 0]]
+        position = ConnectFourBoard.from_board(board, PLAYERS)
+
+        self.assertTrue(position.has_won(0))
+        self.assertFalse(position.has_won(1))
+
+    def test_left_diagonal_win(self):
+        board = [[0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, "b", 0, 0, 0],
+                 [0, 0, 0, "a", "b", 0, 0],
+                 [0, 0, 0, "a", "a", "b", 0],
+                 [0, 0, 0, "a", "a", "b", "b"]]
+        position = ConnectFourBoard.from_board(board, PLAYERS)
+
+        self.assertTrue(position.has_won(1))
+        self.assertFalse(position.has_won(0))
+
+    # Tests that a run wrapping from the top of one column to the bottom of the next is not a win
+    def test_no_win_across_columns(self):
+        position = ConnectFourBoard()
+        for idx in range(4):
+            position.play(0, 1)
+        position.play(0, 0)
+        position.play(0, 0)
+        position.play(1, 0)
+        position.play(1, 0)
+
+        self.assertFalse(position.has_won(0))
+
+
+
+class ConnectFourBoardTestWinsThroughCoin(unittest.TestCase):
+    # Tests that a coin completing a line in the middle of the run is detected
+    def test_coin_filling_gap_in_horizontal(self):
+        position = ConnectFourBoard()
+        position.play(1, 0)
+        position.play(2, 0)
+        position.play(4, 0)
+        row = position.play(3, 0)
+
+        self.assertTrue(position.has_won_through(3, row, 0))
+
+    def test_coin_on_top_of_vertical(self):
+        position = ConnectFourBoard()
+        for idx in range(3):
+            position.play(6, 1)
+        row = position.play(6, 1)
+
+        self.assertEqual(row, 3)
+        self.assertTrue(position.has_won_through(6, row, 1))
+
+    def test_coin_in_both_diagonals(self):
+        board = [[0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 0, 0],
+                 [0, "a", 0, 0, 0, "a", 0],
+                 [0, "b", "a", 0, "a", "b", 0],
+                 [0, "b", "b", 0, "b", "b", 0],
+                 ["a", "b", "a", "b", "a", "b", "a"]]
+        position = ConnectFourBoard.from_board(board, PLAYERS)
+        row = position.play(3, 0)
+
+        self.assertTrue(position.has_won_through(3, row, 0))
+
+    # Tests that only lines through the given coin are looked at
+    def test_other_lines_are_ignored(self):
+        position = ConnectFourBoard()
+        for col in range(4):
+            position.play(col, 0)
+        row = position.play(6, 0)
+
+        self.assertTrue(position.has_won(0))
+        self.assertFalse(position.has_won_through(6, row, 0))
+
+    # Tests that three in a row is not reported as a win
+    def test_three_is_not_a_win(self):
+        position = ConnectFourBoard()
+        position.play(0, 0)
+        position.play(1, 0)
+        row = position.play(2, 0)
+
+        self.assertFalse(position.has_won_through(2, row, 0))
+
+
+class ConnectFourBoardTestConnectN(unittest.TestCase):
+    # Tests that the size of the position is taken from the board
+    def test_board_round_trip(self):
+        board = [[0] * 9 for _ in range(10)]
+        board[9][8] = "a"
+        board[8][8] = "b"
+        position = ConnectFourBoard.from_board(board, PLAYERS, 5)
+
+        self.assertEqual((position.width, position.height, position.run_length), (9, 10, 5))
+        self.assertEqual(position.column_heights(), [0] * 8 + [2])
+        self.assertEqual(position.to_board(PLAYERS), board)
+        self.assertFalse(position.is_standard())
+
+    # Tests that a column of a tall board is full after height coins
+    def test_tall_column(self):
+        position = ConnectFourBoard(9, 10, 5)
+        for idx in range(10):
+            self.assertEqual(position.play(4, idx % 2), 10 - idx)
+
+        self.assertFalse(position.can_play(4))
+
+    # Tests that four in a row does not win connect-5 but five does, in every direction
+    def test_connect_five(self):
+        lines = [[(col, 0) for col in range(5)],
+                 [(8, row) for row in range(5)],
+                 [(idx, idx) for idx in range(5)],
+                 [(8 - idx, idx) for idx in range(5)]]
+        for line in lines:
+            position = ConnectFourBoard(9, 10, 5)
+            for col, row in line:
+                self.assertFalse(position.has_won(0))
+                # Fill the cells below with the other side's coins
+                while position.column_heights()[col] < row:
+                    position.play(col, 1)
+                landed = position.play(col, 0)
+                self.assertEqual(landed, 10 - row)
+
+            self.assertTrue(position.has_won_through(col, landed, 0))
+            self.assertTrue(position.has_won(0))
+            self.assertFalse(position.has_won(1))
+
+    # Tests that a run longer than run_length still wins
+    def test_run_of_three(self):
+        position = ConnectFourBoard(5, 4, 3)
+        position.play(0, 0)
+        position.play(2, 0)
+        row = position.play(1, 0)
+
+        self.assertTrue(position.has_won_through(1, row, 0))
+        self.assertTrue(position.has_won(0))
+
+
+class ConnectFourBoardTestZobristHash(unittest.TestCase):
+    # Tests that the hash kept while playing equals the hash of the board
+    def test_hash_follows_moves(self):
+        position = ConnectFourBoard()
+        for col in [3, 3, 2, 4, 6, 1, 3]:
+            position.play(col, col % 2)
+
+        self.assertEqual(position.hash, ConnectFourBoard.from_board(position.to_board(PLAYERS), PLAYERS).hash)
+        self.assertEqual(position.hash, position.mirror().mirror().hash)
+        self.assertNotEqual(position.hash, position.mirror().hash)
+
+    # Tests that the order of the moves does not change the hash
+    def test_transpositions_share_hash(self):
+        first = ConnectFourBoard()
+        second = ConnectFourBoard()
+        for col, side in [(0, 0), (1, 1), (2, 0), (3, 1)]:
+            first.play(col, side)
+        for col, side in [(2, 0), (3, 1), (0, 0), (1, 1)]:
+            second.play(col, side)
+
+        self.assertEqual(first.hash, second.hash)
+
+    # Tests that a hash stored with the board is used as it is
+    def test_stored_hash_is_trusted(self):
+        empty_board = [[0] * 7 for _ in range(6)]
+
+        self.assertEqual(ConnectFourBoard.from_board(empty_board, PLAYERS, zobrist_hash=12345).hash, 12345)
+        self.assertEqual(ConnectFourBoard.from_board(empty_board, PLAYERS).hash, 0)
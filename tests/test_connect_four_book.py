@@ -0,0 +1,73 @@
+from pyarcade.Games.connect_four_ai import ConnectFourAI
+from pyarcade.Games.connect_four_board import ConnectFourBoard
+from pyarcade.Games.connect_four_book import ConnectFourOpeningBook, build_opening_book
+import os
+import tempfile
+import unittest
+
+
+class ConnectFourOpeningBookTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'book.bin')
+        self.positions = build_opening_book(self.path, 2, 2)
+        self.book = ConnectFourOpeningBook(self.path)
+
+    def tearDown(self):
+        self.book.close()
+        self.directory.cleanup()
+
+    # Tests that mirror images are stored once: 1 empty board, 4 first moves and 25 second moves
+    def test_build_stores_canonical_positions(self):
+        self.assertEqual(self.positions, 30)
+        self.assertEqual(self.book.size, 30)
+        self.assertEqual(self.book.plies, 2)
+
+    # Tests that every record holds the same result as a search of that position
+    def test_lookup_matches_search(self):
+        ai = ConnectFourAI(time_budget=float('inf'))
+        for first_col in range(7):
+            for second_col in range(7):
+                position = ConnectFourBoard()
+                position.play(first_col, 0)
+                position.play(second_col, 1)
+
+                col, score = self.book.lookup(position, 0)
+
+                self.assertEqual(score, ai.search(position, 0, max_depth=2)[1])
+                self.assertTrue(position.can_play(col))
+
+    # Tests that a position and its mirror image get mirrored columns
+    def test_lookup_mirrors_column(self):
+        position = ConnectFourBoard()
+        position.play(0, 0)
+
+        col, score = self.book.lookup(position, 1)
+        mirror_col, mirror_score = self.book.lookup(position.mirror(), 1)
+
+        self.assertEqual(mirror_col, 6 - col)
+        self.assertEqual(mirror_score, score)
+
+    # Tests that positions deeper than the book are not found
+    def test_lookup_outside_book(self):
+        position = ConnectFourBoard()
+        for col in range(3):
+            position.play(col, col % 2)
+
+        self.assertIsNone(self.book.lookup(position, 1))
+
+    # Tests that the engine plays the book move without searching
+    def test_ai_uses_book(self):
+        position = ConnectFourBoard()
+        position.play(3, 0)
+        ai = ConnectFourAI(time_budget=0, opening_book=self.book)
+
+        self.assertEqual(ai.best_move(position, 1), self.book.lookup(position, 1)[0])
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self.directory.name, 'other.bin')
+        with open(path, 'wb') as other_file:
+            other_file.write(b'not a book at all')
+
+        with self.assertRaises(Exception):
+            ConnectFourOpeningBook(path)
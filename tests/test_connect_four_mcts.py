@@ -0,0 +1,83 @@
+from pyarcade.Games.connect_four_board import ConnectFourBoard
+from pyarcade.Games.connect_four_mcts import ConnectFourMCTS, run_playouts
+import unittest
+
+
+class ConnectFourMCTSTestMoves(unittest.TestCase):
+    # Tests that the engine completes its own line of four without searching
+    def test_takes_immediate_win(self):
+        mcts = ConnectFourMCTS(time_budget=0.1, workers=1)
+        mcts.search = None
+        position = ConnectFourBoard()
+        for col in (2, 3, 4):
+            position.play(col, 1)
+            position.play(col, 0)
+
+        self.assertIn(mcts.best_move(position, 1, 'easy'), (1, 5))
+
+    # Tests that the engine blocks a vertical threat of the opponent without searching
+    def test_blocks_threat(self):
+        mcts = ConnectFourMCTS(time_budget=0.2, workers=1)
+        mcts.search = None
+        position = ConnectFourBoard()
+        for idx in range(3):
+            position.play(6, 0)
+        position.play(3, 1)
+        position.play(2, 1)
+
+        self.assertEqual(mcts.best_move(position, 1, 'easy'), 6)
+
+    # Tests that winning at once comes before blocking the opponent
+    def test_prefers_win_over_block(self):
+        mcts = ConnectFourMCTS(time_budget=0.1, workers=1)
+        position = ConnectFourBoard()
+        for idx in range(3):
+            position.play(6, 0)
+            position.play(0, 1)
+
+        self.assertEqual(mcts.best_move(position, 1, 'easy'), 0)
+
+    # Tests that full columns are never chosen
+    def test_plays_legal_move(self):
+        mcts = ConnectFourMCTS(time_budget=0.05, workers=1)
+        position = ConnectFourBoard()
+        for col in range(6):
+            for row in range(6):
+                position.play(col, (row + col // 2) % 2)
+
+        self.assertEqual(mcts.best_move(position, 0, 'easy'), 6)
+
+
+class ConnectFourMCTSTestWorkers(unittest.TestCase):
+    # Tests that harder levels use more of the workers
+    def test_workers_for_difficulty(self):
+        mcts = ConnectFourMCTS(workers=8)
+
+        self.assertEqual(mcts.workers_for('easy'), 1)
+        self.assertEqual(mcts.workers_for('medium'), 4)
+        self.assertEqual(mcts.workers_for('hard'), 8)
+        self.assertRaises(Exception, mcts.workers_for, 'impossible')
+
+    # Tests that the root statistics of every worker process are added up
+    def test_search_merges_workers(self):
+        mcts = ConnectFourMCTS(time_budget=0.1, workers=2)
+        try:
+            visits, wins = mcts.search(ConnectFourBoard(), 0, 2)
+        finally:
+            mcts.close()
+
+        # Each of the two trees visits every column of the root at least once
+        self.assertEqual(len(visits), 7)
+        self.assertTrue(all(visits[col] >= 2 for col in range(7)))
+        self.assertTrue(all(0 <= wins[col] <= visits[col] for col in range(7)))
+
+    # Tests that a worker's tree only counts the columns that can be played
+    def test_run_playouts_skips_full_columns(self):
+        position = ConnectFourBoard()
+        for row in range(6):
+            position.play(0, row % 2)
+
+        visits, wins = run_playouts(position.coins[0], position.mask, 6, 0.05, 1.4, 7)
+
+        self.assertEqual(visits[0], 0)
+        self.assertTrue(all(visits[col] > 0 for col in range(1, 7)))
@@ -75,6 +75,47 @@ class ConnectFourProxyTests(unittest.TestCase):
 
         self.assertEqual(ConnectFourProxy.INVALID_INPUT, create_game_info)
 
+    # Tests that only the known difficulty levels are accepted
+    def test_create_game_unknown_difficulty(self):
+        game = ConnectFourGame(controller)
+        proxy = ConnectFourProxy(game)
+
+        create_game_info = proxy.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "computer",
+                                              'difficulty': "impossible"})
+
+        self.assertEqual(ConnectFourProxy.INVALID_INPUT, create_game_info)
+
+    # Tests that board sizes outside the supported range are rejected
+    def test_create_game_invalid_board_size(self):
+        game = ConnectFourGame(controller)
+        proxy = ConnectFourProxy(game)
+
+        too_wide = proxy.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "b", 'width': 21})
+        run_too_long = proxy.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "b",
+                                          'width': 9, 'height': 10, 'run_length': 11})
+        against_computer = proxy.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "computer",
+                                              'width': 9, 'height': 10, 'run_length': 5})
+
+        self.assertEqual(ConnectFourProxy.INVALID_INPUT, too_wide)
+        self.assertEqual(ConnectFourProxy.INVALID_INPUT, run_too_long)
+        self.assertEqual(ConnectFourProxy.INVALID_INPUT, against_computer)
+
+    # Tests that the columns accepted follow the width of the session
+    def test_update_column_checked_against_width(self):
+        game = ConnectFourGame(controller)
+        proxy = ConnectFourProxy(game)
+
+        session_1 = proxy.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "b",
+                                       'width': 9, 'height': 10, 'run_length': 5})
+        session_1['column'] = 10
+        res = proxy.update_game(session_1)
+        self.assertEqual(ConnectFourProxy.INVALID_INPUT, res)
+
+        session_1['column'] = 9
+        proxy.update_game(session_1)
+        session_1 = proxy.read_game({'game_id': 1, 'session_id': session_1['session_id']})
+        self.assertEqual(session_1['board'][9][8], "a")
+
     def test_create_game_gives_unique_sequence(self):
         session_ids = []
         game = ConnectFourGame(controller)
@@ -115,6 +156,28 @@ class ConnectFourProxyTests(unittest.TestCase):
 
         self.assertEqual(ConnectFourProxy.INVALID_INPUT, res)
 
+    # Tests that analyzing requires a session id
+    def test_analyze_without_session_id(self):
+        game = ConnectFourGame(controller)
+        proxy = ConnectFourProxy(game)
+
+        res = proxy.analyze_game({'game_id': 1})
+
+        self.assertEqual(ConnectFourProxy.INVALID_INPUT, res)
+
+    # Tests that nobody can move on behalf of the computer opponent
+    def test_update_as_computer(self):
+        game = ConnectFourGame(controller)
+        proxy = ConnectFourProxy(game)
+
+        session_1 = proxy.create_game({'game_id': 1, 'user_id': "a", 'opponent_id': "computer"})
+
+        session_1['column'] = 1
+        session_1['player_num'] = 'computer'
+        res = proxy.update_game(session_1)
+
+        self.assertEqual(ConnectFourProxy.INVALID_INPUT, res)
+
     def test_read_and_update_game_1(self):
         game = ConnectFourGame(controller)
         proxy = ConnectFourProxy(game)
@@ -0,0 +1,191 @@
+from pyarcade.dynamodb.leaderboard import Leaderboard, Leaderboards, TopScores
+from tests.helpers import InMemoryController
+import random
+import unittest
+from unittest import mock
+
+
+# A controller where another worker records a score right after the first read of the list
+class RacingController(InMemoryController):
+    def __init__(self):
+        super().__init__()
+        self.other_worker = Leaderboard(self, 0, cache_ttl=0)
+        self.raced = False
+
+    def find_game_session(self, json_data):
+        item = super().find_game_session(json_data)
+        if not self.raced:
+            self.raced = True
+            self.other_worker.record(5, "other")
+        return item
+
+
+class LeaderboardTest(unittest.TestCase):
+    # Tests that a list nobody has scored in yet is empty
+    def test_empty(self):
+        leaderboard = Leaderboard(InMemoryController(), 0, size=3)
+
+        self.assertEqual(leaderboard.top(), ())
+
+    # Tests that scores are kept fewest moves first, equal scores in the order they came, up to the size
+    def test_record_keeps_best(self):
+        leaderboard = Leaderboard(InMemoryController(), 0, size=3)
+
+        self.assertTrue(leaderboard.record(7, "a"))
+        self.assertTrue(leaderboard.record(4, "b"))
+        self.assertTrue(leaderboard.record(7, "c"))
+        self.assertTrue(leaderboard.record(5, "d"))
+        self.assertFalse(leaderboard.record(7, "e"))
+
+        self.assertEqual(leaderboard.top(), ((4, "b"), (5, "d"), (7, "a")))
+
+    # Tests that a player is listed once, with their best score
+    def test_record_keeps_best_of_each_player(self):
+        leaderboard = Leaderboard(InMemoryController(), 0, size=3)
+
+        self.assertTrue(leaderboard.record(7, "a"))
+        self.assertTrue(leaderboard.record(6, "b"))
+        self.assertFalse(leaderboard.record(8, "a"))
+        self.assertTrue(leaderboard.record(5, "a"))
+
+        self.assertEqual(leaderboard.top(), ((5, "a"), (6, "b")))
+
+    # Tests that workers sharing the table see each other's scores once their cached copy expires
+    def test_shared_by_workers(self):
+        controller = InMemoryController()
+        first = Leaderboard(controller, 0, cache_ttl=60)
+        second = Leaderboard(controller, 0, cache_ttl=0)
+
+        first.top()
+        second.record(3, "b")
+
+        self.assertEqual(first.top(), ())
+        self.assertEqual(second.top()[0], (3, "b"))
+        first.cached_at -= 60
+        self.assertEqual(first.top()[0], (3, "b"))
+
+    # Tests that reads within the time to live do not query the table
+    def test_reads_are_cached(self):
+        controller = InMemoryController()
+        leaderboard = Leaderboard(controller, 0, cache_ttl=60)
+        leaderboard.record(3, "a")
+
+        with mock.patch.object(controller, 'find_game_session', wraps=controller.find_game_session) as find:
+            for _ in range(5):
+                self.assertEqual(leaderboard.top()[0], (3, "a"))
+
+        self.assertEqual(find.call_count, 0)
+
+    # Tests that a write losing a race with another worker is merged again instead of overwriting
+    def test_concurrent_record_is_merged(self):
+        controller = RacingController()
+        leaderboard = Leaderboard(controller, 0, cache_ttl=0)
+
+        self.assertTrue(leaderboard.record(4, "mine"))
+
+        self.assertEqual(leaderboard.top(), ((4, "mine"), (5, "other")))
+
+
+# A clock that can be moved forward, starting on Wednesday 2021-03-03 at 23:00 UTC
+class Clock:
+    def __init__(self):
+        self.now = 1614812400.0
+
+    def __call__(self):
+        return self.now
+
+
+class PeriodLeaderboardTest(unittest.TestCase):
+    # Tests that a daily list starts empty on a new day while the old day's item is left to expire
+    def test_daily_rollover(self):
+        controller = InMemoryController()
+        clock = Clock()
+        leaderboard = Leaderboard(controller, 0, cache_ttl=60, period='daily', clock=clock)
+        leaderboard.record(4, "a")
+
+        item = controller.find_game_session({'game_id': 0, 'session_id': 'leaderboard#daily#2021-03-03'})
+        self.assertEqual(item[Leaderboard.EXPIRES_AT_KEY], 1614816000)
+        self.assertEqual(leaderboard.top(), ((4, "a"),))
+
+        clock.now += 3600
+        self.assertEqual(leaderboard.top(), ())
+        leaderboard.record(6, "b")
+        self.assertEqual(leaderboard.top(), ((6, "b"),))
+
+    # Tests that weeks start on Monday
+    def test_weekly_bucket(self):
+        controller = InMemoryController()
+        clock = Clock()
+        Leaderboard(controller, 0, period='weekly', clock=clock).record(4, "a")
+
+        item = controller.find_game_session({'game_id': 0, 'session_id': 'leaderboard#weekly#2021-03-01'})
+        self.assertEqual(item[Leaderboard.EXPIRES_AT_KEY], 1615161600)
+
+    # Tests that a win is merged into every list and a new day only empties the daily one
+    def test_leaderboards(self):
+        clock = Clock()
+        leaderboards = Leaderboards(InMemoryController(), 0, cache_ttl=0, clock=clock)
+
+        self.assertTrue(leaderboards.record(4, "a"))
+        self.assertEqual(leaderboards.top(), {'scores': ((4, "a"),), 'daily': ((4, "a"),), 'weekly': ((4, "a"),)})
+
+        clock.now += 3600
+        self.assertTrue(leaderboards.record(5, "a"))
+        self.assertEqual(leaderboards.top(), {'scores': ((4, "a"),), 'daily': ((5, "a"),), 'weekly': ((4, "a"),)})
+
+    def test_unknown_period(self):
+        with self.assertRaises(Exception):
+            Leaderboard(InMemoryController(), 0, period='monthly')
+
+
+class TopScoresTest(unittest.TestCase):
+    # Tests that a player who drops off a full list can come back with a better score
+    def test_evicted_player_returns(self):
+        scores = TopScores(2, [(3, "a"), (4, "b")])
+
+        self.assertTrue(scores.add(2, "c"))
+        self.assertEqual(scores.top(), ((2, "c"), (3, "a")))
+        self.assertFalse(scores.add(5, "b"))
+        self.assertTrue(scores.add(1, "b"))
+        self.assertEqual(scores.top(), ((1, "b"), (2, "c")))
+
+    # Tests that a player tying their own best keeps the place they already had
+    def test_tie_with_own_best(self):
+        scores = TopScores(3, [(3, "a"), (3, "b")])
+
+        self.assertFalse(scores.add(3, "a"))
+        self.assertEqual(scores.top(), ((3, "a"), (3, "b")))
+
+    # Tests that a long list agrees with sorting every player's best score
+    def test_matches_sorting(self):
+        rng = random.Random(5)
+        scores = TopScores(50)
+        best = {}
+        for _ in range(2000):
+            score, name = rng.randrange(100), rng.randrange(200)
+            scores.add(score, name)
+            best[name] = min(score, best.get(name, score))
+
+        self.assertEqual([score for score, name in scores.top()], sorted(best.values())[:50])
+        self.assertTrue(all(best[name] == score for score, name in scores.top()))
+
+    # Tests that reads return the same snapshot until the list changes
+    def test_snapshot(self):
+        scores = TopScores(3, [(3, "a")])
+        snapshot = scores.top()
+
+        self.assertIs(scores.top(), snapshot)
+        scores.add(2, "b")
+        self.assertIsNot(scores.top(), snapshot)
+
+    # Tests that the reported footprint follows the entries held and stops growing at the size
+    def test_stats(self):
+        scores = TopScores(10)
+        empty = scores.stats()
+        for score in range(20):
+            scores.add(score, score)
+
+        self.assertEqual(empty['size'], 0)
+        self.assertEqual(scores.stats()['size'], 10)
+        self.assertEqual(scores.stats()['capacity'], 10)
+        self.assertGreater(scores.stats()['bytes'], empty['bytes'])
@@ -1,4 +1,5 @@
 from pyarcade.Games.mancala import MancalaGame
+from pyarcade.Games.zobrist import mancala_hash
 import unittest
 from configparser import ConfigParser
 import os
@@ -127,7 +128,8 @@ class MancalaTestReadGame(unittest.TestCase):
                               'game_over': session2_read['status'], 'scores': session2_read['score']}
         self.assertEqual(check_session_two, session2_read_info)
 
-    # Tests that the scores of read_game changes per update_game
+    # Tests that the scores of read_game changes per update_game. The second move skips b's mancala and ends in an
+    # empty hole, capturing the 4 stones across from it
     def test_read_game_scores_is_updated_properly(self):
         game = MancalaGame(controller)
 
@@ -143,7 +145,7 @@ class MancalaTestReadGame(unittest.TestCase):
         game_score['a'] = int(game_score['a'])
         game_score['b'] = int(game_score['b'])
 
-        current_score = {'a': 3, 'b': 2}
+        current_score = {'a': 7, 'b': 1}
 
         self.assertEqual(current_score, game_score)
 
@@ -162,15 +164,16 @@ class MancalaTestUpdateGame(unittest.TestCase):
                                        [4, 4, 4, 4, 4, 4, 0]]
         self.assertEqual(update1['board'], correct_board_after_update1)
 
-    # Test that update game makes a valid move that requires placing a stone in the upper mancala and then moving down.
+    # Test that update game makes a valid move that passes the opponent's upper mancala, skipping it, and then moves
+    # down.
     def test_update_game_upper_row_goes_counter_clockwise_passing_through_upper_mancala(self):
         game = MancalaGame(controller)
 
         session_id = game.create_game({'game_id': 2, 'user_id': "a", 'opponent_id': "b"})['session_id']
         game.update_game({'session_id': session_id, 'row': 0, 'column': 2, 'player_num': 'a'})
         update_info = game.read_game({'game_id': 2, 'session_id': session_id})
-        correct_board_after_update = [[1, 5, 0, 4, 4, 4, 4],
-                                      [5, 5, 4, 4, 4, 4, 0]]
+        correct_board_after_update = [[0, 5, 0, 4, 4, 4, 4],
+                                      [5, 5, 5, 4, 4, 4, 0]]
         self.assertEqual(update_info['board'], correct_board_after_update)
 
     # Test that update game goes counter-clockwise when making an bottom row move while placing only one stone in each
@@ -230,6 +233,113 @@ class MancalaTestUpdateGame(unittest.TestCase):
         # Tests that an end state is encountered after an update to a board
 
 
+class MancalaTestZobristHash(unittest.TestCase):
+
+    # Tests that the Zobrist hash stored with the session follows the board
+    def test_update_game_keeps_zobrist_hash(self):
+        game = MancalaGame(controller)
+
+        session_id = game.create_game({'game_id': 2, 'user_id': "a", 'opponent_id': "b"})['session_id']
+        game.update_game({'session_id': session_id, 'row': 1, 'column': 2, 'player_num': 'a'})
+        game.update_game({'session_id': session_id, 'row': 1, 'column': 5, 'player_num': 'a'})
+        session = game.read_game({'game_id': 2, 'session_id': session_id})
+
+        self.assertEqual(int(session['zobrist_hash']), mancala_hash(session['board']))
+
+
+class MancalaTestSubmittedSession(unittest.TestCase):
+
+    # Tests that a move sent with the session that was read is played on it and bumps the version
+    def test_update_game_with_submitted_session(self):
+        game = MancalaGame(controller)
+
+        session_id = game.create_game({'game_id': 2, 'user_id': "a", 'opponent_id': "b"})['session_id']
+        session = game.read_game({'game_id': 2, 'session_id': session_id})
+        session.update({'row': 1, 'column': 0, 'player_num': 'a'})
+        game.update_game(session)
+        session = game.read_game({'game_id': 2, 'session_id': session_id})
+
+        self.assertEqual(session['board'], [[0, 4, 4, 4, 4, 4, 4],
+                                            [0, 5, 5, 5, 5, 4, 0]])
+        self.assertEqual(int(session['version']), 1)
+        self.assertEqual(session['next_player'], 'b')
+        self.assertNotIn('row', session)
+
+    # Tests that a move sent with a session that has changed since it was read is rejected
+    def test_update_game_rejects_stale_version(self):
+        game = MancalaGame(controller)
+
+        session_id = game.create_game({'game_id': 2, 'user_id': "a", 'opponent_id': "b"})['session_id']
+        stale_session = game.read_game({'game_id': 2, 'session_id': session_id})
+        game.update_game({'session_id': session_id, 'row': 1, 'column': 0, 'player_num': 'a'})
+        stale_session.update({'row': 1, 'column': 2, 'player_num': 'a'})
+        reply = game.update_game(stale_session)
+        session = game.read_game({'game_id': 2, 'session_id': session_id})
+
+        self.assertEqual(reply, {'session_id': 0, 'stale': True})
+        self.assertEqual(session['board'], [[0, 4, 4, 4, 4, 4, 4],
+                                            [0, 5, 5, 5, 5, 4, 0]])
+
+    # Tests that a move sent with a board other than the stored one is rejected
+    def test_update_game_rejects_changed_board(self):
+        game = MancalaGame(controller)
+
+        session_id = game.create_game({'game_id': 2, 'user_id': "a", 'opponent_id': "b"})['session_id']
+        session = game.read_game({'game_id': 2, 'session_id': session_id})
+        session['board'] = [[0, 4, 4, 4, 4, 4, 4],
+                            [9, 4, 4, 4, 4, 4, 0]]
+        session.update({'row': 1, 'column': 0, 'player_num': 'a'})
+        reply = game.update_game(session)
+
+        self.assertEqual(reply, {'session_id': 0, 'stale': True})
+
+
+class MancalaTestComputerOpponent(unittest.TestCase):
+
+    # Tests that the computer answers a move before the session is saved and hands the turn back
+    def test_computer_replies_to_move(self):
+        game = MancalaGame(controller, ai_time_budget=0.1)
+
+        session_id = game.create_game({'game_id': 2, 'user_id': "a", 'opponent_id': "computer"})['session_id']
+        game.update_game({'session_id': session_id, 'row': 1, 'column': 0, 'player_num': 'a'})
+        session = game.read_game({'game_id': 2, 'session_id': session_id})
+
+        self.assertNotEqual(session['board'][0], [0, 4, 4, 4, 4, 4, 4])
+        self.assertEqual(session['next_player'], 'a')
+        self.assertGreater(int(session['play_counter']), 1)
+        self.assertEqual(int(session['zobrist_hash']), mancala_hash(session['board']))
+
+    # Tests that the computer does not move while the human player has another turn
+    def test_computer_waits_for_extra_turn(self):
+        game = MancalaGame(controller, ai_time_budget=0.1)
+
+        session_id = game.create_game({'game_id': 2, 'user_id': "a", 'opponent_id': "computer"})['session_id']
+        game.update_game({'session_id': session_id, 'row': 1, 'column': 2, 'player_num': 'a'})
+        session = game.read_game({'game_id': 2, 'session_id': session_id})
+
+        self.assertEqual(session['board'], [[0, 4, 4, 4, 4, 4, 4],
+                                            [4, 4, 0, 5, 5, 5, 1]])
+        self.assertEqual(session['next_player'], 'a')
+
+
+class MancalaTestHint(unittest.TestCase):
+
+    # Tests that a hint suggests a hole of the player to move that holds stones
+    def test_hint_game_suggests_own_hole(self):
+        game = MancalaGame(controller, ai_time_budget=0.1)
+
+        session_id = game.create_game({'game_id': 2, 'user_id': "a", 'opponent_id': "b"})['session_id']
+        game.update_game({'session_id': session_id, 'row': 1, 'column': 0, 'player_num': 'a'})
+        hint = game.hint_game({'game_id': 2, 'session_id': session_id})
+        board = game.read_game({'game_id': 2, 'session_id': session_id})['board']
+
+        self.assertEqual(hint['session_id'], session_id)
+        self.assertEqual(hint['row'], 0)
+        self.assertIn(hint['column'], range(1, 7))
+        self.assertGreater(board[hint['row']][hint['column']], 0)
+        self.assertIsNone(hint['margin'])
+
+
 class MancalaTestDeleteGame(unittest.TestCase):
 
     # Tests that delete_game deletes the proper session
@@ -0,0 +1,101 @@
+from pyarcade.Games.mancala_ai import MancalaAI
+from pyarcade.Games.mancala_board import MancalaBoard
+import random
+import time
+import unittest
+
+
+# Plain minimax over the whole game tree, scored like MancalaAI scores finished games
+def solve(position: MancalaBoard, side: int) -> int:
+    if position.is_over()[0]:
+        scores = position.get_scores()
+        difference = scores[side] - scores[1 - side]
+        if difference == 0:
+            return 0
+        return difference + (MancalaAI.WIN_SCORE if difference > 0 else -MancalaAI.WIN_SCORE)
+    best = -float('inf')
+    for slot in position.moves(side):
+        child = position.copy()
+        if child.play(slot, side):
+            best = max(best, solve(child, side))
+        else:
+            best = max(best, -solve(child, 1 - side))
+    return best
+
+
+class MancalaAITestMoves(unittest.TestCase):
+    # Tests that the engine takes the move that captures the big pile across the board
+    def test_takes_capture(self):
+        position = MancalaBoard.from_board([[5, 1, 1, 1, 10, 1, 1],
+                                            [0, 0, 1, 0, 0, 2, 10]])
+        ai = MancalaAI(time_budget=0.2)
+
+        self.assertEqual(ai.best_move(position, 0), 2)
+
+    # Tests that the engine uses a move ending in its own mancala before others
+    def test_takes_extra_turn(self):
+        position = MancalaBoard.from_board([[20, 0, 0, 0, 0, 0, 1],
+                                            [0, 0, 0, 0, 2, 1, 20]])
+        ai = MancalaAI(time_budget=0.2)
+
+        self.assertEqual(ai.best_move(position, 0), 5)
+
+    # Tests that the engine only picks a pit of its own side that holds stones
+    def test_plays_legal_pit(self):
+        rng = random.Random(3)
+        ai = MancalaAI(time_budget=0.05)
+        for _ in range(5):
+            position = MancalaBoard()
+            side = 0
+            for _ in range(rng.randrange(10)):
+                if position.is_over()[0]:
+                    break
+                if not position.play(rng.choice(position.moves(side)), side):
+                    side = 1 - side
+            if position.is_over()[0]:
+                continue
+
+            self.assertIn(ai.best_move(position, side), position.moves(side))
+
+
+class MancalaAITestSearch(unittest.TestCase):
+    # Tests that a move comes back within the time budget
+    def test_respects_time_budget(self):
+        ai = MancalaAI(time_budget=0.1)
+        start = time.monotonic()
+        ai.best_move(MancalaBoard(), 0)
+
+        self.assertLess(time.monotonic() - start, 0.3)
+
+    # Tests that the search leaves the position and its hash untouched
+    def test_search_keeps_position(self):
+        position = MancalaBoard()
+        ai = MancalaAI(time_budget=0.05)
+        ai.best_move(position, 1)
+
+        self.assertEqual(position.to_board(), MancalaBoard().to_board())
+        self.assertEqual(position.hash, MancalaBoard().hash)
+
+    # Tests that the transposition table never grows past its size
+    def test_table_is_bounded(self):
+        ai = MancalaAI(time_budget=0.1, table_size=128)
+        ai.best_move(MancalaBoard(), 0)
+
+        self.assertEqual(len(ai.table), 128)
+
+    # Tests that endgames searched to the end get the score of a plain minimax search
+    def test_endgame_scores_match_minimax(self):
+        rng = random.Random(11)
+        ai = MancalaAI(time_budget=float('inf'))
+        for _ in range(10):
+            slots = [0] * MancalaBoard.SLOTS
+            for _ in range(4):
+                slots[rng.choice([0, 1, 2, 3, 4, 5, 7, 8, 9, 10, 11, 12])] += 1
+            slots[0] += 1
+            slots[7] += 1
+            position = MancalaBoard()
+            position.slots = slots
+            position = MancalaBoard.from_board(position.to_board())
+            side = rng.randrange(2)
+
+            self.assertEqual(ai.search(position, side)[1], solve(position, side))
@@ -0,0 +1,100 @@
+from pyarcade.Games.mancala import MancalaGame
+from pyarcade.Games.mancala_batch import MancalaBatch, random_policy
+from pyarcade.Games.mancala_board import MancalaBoard
+from tests.helpers import InMemoryController
+import numpy as np
+import unittest
+
+
+class MancalaBatchTestStep(unittest.TestCase):
+    # Tests that sowing drops one stone per hole and that ending in the own store keeps the turn
+    def test_step_sows_and_keeps_turn(self):
+        batch = MancalaBatch(2)
+        batch.step([2, 0])
+
+        self.assertEqual(batch.to_board(0), [[0, 4, 4, 4, 4, 4, 4],
+                                             [4, 4, 0, 5, 5, 5, 1]])
+        self.assertEqual(batch.to_board(1), [[0, 4, 4, 4, 4, 4, 4],
+                                             [0, 5, 5, 5, 5, 4, 0]])
+        self.assertEqual(batch.to_move.tolist(), [0, 1])
+        self.assertEqual(batch.moves.tolist(), [1, 1])
+
+    # Tests that the second side sows from its own row, skipping the first side's store
+    def test_second_side_skips_store(self):
+        batch = MancalaBatch(1)
+        batch.slots[0] = MancalaBoard.from_board([[0, 8, 0, 0, 0, 0, 2],
+                                                  [4, 4, 4, 4, 4, 4, 0]]).slots
+        batch.to_move[:] = 1
+        batch.step([5])
+
+        self.assertEqual(batch.to_board(0), [[1, 0, 0, 0, 0, 0, 3],
+                                             [5, 5, 5, 5, 5, 5, 0]])
+        self.assertEqual(batch.to_move.tolist(), [0])
+
+    # Tests that a last stone landing alone captures the pit facing it and keeps the turn
+    def test_capture(self):
+        batch = MancalaBatch(1)
+        batch.slots[0] = MancalaBoard.from_board([[0, 4, 4, 7, 4, 4, 4],
+                                                  [4, 1, 0, 4, 4, 4, 0]]).slots
+        batch.step([1])
+
+        self.assertEqual(batch.to_board(0), [[0, 4, 4, 0, 4, 4, 4],
+                                             [4, 0, 1, 4, 4, 4, 7]])
+        self.assertEqual(batch.to_move.tolist(), [0])
+
+    # Tests that picking an empty pit sows nothing and hands the turn over
+    def test_empty_pit_passes_turn(self):
+        batch = MancalaBatch(1)
+        batch.step([2])
+        batch.step([2])
+
+        self.assertEqual(batch.to_move.tolist(), [1])
+        self.assertEqual(batch.moves.tolist(), [2])
+        self.assertEqual(batch.to_board(0)[1], [4, 4, 0, 5, 5, 5, 1])
+
+    # Tests that random games all finish with every stone counted
+    def test_run_random_games(self):
+        batch = MancalaBatch(500)
+        results = batch.run(random_policy(np.random.default_rng(0)))
+
+        self.assertFalse((results == MancalaBatch.RUNNING).any())
+        self.assertTrue((batch.scores().sum(axis=1) == 48).all())
+
+
+class MancalaBatchTestMatchesGame(unittest.TestCase):
+    # Tests move by move that the batch and MancalaGame agree on board, scores, winner and turn
+    def test_random_games_match_mancala_game(self):
+        rng = np.random.default_rng(42)
+        games = 40
+        players = ["a", "b"]
+        # Random pits, empty ones included, so that every rule is compared
+        sequences = rng.integers(0, MancalaBatch.PITS, size=(games, 150))
+
+        batch = MancalaBatch(games)
+        game = MancalaGame(InMemoryController())
+        sessions = [game.create_game({'game_id': 2, 'user_id': "a", 'opponent_id': "b"}) for _ in range(games)]
+
+        for step in range(sequences.shape[1]):
+            running = batch.running()
+            sides = batch.to_move.copy()
+            batch.step(sequences[:, step])
+            scores = batch.scores()
+            for idx in np.flatnonzero(running):
+                slot = sides[idx] * (MancalaBoard.PITS + 1) + int(sequences[idx, step])
+                row, col = MancalaBoard.location_of(slot)
+                game.update_game({'session_id': sessions[idx]['session_id'], 'row': row, 'column': col,
+                                  'player_num': players[sides[idx]]})
+                session = game.read_game({'game_id': 2, 'session_id': sessions[idx]['session_id']})
+
+                self.assertEqual(session['board'], batch.to_board(idx))
+                self.assertEqual(session['score'], {"a": scores[idx, 0], "b": scores[idx, 1]})
+                result = batch.results[idx]
+                if result == MancalaBatch.RUNNING:
+                    self.assertFalse(session['status'])
+                    self.assertEqual(session['next_player'], players[batch.to_move[idx]])
+                else:
+                    self.assertTrue(session['status'])
+                    winner = None if result == MancalaBatch.DRAW else players[result - 1]
+                    self.assertEqual(session['next_player'], winner)
+
+        self.assertFalse(batch.running().any())
@@ -0,0 +1,113 @@
+from pyarcade.Games.mancala_board import MancalaBoard
+from pyarcade.Games.zobrist import mancala_hash
+import unittest
+
+STARTING_BOARD = [[0, 4, 4, 4, 4, 4, 4],
+                  [4, 4, 4, 4, 4, 4, 0]]
+
+
+class MancalaBoardTestConversion(unittest.TestCase):
+    # Tests that the starting position matches the starting board of a session
+    def test_starting_board(self):
+        self.assertEqual(MancalaBoard().to_board(), STARTING_BOARD)
+
+    # Tests that every hole survives a round trip through the flat slots
+    def test_board_round_trip(self):
+        board = [[7, 1, 2, 3, 4, 5, 6],
+                 [8, 9, 10, 11, 12, 13, 14]]
+        position = MancalaBoard.from_board(board)
+
+        self.assertEqual(position.to_board(), board)
+        self.assertEqual(position.pit_totals, [8 + 9 + 10 + 11 + 12 + 13, 1 + 2 + 3 + 4 + 5 + 6])
+
+    # Tests that the slots of the session board's holes face each other across the board
+    def test_slot_of(self):
+        self.assertEqual(MancalaBoard.slot_of(1, 0), 0)
+        self.assertEqual(MancalaBoard.slot_of(1, 6), 6)
+        self.assertEqual(MancalaBoard.slot_of(0, 6), 7)
+        self.assertEqual(MancalaBoard.slot_of(0, 0), 13)
+        self.assertEqual(12 - MancalaBoard.slot_of(0, 3), MancalaBoard.slot_of(1, 2))
+
+
+class MancalaBoardTestSow(unittest.TestCase):
+    # Tests that sowing into the own store returns it as the last hole
+    def test_sow_into_own_store(self):
+        position = MancalaBoard()
+        last_slot = position.sow(MancalaBoard.slot_of(1, 2), 0)
+
+        self.assertEqual(last_slot, MancalaBoard.STORES[0])
+        self.assertEqual(position.to_board(), [[0, 4, 4, 4, 4, 4, 4],
+                                               [4, 4, 0, 5, 5, 5, 1]])
+
+    # Tests that the opponent's store is skipped
+    def test_sow_skips_opponent_store(self):
+        position = MancalaBoard()
+        last_slot = position.sow(MancalaBoard.slot_of(1, 2), 1)
+
+        self.assertEqual(last_slot, MancalaBoard.slot_of(0, 6))
+        self.assertEqual(position.to_board(), [[0, 4, 4, 4, 4, 4, 5],
+                                               [4, 4, 0, 5, 5, 5, 0]])
+
+    # Tests that a pit with more stones than holes is sown around the board more than once
+    def test_sow_wraps_around(self):
+        board = [[0, 0, 0, 0, 0, 0, 0],
+                 [0, 0, 0, 0, 0, 15, 0]]
+        position = MancalaBoard.from_board(board)
+        last_slot = position.sow(MancalaBoard.slot_of(1, 5), 0)
+
+        # The 13 holes get one stone each, then the own store and the next pit get another
+        self.assertEqual(position.to_board(), [[0, 1, 1, 1, 1, 1, 2],
+                                               [1, 1, 1, 1, 1, 1, 2]])
+        self.assertEqual(last_slot, MancalaBoard.slot_of(0, 6))
+        self.assertEqual(sum(position.slots), 15)
+        self.assertEqual(position.pit_totals, [6, 7])
+
+    # Tests that an empty pit sows nothing
+    def test_sow_empty_pit(self):
+        position = MancalaBoard()
+        position.sow(MancalaBoard.slot_of(1, 0), 0)
+
+        self.assertIsNone(position.sow(MancalaBoard.slot_of(1, 0), 0))
+        self.assertEqual(position.pit_totals, [24, 24])
+
+    # Tests that a capture moves the stones of the facing pit into the capturing side's store
+    def test_capture(self):
+        position = MancalaBoard()
+        position.capture(MancalaBoard.slot_of(1, 2), 0)
+
+        self.assertEqual(position.to_board(), [[0, 4, 4, 0, 4, 4, 4],
+                                               [4, 4, 4, 4, 4, 4, 4]])
+        self.assertEqual(position.pit_totals, [24, 20])
+
+
+    # Tests that the incremental hash matches a full rehash after sowing, wrapping around and capturing
+    def test_hash_follows_moves(self):
+        position = MancalaBoard()
+        self.assertEqual(position.hash, mancala_hash(position.to_board()))
+
+        position.sow(MancalaBoard.slot_of(1, 2), 0)
+        position.sow(MancalaBoard.slot_of(0, 1), 1)
+        position.slots[3] = 14
+        position = MancalaBoard.from_board(position.to_board())
+        position.sow(3, 0)
+        position.capture(MancalaBoard.slot_of(1, 1), 0)
+
+        self.assertEqual(position.hash, mancala_hash(position.to_board()))
+        self.assertEqual(position.copy().hash, position.hash)
+
+
+class MancalaBoardTestScores(unittest.TestCase):
+    def test_scores_while_running(self):
+        position = MancalaBoard.from_board([[3, 1, 0, 0, 0, 0, 0],
+                                            [0, 0, 0, 0, 2, 0, 5]])
+
+        self.assertEqual(position.is_over(), (False, None))
+        self.assertEqual(position.get_scores(), (5, 3))
+
+    # Tests that the stones left on a side count for that side once the other side is empty
+    def test_scores_when_over(self):
+        position = MancalaBoard.from_board([[3, 0, 0, 0, 0, 0, 0],
+                                            [0, 0, 0, 0, 2, 1, 5]])
+
+        self.assertEqual(position.is_over(), (True, 0))
+        self.assertEqual(position.get_scores(), (8, 3))
@@ -0,0 +1,103 @@
+from pyarcade.Games.mancala_ai import MancalaAI
+from pyarcade.Games.mancala_board import MancalaBoard
+from pyarcade.Games.mancala_endgame import MancalaEndgameDatabase, build_endgame_database, distribution_index, \
+    position_count
+from itertools import combinations
+import os
+import random
+import tempfile
+import unittest
+
+
+# Plain minimax over the whole game tree, returning the final difference between the stores for the side to move
+def solve_margin(position: MancalaBoard, side: int) -> int:
+    if position.is_over()[0]:
+        scores = position.get_scores()
+        return scores[side] - scores[1 - side]
+    best = -float('inf')
+    for slot in position.moves(side):
+        child = position.copy()
+        if child.play(slot, side):
+            best = max(best, solve_margin(child, side))
+        else:
+            best = max(best, -solve_margin(child, 1 - side))
+    return best
+
+
+# Returns a position with the given stones in the pits and stores
+def endgame_position(pits: list, stores: tuple = (0, 0)) -> MancalaBoard:
+    position = MancalaBoard()
+    position.slots = pits[0:6] + [stores[0]] + pits[6:12] + [stores[1]]
+    return MancalaBoard.from_board(position.to_board())
+
+
+class MancalaEndgameIndexTest(unittest.TestCase):
+    # Tests that the distributions of up to 3 stones get every number below their count exactly once
+    def test_index_is_perfect(self):
+        indexes = set()
+        for stones in range(4):
+            for bars in combinations(range(stones + 11), 11):
+                edges = (-1,) + bars + (stones + 11,)
+                indexes.add(distribution_index([edges[pit + 1] - edges[pit] - 1 for pit in range(12)]))
+
+        self.assertEqual(indexes, set(range(position_count(3))))
+
+
+class MancalaEndgameDatabaseTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'endgame.bin')
+        self.positions = build_endgame_database(self.path, 4)
+        self.database = MancalaEndgameDatabase(self.path)
+
+    def tearDown(self):
+        self.database.close()
+        self.directory.cleanup()
+
+    # Tests that every distribution of up to 4 stones over the 12 pits is stored
+    def test_build_stores_every_distribution(self):
+        self.assertEqual(self.positions, 1820)
+        self.assertEqual(self.database.max_stones, 4)
+
+    # Tests that the stored margins are the results of a minimax search to the end of the game
+    def test_margin_matches_minimax(self):
+        rng = random.Random(5)
+        for _ in range(20):
+            pits = [0] * 12
+            for _ in range(2):
+                pits[rng.randrange(12)] += 1
+            pits[0] += 1
+            pits[6] += 1
+            position = endgame_position(pits, (rng.randrange(20), rng.randrange(20)))
+            side = rng.randrange(2)
+
+            self.assertEqual(self.database.margin(position, side), solve_margin(position, side))
+
+    # Tests that the best move reaches the margin of the position
+    def test_best_move_reaches_margin(self):
+        position = endgame_position([0, 0, 0, 1, 0, 1, 0, 2, 0, 0, 0, 0], (10, 12))
+
+        slot, margin = self.database.best_move(position, 0)
+
+        self.assertIn(slot, position.moves(0))
+        self.assertEqual(margin, self.database.margin(position, 0))
+
+    # Tests that positions with more stones than the database covers are not found
+    def test_lookup_outside_database(self):
+        self.assertIsNone(self.database.margin(MancalaBoard(), 0))
+        self.assertIsNone(self.database.best_move(MancalaBoard(), 0))
+
+    # Tests that the engine plays the database move without searching
+    def test_ai_uses_database(self):
+        position = endgame_position([0, 0, 1, 0, 0, 1, 0, 0, 0, 2, 0, 0])
+        ai = MancalaAI(time_budget=0, endgame_database=self.database)
+
+        self.assertEqual(ai.best_move(position, 0), self.database.best_move(position, 0)[0])
+
+    def test_rejects_other_files(self):
+        path = os.path.join(self.directory.name, 'other.bin')
+        with open(path, 'wb') as other_file:
+            other_file.write(b'not a database at all')
+
+        with self.assertRaises(Exception):
+            MancalaEndgameDatabase(path)
@@ -137,6 +137,30 @@ class MancalaProxyUpdateGameTests(unittest.TestCase):
 
         self.assertNotEqual(valid_update, MancalaProxyUpdateGameTests.INVALID_INPUT)
 
+    # Tests that update_game doesn't let a request move for the computer opponent
+    def test_update_game_computer_player_num(self):
+        game = MancalaGame(controller)
+        proxy = MancalaProxy(game)
+
+        session_id = proxy.create_game({'game_id': 2, 'user_id': "a", 'opponent_id': "computer"})['session_id']
+
+        invalid_update = proxy.update_game(({'session_id': session_id, 'row': 0, 'column': 3,
+                                             'player_num': 'computer'}))
+
+        self.assertEqual(invalid_update, MancalaProxyUpdateGameTests.INVALID_INPUT)
+
+    # Tests that update_game doesn't take a session version that is not an integer
+    def test_update_game_invalid_version(self):
+        game = MancalaGame(controller)
+        proxy = MancalaProxy(game)
+
+        session_id = proxy.create_game({'game_id': 2, 'user_id': "a", 'opponent_id': "b"})['session_id']
+
+        invalid_update = proxy.update_game(({'session_id': session_id, 'row': 1, 'column': 3, 'player_num': 'a',
+                                             'version': "1"}))
+
+        self.assertEqual(invalid_update, MancalaProxyUpdateGameTests.INVALID_INPUT)
+
     # Tests that update_game doesn't take an invalid row as an input
     def test_update_game_invalid_row_input(self):
         game = MancalaGame(controller)
@@ -197,6 +221,27 @@ class MancalaProxyUpdateGameTests(unittest.TestCase):
         self.assertEqual(invalid_update, MancalaProxyUpdateGameTests.INVALID_INPUT)
 
 
+class MancalaProxyHintGameTests(unittest.TestCase):
+    INVALID_INPUT = {'session_id': 0}
+
+    # Tests that hint_game passes onto game given a session_id
+    def test_hint_game_valid_session(self):
+        game = MancalaGame(controller, ai_time_budget=0.1)
+        proxy = MancalaProxy(game)
+
+        session_id = proxy.create_game({'game_id': 2, 'user_id': "a", 'opponent_id': "b"})['session_id']
+        hint = proxy.hint_game({'game_id': 2, 'session_id': session_id})
+
+        self.assertEqual(hint['session_id'], session_id)
+
+    # Tests that hint_game doesn't pass arguments onto the game without a session_id
+    def test_hint_game_no_session_id(self):
+        game = MancalaGame(controller)
+        proxy = MancalaProxy(game)
+
+        self.assertEqual(proxy.hint_game({'game_id': 2}), MancalaProxyHintGameTests.INVALID_INPUT)
+
+
 class MancalaProxyDeleteGameTests(unittest.TestCase):
     INVALID_INPUT = {'session_id': 0}
 
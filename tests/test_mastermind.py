@@ -1,5 +1,8 @@
 from pyarcade.Games.mastermind import MastermindGame
+from pyarcade.Games.mastermind_feedback import count_cows_and_bulls
+from pyarcade.Games.mastermind_solver import unpack_candidates
 import unittest
+from unittest import mock
 from configparser import ConfigParser
 import os
 from flask import Flask
@@ -94,6 +97,170 @@ class MastermindFourTest(unittest.TestCase):
 
         self.assertEqual(session_1['done'], True)
 
+    # Tests that guesses of distinct digits and guesses with repeated digits are scored alike
+    def test_update_game_scores_guesses(self):
+        game = MastermindGame(controller)
+
+        session_1 = game.create_game({'game_id': 0})
+        target = session_1['target']
+
+        session_1['guess'] = target[::-1]
+        game.update_game(session_1)
+        session_1 = game.read_game({'game_id': 0, 'session_id': session_1['session_id']})
+
+        session_1['guess'] = [target[0]] * 4
+        game.update_game(session_1)
+        session_1 = game.read_game({'game_id': 0, 'session_id': session_1['session_id']})
+
+        self.assertEqual([list(feedback) for _, feedback in session_1['guesses']], [[4, 0], [0, 1]])
+
+    # Tests that the stored bitmap holds the targets fitting every guess, narrowed one guess at a time
+    def test_update_game_narrows_candidates(self):
+        game = MastermindGame(controller)
+
+        session_1 = game.create_game({'game_id': 0})
+        self.assertEqual(session_1['remaining'], 3024)
+
+        for guess in ([1, 2, 3, 4], [5, 6, 7, 8], [1, 1, 2, 2]):
+            session_1['guess'] = guess
+            game.update_game(session_1)
+            session_1 = game.read_game({'game_id': 0, 'session_id': session_1['session_id']})
+
+        candidates = unpack_candidates(session_1['candidates'])
+        self.assertTrue((candidates == game.solver.candidates(session_1['guesses'])).all())
+        self.assertEqual(session_1['remaining'], candidates.sum())
+        self.assertGreaterEqual(session_1['remaining'], 1)
+
+    # Tests that a hint suggests a guess from the guesses made so far
+    def test_hint_game(self):
+        game = MastermindGame(controller)
+
+        session_1 = game.create_game({'game_id': 0})
+        hint = game.hint_game({'game_id': 0, 'session_id': session_1['session_id']})
+        self.assertEqual(hint, {'session_id': session_1['session_id'], 'guess': [1, 2, 3, 4], 'remaining': 3024})
+
+        session_1['guess'] = hint['guess']
+        game.update_game(session_1)
+        hint = game.hint_game({'game_id': 0, 'session_id': session_1['session_id']})
+        self.assertEqual(len(hint['guess']), 4)
+        self.assertLess(hint['remaining'], 3024)
+
+    # Tests that a finished game gets no hint
+    def test_hint_game_over(self):
+        game = MastermindGame(controller)
+
+        session_1 = game.create_game({'game_id': 0})
+        session_1['guess'] = session_1['target']
+        game.update_game(session_1)
+        hint = game.hint_game({'game_id': 0, 'session_id': session_1['session_id']})
+
+        self.assertEqual(hint['guess'], None)
+        self.assertEqual(hint['remaining'], 1)
+
+    # Tests that a session can ask for a longer sequence with more colors and repeats
+    def test_create_game_variant(self):
+        game = MastermindGame(controller)
+
+        session_1 = game.create_game({'game_id': 0, 'length': 6, 'colors': 10, 'repeats': True})
+
+        self.assertEqual(len(session_1['target']), 6)
+        self.assertTrue(all(1 <= value <= 10 for value in session_1['target']))
+        self.assertNotIn('candidates', session_1)
+
+    # Tests that targets without repeats hold distinct integers
+    def test_create_game_variant_without_repeats(self):
+        game = MastermindGame(controller)
+
+        session_1 = game.create_game({'game_id': 0, 'length': 5, 'colors': 5})
+
+        self.assertEqual(sorted(session_1['target']), [1, 2, 3, 4, 5])
+
+    # Tests that a variant is scored by counting and won once every integer is a bull
+    def test_update_game_variant(self):
+        game = MastermindGame(controller)
+
+        session_1 = game.create_game({'game_id': 0, 'length': 6, 'colors': 10, 'repeats': True})
+        session_1['target'] = [1, 1, 2, 3, 4, 5]
+        controller.update_game(session_1)
+
+        session_1['guess'] = [1, 2, 1, 1, 9, 5]
+        game.update_game(session_1)
+        session_1 = game.read_game({'game_id': 0, 'session_id': session_1['session_id']})
+        self.assertEqual(list(session_1['guesses'][-1][1]), [2, 2])
+        self.assertEqual(session_1['done'], False)
+
+        session_1['guess'] = session_1['target']
+        game.update_game(session_1)
+        session_1 = game.read_game({'game_id': 0, 'session_id': session_1['session_id']})
+        self.assertEqual(session_1['done'], True)
+        self.assertEqual(game.hint_game({'game_id': 0, 'session_id': session_1['session_id']})['guess'], None)
+
+    # Tests that a guess is played on the stored session whatever variant or target the request holds
+    def test_update_game_uses_stored_session(self):
+        game = MastermindGame(controller)
+
+        session_1 = game.create_game({'game_id': 0, 'length': 6, 'colors': 12, 'repeats': True})
+        target = session_1['target']
+
+        request = dict(session_1, length=4, colors=9, repeats=False, target=[1, 2, 3, 4], guess=[1, 2, 3, 4])
+        self.assertEqual(game.update_game(request), {'session_id': 0})
+
+        guess = [12, 11, 10, 9, 8, 7]
+        game.update_game(dict(request, target=guess, guess=guess))
+        session_1 = game.read_game({'game_id': 0, 'session_id': session_1['session_id']})
+
+        self.assertEqual(list(session_1['target']), target)
+        self.assertEqual(session_1['play_counter'], 1)
+        self.assertEqual([list(feedback) for feedback in session_1['guesses'][-1]],
+                         [guess, list(count_cows_and_bulls(guess, target))])
+
+    # Tests that a batch plays its guesses in order, stops at the solving one and saves the session once
+    def test_batch_update_game(self):
+        game = MastermindGame(controller)
+
+        session_1 = game.create_game({'game_id': 0})
+        target = session_1['target']
+        batch = [[1, 2, 3, 4], target[::-1], target, [5, 6, 7, 8]]
+
+        with mock.patch.object(controller, 'update_game', wraps=controller.update_game) as update_game:
+            reply = game.batch_update_game({'game_id': 0, 'session_id': session_1['session_id'], 'batch': batch})
+
+        self.assertEqual([list(guess) for guess, _ in reply['guesses']], batch[:3])
+        self.assertEqual(list(reply['guesses'][1][1]), [4, 0])
+        self.assertEqual(reply['done'], True)
+        self.assertEqual(reply['play_counter'], 3)
+        self.assertEqual(reply['remaining'], 1)
+        self.assertEqual(update_game.call_count, 1)
+
+        session_1 = game.read_game({'game_id': 0, 'session_id': session_1['session_id']})
+        self.assertEqual(session_1['play_counter'], 3)
+        self.assertEqual(session_1['done'], True)
+
+    # Tests that a finished game plays nothing from a batch
+    def test_batch_update_game_over(self):
+        game = MastermindGame(controller)
+
+        session_1 = game.create_game({'game_id': 0})
+        session_1['guess'] = session_1['target']
+        game.update_game(session_1)
+
+        reply = game.batch_update_game({'game_id': 0, 'session_id': session_1['session_id'], 'batch': [[1, 2, 3, 4]]})
+
+        self.assertEqual(reply['guesses'], [])
+        self.assertEqual(reply['play_counter'], 1)
+
+    # Tests that a win shows up in the high scores of every game instance sharing the table
+    def test_high_scores_are_shared(self):
+        game_1 = MastermindGame(controller, leaderboard_cache_ttl=0)
+        game_2 = MastermindGame(controller, leaderboard_cache_ttl=0)
+
+        session_1 = game_1.create_game({'game_id': 0})
+        session_1['guess'] = session_1['target']
+        game_1.update_game(session_1)
+
+        self.assertEqual(game_1.get_high_scores()['scores'][0][0], 1)
+        self.assertEqual(game_2.get_high_scores(), game_1.get_high_scores())
+
     def test_delete_game(self):
         game = MastermindGame(controller)
 
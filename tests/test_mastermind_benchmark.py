@@ -0,0 +1,23 @@
+from pyarcade.Games.mastermind_benchmark import run_benchmark
+import unittest
+
+
+class MastermindBenchmarkTest(unittest.TestCase):
+    # Tests that the minimax strategy solves the sampled secrets within seven guesses
+    def test_knuth_strategy(self):
+        report = run_benchmark('knuth', workers=2, secrets=list(range(0, 3024, 97)))
+
+        self.assertEqual(report['secrets'], 32)
+        self.assertLessEqual(report['max_guesses'], 7)
+        self.assertEqual(sum(report['guesses_histogram'].values()), 32)
+        self.assertLessEqual(report['mean_solve_seconds'], report['max_solve_seconds'])
+
+    # Tests that a secret guessed first time takes one guess
+    def test_first_candidate_strategy(self):
+        report = run_benchmark('first-candidate', workers=1, secrets=[0])
+
+        self.assertEqual(report['guesses_histogram'], {'1': 1})
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(Exception):
+            run_benchmark('guesswork', workers=1, secrets=[0])
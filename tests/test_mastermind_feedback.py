@@ -0,0 +1,126 @@
+from pyarcade.Games.mastermind_feedback import CODES, MastermindFeedback, code_index, count_cows_and_bulls, \
+    write_feedback_table
+import numpy as np
+import os
+import random
+import tempfile
+import threading
+import unittest
+
+
+# Counts cows and bulls digit by digit, for codes of distinct digits
+def count_distinct_digits(guess: tuple, target: tuple) -> tuple:
+    bulls = sum(1 for g, t in zip(guess, target) if g == t)
+    cows = sum(1 for g in guess if g in target) - bulls
+    return cows, bulls
+
+
+# Counts cows and bulls the way the game always has: a guessed digit that is not a bull counts once for every
+# position it is guessed at if the target holds it at a position that is not a bull
+def count_by_original_rule(guess: tuple, target: tuple) -> tuple:
+    bulls = sum(1 for g, t in zip(guess, target) if g == t)
+    target_no_bulls = [t for g, t in zip(guess, target) if g != t]
+    cows = sum(1 for g, t in zip(guess, target) if g != t and g in target_no_bulls)
+    return cows, bulls
+
+
+class MastermindFeedbackTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.feedback = MastermindFeedback()
+
+    # Tests that every code of four distinct digits from 1-9 is numbered
+    def test_codes(self):
+        self.assertEqual(len(CODES), 3024)
+        self.assertEqual(code_index(CODES[1234].tolist()), 1234)
+        self.assertIsNone(code_index([1, 1, 2, 3]))
+        self.assertIsNone(code_index([0, 1, 2, 3]))
+
+    # Tests that the table agrees with counting digit by digit
+    def test_table_matches_counting(self):
+        rng = random.Random(7)
+        for _ in range(500):
+            guess = tuple(CODES[rng.randrange(len(CODES))].tolist())
+            target = tuple(CODES[rng.randrange(len(CODES))].tolist())
+
+            self.assertEqual(self.feedback.score(guess, target), count_distinct_digits(guess, target))
+
+    def test_score(self):
+        self.assertEqual(self.feedback.score([1, 2, 3, 4], [4, 3, 2, 1]), (4, 0))
+        self.assertEqual(self.feedback.score([1, 2, 3, 4], [1, 2, 5, 3]), (1, 2))
+        self.assertEqual(self.feedback.score([1, 2, 3, 4], [1, 2, 3, 4]), (0, 4))
+        self.assertIsNone(self.feedback.score([1, 1, 1, 1], [1, 2, 3, 4]))
+
+
+class MastermindCountingTest(unittest.TestCase):
+    # Tests that repeated symbols count as often as the sequence holding fewer of them has them
+    def test_count_repeats(self):
+        self.assertEqual(count_cows_and_bulls([2, 2, 1, 1], [1, 2, 3, 4]), (1, 1))
+        self.assertEqual(count_cows_and_bulls([1, 1, 1, 1], [1, 2, 3, 4]), (0, 1))
+        self.assertEqual(count_cows_and_bulls([1, 2, 1, 1, 9, 5], [1, 1, 2, 3, 4, 5]), (2, 2))
+
+    # Tests that sequences longer than four with symbols above nine are counted
+    def test_count_long_sequences(self):
+        self.assertEqual(count_cows_and_bulls([10, 11, 12, 13, 14, 15], [15, 11, 13, 12, 10, 16]), (4, 1))
+
+    # Tests that without repeats a repeated digit counts at every position it is guessed at, as it always has
+    def test_count_without_repeats(self):
+        self.assertEqual(count_cows_and_bulls([2, 2, 3, 3], [3, 4, 2, 1], repeats=False), (4, 0))
+        self.assertEqual(count_cows_and_bulls([2, 2, 1, 1], [1, 2, 3, 4], repeats=False), (2, 1))
+        self.assertEqual(count_cows_and_bulls([1, 1, 1, 1], [1, 2, 3, 4], repeats=False), (0, 1))
+
+        rng = random.Random(5)
+        for _ in range(500):
+            guess = [rng.randint(1, 9) for _ in range(4)]
+            target = CODES[rng.randrange(len(CODES))].tolist()
+
+            self.assertEqual(count_cows_and_bulls(guess, target, repeats=False), count_by_original_rule(guess, target))
+
+    # Tests that the feedback of guesses with repeated digits against every code follows the original rule
+    def test_feedback_row_counts_repeats(self):
+        feedback = MastermindFeedback()
+        for guess in ([2, 2, 1, 1], [2, 2, 3, 3], [5, 5, 5, 5], [1, 2, 1, 3]):
+            row = feedback.feedback_row(guess)
+
+            for index in random.Random(3).sample(range(len(CODES)), 200):
+                self.assertEqual(feedback.decode(row[index]), count_by_original_rule(guess, CODES[index].tolist()))
+
+
+class MastermindFeedbackFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'feedback.npy')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    # Tests that a missing file is written on first use and memory-mapped afterwards
+    def test_writes_missing_file(self):
+        feedback = MastermindFeedback(self.path)
+
+        self.assertTrue(os.path.exists(self.path))
+        self.assertIsInstance(feedback.table, np.memmap)
+        self.assertEqual(feedback.score([5, 6, 7, 8], [8, 6, 1, 2]), (1, 1))
+
+    # Tests that a table written offline is read back unchanged
+    def test_reads_written_file(self):
+        write_feedback_table(self.path)
+
+        self.assertTrue(np.array_equal(MastermindFeedback(self.path).table, MastermindFeedback().table))
+
+    # Tests that workers writing the table at the same time leave a whole table and no temporary files
+    def test_concurrent_writes(self):
+        threads = [threading.Thread(target=write_feedback_table, args=(self.path,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertTrue(np.array_equal(MastermindFeedback(self.path).table, MastermindFeedback().table))
+        self.assertEqual(os.listdir(self.directory.name), ['feedback.npy'])
+
+    def test_rejects_other_files(self):
+        np.save(self.path, np.zeros((3, 3), dtype=np.uint8))
+
+        with self.assertRaises(Exception):
+            MastermindFeedback(self.path)
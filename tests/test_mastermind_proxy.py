@@ -194,4 +194,116 @@ class MastermindProxyTests(unittest.TestCase):
         guess = ('a', 'b', 'c', 'd')
         response = proxy.update_game({'session_id': session_id, "guess": guess})
 
-        self.assertEqual({'session_id': 0}, response)
\ No newline at end of file
+        self.assertEqual({'session_id': 0}, response)
+
+    # Tests that hint_game passes onto game given a session_id
+    def test_hint_game_valid_session(self):
+        game = MastermindGame(controller)
+        proxy = MastermindGameProxy(game)
+
+        session_id = proxy.create_game({'game_id': 0})['session_id']
+        hint = proxy.hint_game({'game_id': 0, 'session_id': session_id})
+
+        self.assertEqual(hint['session_id'], session_id)
+
+    # Tests that hint_game doesn't pass arguments onto the game without a session_id
+    def test_hint_game_no_session_id(self):
+        game = MastermindGame(controller)
+        proxy = MastermindGameProxy(game)
+
+        self.assertEqual(proxy.hint_game({'game_id': 0}), MastermindProxyTests.INVALID_INPUT)
+
+    # Tests that create_game accepts a valid variant
+    def test_create_game_valid_variant(self):
+        game = MastermindGame(controller)
+        proxy = MastermindGameProxy(game)
+
+        session_1 = proxy.create_game({'game_id': 0, 'length': 6, 'colors': 10, 'repeats': True})
+
+        self.assertEqual(len(session_1['target']), 6)
+
+    # Tests that create_game rejects variants out of range or without enough colors
+    def test_create_game_invalid_variant(self):
+        game = MastermindGame(controller)
+        proxy = MastermindGameProxy(game)
+
+        for variant in ({'length': 0}, {'length': 11}, {'colors': 1}, {'colors': 17}, {'length': 6, 'colors': 5},
+                        {'length': 4.0}, {'repeats': 'yes'}):
+            request = {'game_id': 0}
+            request.update(variant)
+
+            self.assertEqual(proxy.create_game(request), MastermindProxyTests.INVALID_INPUT)
+
+    # Tests that guesses are checked against the length and colors of the session
+    def test_update_game_guess_checked_against_variant(self):
+        game = MastermindGame(controller)
+        proxy = MastermindGameProxy(game)
+
+        session_1 = proxy.create_game({'game_id': 0, 'length': 6, 'colors': 10, 'repeats': True})
+
+        self.assertEqual(proxy.update_game(dict(session_1, guess=[1, 2, 3, 4])), MastermindProxyTests.INVALID_INPUT)
+        self.assertEqual(proxy.update_game(dict(session_1, guess=[1, 2, 3, 4, 5, 11])),
+                         MastermindProxyTests.INVALID_INPUT)
+        self.assertNotEqual(proxy.update_game(dict(session_1, guess=[10, 10, 3, 4, 5, 6])),
+                            MastermindProxyTests.INVALID_INPUT)
+
+    # Tests that the length and colors sent with a guess do not override the session's
+    def test_update_game_ignores_variant_in_request(self):
+        game = MastermindGame(controller)
+        proxy = MastermindGameProxy(game)
+
+        session_1 = proxy.create_game({'game_id': 0, 'length': 6, 'colors': 12, 'repeats': True})
+
+        self.assertEqual(proxy.update_game(dict(session_1, length=4, colors=9, guess=[1, 2, 3, 4])),
+                         MastermindProxyTests.INVALID_INPUT)
+        self.assertNotEqual(proxy.update_game(dict(session_1, length=4, colors=9, guess=[12, 11, 10, 9, 8, 7])),
+                            MastermindProxyTests.INVALID_INPUT)
+
+    # Tests that the default game only takes integers from 1-9
+    def test_update_game_guess_out_of_range(self):
+        game = MastermindGame(controller)
+        proxy = MastermindGameProxy(game)
+
+        session_1 = proxy.create_game({'game_id': 0})
+
+        self.assertEqual(proxy.update_game(dict(session_1, guess=[0, 1, 2, 3])), MastermindProxyTests.INVALID_INPUT)
+
+    # Tests that batch_update_game passes a valid batch onto the game
+    def test_batch_update_game_valid(self):
+        game = MastermindGame(controller)
+        proxy = MastermindGameProxy(game)
+
+        session_1 = proxy.create_game({'game_id': 0})
+        reply = proxy.batch_update_game({'game_id': 0, 'session_id': session_1['session_id'],
+                                         'batch': [[1, 2, 3, 4], [5, 6, 7, 8]]})
+
+        self.assertEqual(reply['session_id'], session_1['session_id'])
+
+    # Tests that batch_update_game rejects missing, empty, oversized or malformed batches
+    def test_batch_update_game_invalid(self):
+        game = MastermindGame(controller)
+        proxy = MastermindGameProxy(game)
+
+        session_id = proxy.create_game({'game_id': 0})['session_id']
+
+        self.assertEqual(proxy.batch_update_game({'game_id': 0, 'session_id': session_id}),
+                         MastermindProxyTests.INVALID_INPUT)
+        self.assertEqual(proxy.batch_update_game({'game_id': 0, 'batch': [[1, 2, 3, 4]]}),
+                         MastermindProxyTests.INVALID_INPUT)
+        for batch in ([], [[1, 2, 3, 4]] * 101, [[1, 2, 3]], [[1, 2, 3, 'a']], [[1, 2, 3, 4], 5], (1, 2, 3, 4)):
+            self.assertEqual(proxy.batch_update_game({'game_id': 0, 'session_id': session_id, 'batch': batch}),
+                             MastermindProxyTests.INVALID_INPUT)
+
+    # Tests that a batch is checked against the session's variant, whatever the request says
+    def test_batch_update_game_checked_against_session(self):
+        game = MastermindGame(controller)
+        proxy = MastermindGameProxy(game)
+
+        session_id = proxy.create_game({'game_id': 0, 'length': 6, 'colors': 12, 'repeats': True})['session_id']
+        request = {'game_id': 0, 'session_id': session_id, 'length': 4, 'colors': 9}
+
+        self.assertEqual(proxy.batch_update_game(dict(request, batch=[[12, 11, 10, 9, 8, 7], [1, 2, 3, 4]])),
+                         MastermindProxyTests.INVALID_INPUT)
+        self.assertEqual(game.read_game(request)['play_counter'], 0)
+        reply = proxy.batch_update_game(dict(request, batch=[[12, 11, 10, 9, 8, 7]]))
+        self.assertEqual(reply['play_counter'], 1)
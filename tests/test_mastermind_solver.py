@@ -0,0 +1,82 @@
+from pyarcade.Games.mastermind_feedback import CODES, MastermindFeedback
+from pyarcade.Games.mastermind_solver import MastermindSolver, pack_candidates, unpack_candidates
+import numpy as np
+import random
+import unittest
+
+
+class MastermindSolverTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.feedback = MastermindFeedback()
+
+    def setUp(self):
+        self.solver = MastermindSolver(self.feedback)
+
+    # Tests that every code is possible before the first guess
+    def test_first_guess(self):
+        guess, remaining = self.solver.best_guess([])
+
+        self.assertEqual(remaining, 3024)
+        self.assertEqual(guess, [1, 2, 3, 4])
+
+    # Tests that the remaining codes are exactly the ones agreeing with every guess
+    def test_candidates_fit_history(self):
+        target = [3, 7, 1, 9]
+        guesses = [(guess, self.feedback.score(guess, target)) for guess in ([1, 2, 3, 4], [5, 6, 7, 8])]
+
+        candidates = self.solver.candidates(guesses)
+
+        fitting = [index for index, code in enumerate(CODES.tolist())
+                   if all(self.feedback.score(guess, code) == feedback for guess, feedback in guesses)]
+        self.assertEqual(candidates.nonzero()[0].tolist(), fitting)
+        self.assertTrue(candidates[fitting].all())
+
+    # Tests that guesses with repeated digits narrow the codes the way they are scored
+    def test_candidates_with_repeated_digits(self):
+        candidates = self.solver.candidates([([1, 1, 2, 2], (0, 1))])
+
+        for code in CODES[candidates].tolist():
+            self.assertEqual((code[0] == 1) + (code[1] == 1) + (code[2] == 2) + (code[3] == 2), 1)
+
+    # Tests that narrowing one guess at a time ends with the codes fitting the whole history
+    def test_narrow(self):
+        guesses = [([1, 2, 3, 4], (2, 0)), ([2, 1, 5, 6], (1, 1))]
+
+        candidates = self.solver.narrow(self.solver.candidates(guesses[:1]), *guesses[1])
+
+        self.assertTrue((candidates == self.solver.candidates(guesses)).all())
+        self.assertEqual(self.solver.best_guess(guesses, candidates), self.solver.best_guess(guesses))
+
+    # Tests that a bitmap is read back as it was stored
+    def test_pack_candidates(self):
+        candidates = np.random.default_rng(4).random(len(CODES)) < 0.1
+
+        self.assertTrue((unpack_candidates(pack_candidates(candidates)) == candidates).all())
+        self.assertLess(len(pack_candidates(np.ones(len(CODES), dtype=bool))), 64)
+
+    # Tests that following the hints finds every sampled code within seven guesses
+    def test_hints_solve_codes(self):
+        rng = random.Random(2)
+        for index in rng.sample(range(len(CODES)), 50):
+            target = CODES[index].tolist()
+            guesses = []
+            while not guesses or guesses[-1][1][1] != 4:
+                guess, remaining = self.solver.best_guess(guesses)
+                guesses.append((guess, self.feedback.score(guess, target)))
+
+            self.assertLessEqual(len(guesses), 7)
+
+    # Tests that a history is worked out once whatever order its guesses come in
+    def test_cache(self):
+        guesses = [([1, 2, 3, 4], (1, 0)), ([5, 6, 7, 8], (2, 1))]
+
+        first = self.solver.best_guess(guesses)
+        second = self.solver.best_guess(guesses[::-1])
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.solver.stats(), {'hits': 1, 'misses': 1, 'size': 1, 'capacity': 1024})
+
+    # Tests that a history no code fits gets no guess
+    def test_impossible_history(self):
+        self.assertEqual(self.solver.best_guess([([1, 2, 3, 4], (0, 0)), ([1, 2, 3, 4], (4, 0))]), (None, 0))
@@ -0,0 +1,39 @@
+from pyarcade.Games.zobrist import ZobristTable, mancala_hash, mancala_key, splitmix64
+import unittest
+
+STARTING_BOARD = [[0, 4, 4, 4, 4, 4, 4],
+                  [4, 4, 4, 4, 4, 4, 0]]
+
+
+class ZobristTableTest(unittest.TestCase):
+    # Tests that the keys only depend on the seed and the index
+    def test_keys_are_fixed(self):
+        table = ZobristTable(seed=7, size=16)
+
+        self.assertEqual(table.keys, ZobristTable(seed=7, size=16).keys)
+        self.assertNotEqual(table.keys, ZobristTable(seed=8, size=16).keys)
+        self.assertEqual(table.key(3), splitmix64(10))
+
+    # Tests that indexes past the precomputed keys get the same keys as a larger table
+    def test_key_past_table(self):
+        self.assertEqual(ZobristTable(seed=7, size=4).key(10), ZobristTable(seed=7, size=16).key(10))
+
+    def test_keys_are_64_bit_and_distinct(self):
+        table = ZobristTable(seed=7, size=1000)
+
+        self.assertEqual(len(set(table.keys)), 1000)
+        self.assertTrue(all(0 <= key < 1 << 64 for key in table.keys))
+
+
+class ZobristMancalaTest(unittest.TestCase):
+    # Tests that moving one stone changes the hash by the keys of the two holes only
+    def test_incremental_update(self):
+        board = [row[:] for row in STARTING_BOARD]
+        board[1][2] -= 1
+        board[1][3] += 1
+
+        updated_hash = mancala_hash(STARTING_BOARD) ^ mancala_key(1, 2, 4) ^ mancala_key(1, 2, 3) \
+            ^ mancala_key(1, 3, 4) ^ mancala_key(1, 3, 5)
+
+        self.assertEqual(mancala_hash(board), updated_hash)
+        self.assertNotEqual(mancala_hash(board), mancala_hash(STARTING_BOARD))